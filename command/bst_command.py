@@ -1,4 +1,3 @@
-from datastructures import tree
 from command import ModelCommand
 
 class BSTInsertCommand(ModelCommand):
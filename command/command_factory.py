@@ -5,7 +5,8 @@ from command.heap_command import BinaryHeapInsertKeyCommand, BinaryHeapRemoveMin
 from command.control_command import ClearConsoleCommand, CreateVariableCommand, \
                                     PrintVariableCommand, CreateDataStructureCommand, \
                                     ShowRenderCommand, CloseRenderCommand, \
-                                    CreateSequenceCommand
+                                    CreateSequenceCommand, SetSpeedCommand, StatsCommand, \
+                                    ProfileCommand
 from command.graph_command import GraphAddNodeCommand, GraphConnectCommand, GraphCutCommand, \
                                     GraphRemoveNodeCommand, GraphAddOrConnectCommand, GraphNewNodeCommand
 from command.sequence_command import SequenceExecuteCommand
@@ -24,14 +25,22 @@ class CommandFactory(object):
 
         # if command is invalid, return None. This will be propagated back to
         # the view class and interpreted as a syntax error
+        my_command = self.get_command_class(type)
         try:
-            my_command = self.command_list[type]
             return my_command(self.receiver, *args, **kwargs)
-        except KeyError:
-            raise InvalidCommandError("Invalid command for %s: '%s'" % (self.receiver, type))
         except ValueError:
             raise InvalidCommandError("Invalid arguments for '%s': '%s'" % (type, args))
 
+    def get_command_class(self, type):
+        """
+        Command class registered for type, without creating a command
+        (used to compile sequences once and create commands later)
+        """
+        try:
+            return self.command_list[type]
+        except KeyError:
+            raise InvalidCommandError("Invalid command for %s: '%s'" % (self.receiver, type))
+
 class ControlCommandFactory(CommandFactory):
     """
     Class to instantiate commands with control object
@@ -49,6 +58,9 @@ class ControlCommandFactory(CommandFactory):
             "show": ShowRenderCommand,
             "close": CloseRenderCommand,
             "sequence": CreateSequenceCommand,
+            "speed": SetSpeedCommand,
+            "stats": StatsCommand,
+            "profile": ProfileCommand,
         }
 
 
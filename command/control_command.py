@@ -1,7 +1,11 @@
-from tkinter import Canvas
+import cProfile
+import io
+import pstats
 import datastructures
 from command.sequence import SequenceFactory
 from command import DSCommand
+from util.instrumentation import recorder
+from util.exceptions import InvalidCommandError
 
 
 class ClearConsoleCommand(DSCommand):
@@ -238,3 +242,156 @@ class CreateSequenceCommand(DSCommand):
     def undo(self):
         pass
 
+
+
+class SetSpeedCommand(DSCommand):
+    def __init__(self, receiver, speed, should_redraw=False):
+        """
+        Set animation speed multiplier of control.timeline.
+        'instant' skips animations, 'normal' resets to speed 1.
+
+        e.g. 'speed 4'
+             'speed instant'
+        """
+        super().__init__()
+        self.receiver = receiver
+        self.should_redraw = should_redraw
+
+        if speed not in ("instant", "normal") and float(speed) <= 0:
+            raise ValueError("Speed must be positive")
+        self.speed = speed
+
+    def execute(self):
+        timeline = self.receiver.timeline
+        self.previous = (timeline.speed, timeline.instant)
+
+        if self.speed == "instant":
+            timeline.instant = True
+            timeline.finish_all()
+        elif self.speed == "normal":
+            timeline.instant = False
+            timeline.speed = 1.0
+        else:
+            timeline.instant = False
+            timeline.speed = float(self.speed)
+
+    def undo(self):
+        self.receiver.timeline.speed, self.receiver.timeline.instant = self.previous
+
+    def __repr__(self):
+        return "SET ANIMATION SPEED %s" % self.speed
+
+
+class StatsCommand(DSCommand):
+    def __init__(self, receiver, action="show", arg=None, should_redraw=False):
+        """
+        Show p50/p95/max times per command type and render
+        phase recorded by util.instrumentation.recorder.
+
+        e.g. 'stats'
+             'stats dump stats.jsonl' (every kept sample as JSON lines)
+             'stats items on' (also record canvas item counts when drawing)
+             'stats clear'
+        """
+        super().__init__()
+        self.receiver = receiver
+        self.should_redraw = should_redraw
+
+        usage = "Usage: stats [dump <file> | items on|off | clear]"
+        if action not in ("show", "dump", "items", "clear"):
+            raise ValueError(usage)
+        if (action in ("dump", "items")) != (arg is not None) or (action == "items" and arg not in ("on", "off")):
+            raise ValueError(usage)
+        self.action = action
+        self.arg = arg
+
+    def execute(self):
+        console = self.receiver.view.console
+        if self.action == "dump":
+            written = recorder.dump(self.arg)
+            console.add_line("%i samples written to %s" % (written, self.arg), is_command=False)
+        elif self.action == "items":
+            recorder.count_items = self.arg == "on"
+        elif self.action == "clear":
+            recorder.clear()
+        else:
+            console.add_lines(recorder.format_summary(), is_command=False)
+
+    def undo(self):
+        pass
+
+    def __repr__(self):
+        return "STATS %s" % self.action
+
+
+class ProfileCommand(DSCommand):
+    def __init__(self, receiver, *args, should_redraw=False):
+        """
+        Run a command or python code under cProfile, through the same
+        path as the console (including the redraw it triggers), and
+        show the functions with the highest cumulative time.
+
+        e.g. 'profile b.insert_many(range(1000))'
+             'profile -n 10 -o insert.prof sequence_name.execute()'
+
+        -n: number of functions shown (default 20)
+        -o: also write the stats to a file (for pstats, snakeviz, ...)
+        """
+        super().__init__()
+        self.receiver = receiver
+        self.should_redraw = should_redraw
+
+        self.top = 20
+        self.path = None
+
+        args = list(args)
+        while args and args[0] in ("-n", "-o"):
+            if len(args) < 2:
+                raise ValueError("Usage: profile [-n N] [-o file] <command>")
+            option, value = args.pop(0), args.pop(0)
+            if option == "-n":
+                self.top = int(value)
+            else:
+                self.path = value
+
+        if not args:
+            raise ValueError("Usage: profile [-n N] [-o file] <command>")
+        self.command_text = " ".join(args)
+
+    def run_command(self):
+        """
+        Run command text synchronously, as a dsDraw
+        command if it parses as one and as python otherwise
+        """
+        try:
+            command_obj = self.receiver.parse_command(self.command_text)
+        except InvalidCommandError:
+            command_obj = None
+
+        # outside the except block, so python errors don't
+        # show the failed command parse as their context
+        if command_obj is None:
+            self.receiver.python_shell.runcode(self.command_text)
+        else:
+            self.receiver.perform_command(command_obj)
+
+    def execute(self):
+        profiler = cProfile.Profile()
+        profiler.runcall(self.run_command)
+
+        out = io.StringIO()
+        stats = pstats.Stats(profiler, stream=out)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(self.top)
+
+        console = self.receiver.view.console
+        console.add_lines([line for line in out.getvalue().splitlines() if line.strip()], is_command=False)
+
+        if self.path is not None:
+            profiler.dump_stats(self.path)
+            console.add_line("Profile written to %s" % self.path, is_command=False)
+
+    def undo(self):
+        pass
+
+    def __repr__(self):
+        return "PROFILED %s" % self.command_text
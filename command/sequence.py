@@ -1,10 +1,14 @@
+import time
+from contextlib import ExitStack
 from command import DSCommand
 from . import command_factory
 from command import ModelCommand
+from datastructures.basic import InteractiveDataStructure
+from util.exceptions import InvalidCommandError
 
 
 class SequenceFactory(object):
-    
+
     def create_sequence(self, receiver, name, *seq_args):
         if not seq_args:
             return CommandSequence(receiver, name)
@@ -17,52 +21,208 @@ class SequenceFactory(object):
 
         raise Exception("Unknown sequence keyword: '%s'" % keyword)
 
+
+class VariableSlot(object):
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        """
+        Command argument written as $name in a sequence, looked
+        up in control.my_variables every time the command runs
+        """
+        self.name = name
+
+    def resolve(self, variables):
+        try:
+            return variables[self.name]
+        except KeyError:
+            raise KeyError("Variable name '%s' is not defined" % self.name)
+
+    def __repr__(self):
+        return "$" + self.name
+
+
+class BoundCommand(object):
+    def __init__(self, command_class, receiver, args):
+        """
+        Control command compiled from one line of a sequence. Commands
+        without variable slots are created once and reused, the rest are
+        created with the current values of their slots each time.
+        """
+        self.command_class = command_class
+        self.receiver = receiver
+        self.args = args
+        self.slots = [i for i, arg in enumerate(args) if isinstance(arg, VariableSlot)]
+
+        self.command = None
+        if not self.slots:
+            self.command = self.create(args)
+
+    def create(self, args):
+        try:
+            return self.command_class(self.receiver, *args)
+        except ValueError:
+            raise InvalidCommandError("Invalid arguments for '%s': '%s'" % (self.command_class.__name__, args))
+
+    def execute(self, variables):
+        """
+        Run command, returning it so the caller can check should_redraw
+        """
+        command = self.command
+        if command is None:
+            args = list(self.args)
+            for i in self.slots:
+                args[i] = args[i].resolve(variables)
+            command = self.create(args)
+
+        command.execute()
+        return command
+
+
+class PythonStep(object):
+    # python code redraws through the data structures it changes
+    should_redraw = False
+
+    def __init__(self, shell, code):
+        """
+        Line of python code in a sequence, compiled once by the shell
+        """
+        self.shell = shell
+        self.code_obj, self.is_expression = shell.compile_code(code)
+
+    def execute(self, variables):
+        self.shell.run_compiled(self.code_obj, self.is_expression)
+        return self
+
+
 class CommandSequence(DSCommand):
 
-    def __init__(self, receiver, name):
+    def __init__(self, receiver, name, redraw_every=1):
         """
         CommandSequence class to handle building of sequence,
         sequential execution.
 
-        self.sequence is a list of command text.
-        parsing is saved for run-time of command sequence
-        because assignment statements may need to be executed
-        before later commands can be parsed
+        self.sequence is a list of command text. It is compiled
+        the first time the sequence runs (see compile) and the
+        compiled steps are reused until a command is added.
 
         Future features: variable time for each task
 
         :param receiver: receiver of this command object (control object)
         :param name: name to be stored in control.my_variables
-        :param cmd_args: other arguments to sequence (for, while)
+        :param redraw_every: redraw after every n iterations of a loop
+            (0 to redraw only once the sequence is done)
         """
         super().__init__()
         self.receiver = receiver
         self.name = name
         self.sequence = []
+        self.redraw_every = redraw_every
+
+        # loop variable, set by sequences which iterate
+        self.v_name = None
+
+        self._steps = None
 
     def get_command_factory(self):
         return command_factory.SequenceCommandFactory(self)
 
     def add_command(self, command_obj):
         self.sequence.append(command_obj)
+        self._steps = None
+
+    def compile(self):
+        """
+        Turn command text into steps once: control commands are bound to
+        their class with $name arguments left as variable slots, anything
+        else is compiled as python code. Raises SyntaxError for lines
+        which are neither.
+        """
+        if self._steps is not None:
+            return self._steps
+
+        factory = command_factory.ControlCommandFactory(self.receiver)
+        steps = []
+        for command_text in self.sequence:
+            spl = command_text.split(" ")
+            try:
+                command_class = factory.get_command_class(spl[0])
+            except InvalidCommandError:
+                steps.append(PythonStep(self.receiver.python_shell, command_text))
+                continue
+
+            args = [VariableSlot(arg[1:]) if arg.startswith("$") and len(arg) > 1 else arg
+                    for arg in spl[1:]]
+            steps.append(BoundCommand(command_class, self.receiver, args))
+
+        self._steps = steps
+        return steps
 
     def execute(self):
         """Execute each command in sequence, waiting for the previous
             task to finish before moving on"""
+        self.run([None])
 
-        for command_text in self.sequence:
-            command = self.receiver.parse_command(command_text)
-            command.execute()
-
-            if command.should_redraw:
-                # if command receiver is control or sequence
-                if not isinstance(command, ModelCommand):
-                    self.receiver.display()
-                else:
-                    control = self.receiver
-                    model_name = command.receiver.name
-                    render_obj = control.my_renders[model_name]
-                    render_obj.display()
+    def run(self, values):
+        """
+        Run compiled steps once per value (assigned to the loop variable).
+        Data structures are batched and redrawn every redraw_every
+        iterations, and canvases of control commands which need a
+        redraw are redrawn at the same time.
+        """
+        steps = self.compile()
+        variables = self.receiver.my_variables
+        every = self.redraw_every
+
+        # renders to redraw: None for all, else set of model names
+        self._pending = set()
+        batches = ExitStack()
+        try:
+            for i, value in enumerate(values):
+                if i == 0 or (every and i % every == 0):
+                    self.open_batches(batches, variables)
+
+                if self.v_name is not None:
+                    variables[self.v_name] = value
+
+                for step in steps:
+                    command = step.execute(variables)
+                    if command.should_redraw:
+                        self.mark_redraw(command)
+
+                if every and (i + 1) % every == 0:
+                    batches.close()
+                    self.redraw()
+        finally:
+            batches.close()
+            self.redraw()
+
+    def open_batches(self, batches, variables):
+        """
+        Enter batch() of every data structure shown, so changes
+        to each one are drawn once when the batches are closed
+        """
+        for value in list(variables.values()):
+            if isinstance(value, InteractiveDataStructure):
+                batches.enter_context(value.batch())
+
+    def mark_redraw(self, command):
+        if not isinstance(command, ModelCommand):
+            self._pending = None
+        elif self._pending is not None:
+            self._pending.add(command.receiver.name)
+
+    def redraw(self):
+        """
+        Redraw canvases marked by commands since the last redraw
+        """
+        pending, self._pending = self._pending, set()
+        if pending is None:
+            self.receiver.display()
+            return
+
+        for model_name in pending:
+            self.receiver.my_renders[model_name].display()
 
     def undo(self):
         pass
@@ -70,31 +230,41 @@ class CommandSequence(DSCommand):
 
 class ForSequence(CommandSequence):
 
-    def __init__(self, receiver, name, v_name, iterable):
+    def __init__(self, receiver, name, v_name, *iterable):
         """
         CommandSequence with for loop structure. Assigns variable
         name to values of some iterable. Command takes the form:
-            seq_for abc i g:nodes
+            sequence abc for i g.nodes
         name - abc
         variable name - i
-        iterable - g:nodes (g is some reference to datastructure)
+        iterable - g.nodes (python expression evaluated in my_variables)
+
+        Commands in the sequence can refer to the current value
+        as $i, python code in the sequence simply uses i.
+
         :param receiver: receiver of this command - control object
         :param name: name to be assigned to the sequence in control.my_variables
         :param v_name: name to be temporarily assigned to each item in iterable
-        :param iter_string: name of some data structure and iterable attribute
+        :param iterable: expression (may have been split on spaces) or iterable object
         """
-        DSCommand.__init__(self)
-        self.receiver = receiver
-        self.name = name
-        self.sequence = []
+        CommandSequence.__init__(self, receiver, name)
         self.v_name = v_name
 
-        # get reference to iterable structure
-        self.iterable = iterable
+        # expression is evaluated every time the sequence runs
+        self.iterable = " ".join(iterable) if all(isinstance(part, str) for part in iterable) else iterable[0]
 
         # assign name in control object
         self.receiver.my_variables[name] = self
 
+    def evaluate_iterable(self):
+        if not isinstance(self.iterable, str):
+            return self.iterable
+        shell = self.receiver.python_shell
+        code_obj, is_expression = shell.compile_code(self.iterable)
+        if not is_expression:
+            raise InvalidCommandError("Error completing sequence: '%s' is not an expression" % self.iterable)
+        return shell.run_compiled(code_obj, is_expression)
+
     def execute(self):
         """
         Attempt to iterate through iterable object and
@@ -103,42 +273,65 @@ class ForSequence(CommandSequence):
          """
         try:
             # generate list before iteration in case contents
-            # change (e.g. adding nodes to graph while iterating through g:nodes)
-            iter = list(self.iterable)
-            for i in iter:
-                # assign i to variable name
-                self.receiver.my_variables[self.v_name] = i
-
-                # execute sequence of commands
-                super().execute()
+            # change (e.g. adding nodes to graph while iterating through g.nodes)
+            values = list(self.evaluate_iterable())
+        except TypeError:
+            raise Exception("Error completing sequence: %s is not iterable" % self.iterable)
 
+        try:
+            self.run(values)
+        finally:
             # delete iterated variable reference
-            del self.receiver.my_variables[self.v_name]
-
-        except TypeError as e:
-            print(e)
-            raise Exception("Error completing sequence: %s is not iterable" % self.iterable)
+            if values and self.v_name in self.receiver.my_variables:
+                del self.receiver.my_variables[self.v_name]
 
 
 class WhileSequence(CommandSequence):
 
-    def __init__(self, receiver, name, *condition_args):
-        DSCommand.__init__(self)
-        self.receiver = receiver
-        self.name = name
-        self.sequence = []
-        self.condition = condition_args
+    def __init__(self, receiver, name, *condition_args, max_iterations=10 ** 5, max_seconds=30):
+        """
+        CommandSequence repeated while a python condition holds:
+            sequence drain while len(h) > 0
+        The condition is compiled once and evaluated in
+        control.my_variables before every iteration.
+
+        :param condition_args: condition (may have been split on spaces)
+        :param max_iterations: most iterations run before giving up
+        :param max_seconds: most seconds spent before giving up
+        """
+        CommandSequence.__init__(self, receiver, name)
+        self.condition = " ".join(condition_args)
+        self.max_iterations = max_iterations
+        self.max_seconds = max_seconds
+
+        self.code_obj, is_expression = receiver.python_shell.compile_code(self.condition)
+        if not is_expression:
+            raise InvalidCommandError("While condition must be an expression: '%s'" % self.condition)
 
+    def iterations(self):
+        """
+        Yield iteration numbers while condition holds,
+        raising once either budget is used up
+        """
+        shell = self.receiver.python_shell
+        start = time.perf_counter()
+        i = 0
+        while shell.run_compiled(self.code_obj, True):
+            if i >= self.max_iterations:
+                raise Exception("Error completing sequence: '%s' still true after %i iterations"
+                                % (self.condition, i))
+            if time.perf_counter() - start > self.max_seconds:
+                raise Exception("Error completing sequence: '%s' still true after %i seconds"
+                                % (self.condition, self.max_seconds))
+            yield i
+            i += 1
 
     def execute(self):
         """
         Execute sequence as long as condition
         evaluates True
         """
-        # while self.condition():
-        #     super().execute()
+        self.run(self.iterations())
 
     def undo(self):
         pass
-
-
@@ -1,16 +1,15 @@
-from datastructures import tree
-from drawtools import view
 from util import logging_util as log
-from tkinter import Tk
 import random
 from util.my_threads import CommandThread
 from functools import partial
 from collections import deque
-from time import sleep
+from time import sleep, perf_counter
 from command.command_factory import ControlCommandFactory
 from util.exceptions import InvalidCommandError
 from command import ModelCommand
 from controller.shell import EmbeddedShell
+from drawtools.animation import Timeline
+from util.instrumentation import recorder
 
 
 class DrawControl:
@@ -22,22 +21,22 @@ class DrawControl:
         :param width: screen width
         :param height: screen height
         """
-        # creating loggers
+        # creating loggers (log files are emptied and
+        # opened when the first message is written)
         self.logger = log.create_logger("control_logger", "debug", "../logs/control_log.log")
         self.view_logger = log.create_logger("view_logger", "debug", "../logs/view_log.log")
         self.model_logger = log.create_logger("model_logger", "debug", "../logs/model_log.log")
 
-        # clear logging file
-        self.clear_log()
-
         # creating main view (subclass of tk.Frame)
-        # and passing in data structure
+        # and passing in data structure. Imported here so
+        # HeadlessControl can run without importing tkinter
+        from drawtools import view
         self.view = view.DrawApp(master=master, width=width, height=height,
                                  control=self, background="#333")
         self.view.set_logger(self.view_logger)
 
-        self.logger.info("\n\n\t----- new run -----\n")
-        self.logger.info("created main view")
+        # animations run from the Tk event loop
+        self.timeline = Timeline(self.view)
 
         # use stack to keep track of command history
         self.command_history = deque()
@@ -113,11 +112,6 @@ class DrawControl:
             if render_obj.focused:
                 return render_obj
 
-    def clear_log(self):
-        """Open log and immediately close stream to empty file contents"""
-        with open('./logs/control_log.log', 'w'):
-            pass
-
     def parse_command(self, command_text):
         """
         Parses a command with the first argument being
@@ -213,24 +207,29 @@ class DrawControl:
         :return: return in case of commands like bst.find()
         """
 
-        self.logger.info("Performing %s on %s" % (command_obj, command_obj.receiver))
-
-        command_value = command_obj.execute()
+        self.logger.info("Performing %s on %s", command_obj, command_obj.receiver)
 
-        if command_obj.should_redraw:
-            if not isinstance(command_obj, ModelCommand):
-                self.display(do_sleep=False)
-            else:
-                # show animations and only update
-                # relevant canvas
-                try:
-                    render_obj = self.my_renders[command_obj.receiver.name]
-
-                    ##### need to add do_render as parameter #####
-
-                    render_obj.display(do_render=command_obj.do_render)
-                except KeyError:
-                    raise Exception("Error updating canvas for '%s'. No corresponding render object" % command_obj.receiver)
+        start = perf_counter()
+        try:
+            command_value = command_obj.execute()
+
+            if command_obj.should_redraw:
+                if not isinstance(command_obj, ModelCommand):
+                    self.display(do_sleep=False)
+                else:
+                    # show animations and only update
+                    # relevant canvas
+                    try:
+                        render_obj = self.my_renders[command_obj.receiver.name]
+
+                        ##### need to add do_render as parameter #####
+
+                        render_obj.display(do_render=command_obj.do_render)
+                    except KeyError:
+                        raise Exception("Error updating canvas for '%s'. No corresponding render object" % command_obj.receiver)
+        finally:
+            # time per command type, including the redraw
+            recorder.record("command", type(command_obj).__name__, perf_counter() - start)
 
         return command_value
 
@@ -274,6 +273,22 @@ class DrawControl:
             self.view.console.add_line(msg, is_command=False)
             raise InvalidCommandError(msg)
 
+    def process_redo(self, event=None):
+        """
+        Redo most recently undone change on
+        active data structure.
+        """
+        active_render = self.get_focused()
+        interactive_obj = self.my_variables[active_render.name]
+
+        try:
+            interactive_obj.redo_state()
+        except IndexError:
+            # pop from empty list
+            msg = "Cannot perform redo: Nothing left to redo for '%s'" % active_render.name
+            self.view.console.add_line(msg, is_command=False)
+            raise InvalidCommandError(msg)
+
     def perform_undo(self, last_command):
         """
         Encapsulates performance of undo command including redrawing
@@ -0,0 +1,187 @@
+import logging
+import sys
+import time
+from collections import deque, defaultdict, namedtuple
+from controller.drawcontrol import DrawControl
+from controller.shell import EmbeddedShell
+from command.sequence import SequenceFactory
+from drawtools.animation import Timeline
+from drawtools.headless import HeadlessCanvas
+from util.exceptions import InvalidCommandError
+
+CommandTimings = namedtuple("CommandTimings", ["command", "count", "total", "mean", "max"])
+
+
+class StreamConsole(object):
+    def __init__(self, out):
+        """
+        Console stand-in writing output lines to a stream
+        """
+        self.out = out
+
+    def add_line(self, text, is_command=True):
+        print((">> %s" if is_command else "%s") % text, file=self.out)
+
+    def add_lines(self, texts, is_command=False):
+        for text in texts:
+            self.add_line(text, is_command)
+
+    def clear_console(self):
+        pass
+
+    def sequence_mode(self, mode):
+        pass
+
+
+class HeadlessView(object):
+    def __init__(self, out):
+        self.console = StreamConsole(out)
+
+
+class NoRender(object):
+    def __init__(self, render):
+        """
+        Wraps a render object so nothing gets drawn (--no-render).
+        Everything but display() is passed on to the render object.
+        """
+        self.render = render
+
+    def display(self, do_render=True, do_sleep=False):
+        pass
+
+    def is_drawn(self, index):
+        return False
+
+    def __getattr__(self, name):
+        return getattr(self.render, name)
+
+
+class HeadlessControl(DrawControl):
+    def __init__(self, width=800, height=600, render=True, out=sys.stdout):
+        """
+        DrawControl without Tk: commands go through the same
+        parse_command/perform_command and EmbeddedShell path, but run
+        synchronously, draw to HeadlessCanvases and print to out.
+
+        :param width: width of each structure's canvas
+        :param height: height of each structure's canvas
+        :param render: False to skip drawing entirely
+        :param out: stream console output is written to
+        """
+        self.logger = logging.getLogger("dsDraw.control")
+        self.width = width
+        self.height = height
+        self.render = render
+
+        self.view = HeadlessView(out)
+
+        # no event loop to animate in, animations finish at once
+        self.timeline = Timeline(None)
+        self.timeline.instant = True
+
+        self.command_history = deque()
+
+        self.python_shell = EmbeddedShell(console=self.view.console)
+        self.my_variables = self.python_shell.locals
+        self.my_renders = {}
+
+        # command type -> seconds taken by each command of that type
+        self.timings = defaultdict(list)
+
+    def add_model_to_view(self, model_name):
+        if model_name in self.my_renders:
+            raise Exception("Model '%s' already assigned to a render object" % model_name)
+
+        my_model = self.my_variables[model_name]
+        my_model.set_name(model_name)
+
+        render_class = my_model.get_render_class()
+        my_render = self.wrap_render(render_class(my_model, HeadlessCanvas(self.width, self.height), name=model_name))
+        self.my_renders[model_name] = my_render
+
+        interactive_class = my_model.get_interactive_class()
+        self.my_variables[model_name] = interactive_class(self, my_model, my_render)
+        self.my_variables["_" + model_name] = my_model
+
+    def wrap_render(self, render):
+        """
+        Render object used for a newly shown structure,
+        wrapped in NoRender when drawing is turned off
+        """
+        return render if self.render else NoRender(render)
+
+    def give_focus(self, render):
+        pass
+
+    def process_command(self, command_text):
+        """
+        Run one line: a dsDraw command if it parses as one,
+        python code otherwise. Errors are printed, not raised.
+
+        :return: command type the time was recorded under
+        """
+        start = time.perf_counter()
+        try:
+            command_obj = self.parse_command(command_text)
+        except InvalidCommandError:
+            command_obj = None
+
+        # run python outside the except block, so its errors don't
+        # show the failed command parse as their context
+        if command_obj is None:
+            self.python_shell.runcode(command_text)
+            command_type = "python"
+        else:
+            command_type = command_text.split(" ")[0]
+            try:
+                self.perform_command(command_obj)
+                self.command_history.appendleft(command_obj)
+            except Exception as ex:
+                self.view.console.add_line("Error completing '%s': %s" % (command_text, ex), is_command=False)
+
+        self.timings[command_type].append(time.perf_counter() - start)
+        return command_type
+
+    def run(self, lines):
+        """
+        Run lines of a script (any iterable of strings, e.g. an open
+        file, which is read as it goes). Blank lines and lines starting
+        with # are skipped. 'sequence ...' lines collect the lines up
+        to 'end' into a sequence, as typing them in the console does.
+        """
+        lines = iter(lines)
+        for line in lines:
+            line = line.rstrip("\n")
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+
+            spl = line.split(" ")
+            if spl[0] == "sequence":
+                start = time.perf_counter()
+                sequence = SequenceFactory().create_sequence(self, *spl[1:])
+                for seq_line in lines:
+                    seq_line = seq_line.strip()
+                    if seq_line == "end":
+                        break
+                    if seq_line:
+                        sequence.add_command(seq_line)
+                self.my_variables[sequence.name] = sequence
+                self.timings["sequence"].append(time.perf_counter() - start)
+                continue
+
+            self.process_command(line)
+
+    def summary(self):
+        """
+        CommandTimings per command type, slowest total first
+        """
+        rows = [CommandTimings(command, len(times), sum(times), sum(times) / len(times), max(times))
+                for command, times in self.timings.items()]
+        return sorted(rows, key=lambda row: row.total, reverse=True)
+
+    def format_summary(self):
+        lines = ["%-12s %8s %10s %10s %10s" % ("command", "count", "total s", "mean ms", "max ms")]
+        for row in self.summary():
+            lines.append("%-12s %8i %10.3f %10.3f %10.3f"
+                         % (row.command, row.count, row.total, row.mean * 1000, row.max * 1000))
+        return "\n".join(lines)
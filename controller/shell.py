@@ -1,20 +1,90 @@
 from code import InteractiveConsole
+from collections import namedtuple
 from datastructures.basic import InteractiveDataStructure
 from threading import Thread
 from contextlib import redirect_stdout, redirect_stderr
+import ast
 import sys
+import time
 from importlib import import_module
+from functools import lru_cache
+from util.instrumentation import recorder
+import datastructures
+
+# seconds spent compiling and running the last piece of code
+CodeTimings = namedtuple("CodeTimings", ["compile", "execute"])
 
 
 class MyStdOut(object):
-    def __init__(self, console):
+    def __init__(self, console, frame_ms=33, limit=64 * 1024):
+        """
+        Buffered stdout for the embedded shell. Output is collected
+        and handed to the console as whole lines at most once per
+        frame, and once more when the command finishes (end_command).
+
+        :param console: Console to show output in
+        :param frame_ms: minimum time between flushes to the console
+        :param limit: characters of output shown per command, the rest
+            is dropped and counted in a note at the end
+        """
         self.console = console
+        self.frame_ms = frame_ms
+        self.limit = limit
+
+        self._parts = []
+        self._written = 0
+        self._dropped = 0
+        self._last_flush = time.perf_counter()
 
     def write(self, data):
-        self.console.add_line(data, is_command=False)
+        room = self.limit - self._written
+        if len(data) > room:
+            self._dropped += len(data) - max(room, 0)
+            data = data[:max(room, 0)]
+
+        if data:
+            self._parts.append(data)
+            self._written += len(data)
+
+            if (time.perf_counter() - self._last_flush) * 1000 >= self.frame_ms:
+                self.flush_lines()
+        return len(data)
+
+    def flush_lines(self, partial=False):
+        """
+        Send complete lines in the buffer to the console,
+        keeping an unfinished last line unless partial is set
+        """
+        self._last_flush = time.perf_counter()
+        if not self._parts:
+            return
+
+        lines = "".join(self._parts).split("\n")
+        rest = lines.pop()
+        if partial and rest:
+            lines.append(rest)
+            rest = ""
+        self._parts = [rest] if rest else []
+
+        # empty lines in between are kept (print() shows a blank line),
+        # only the empty piece after a final newline is dropped
+        if lines:
+            self.console.add_lines(lines, is_command=False)
 
     def flush(self):
-        self.console.clear_input()
+        self.flush_lines(partial=True)
+
+    def end_command(self):
+        """
+        Show remaining output (and how much was cut off)
+        and reset the limit for the next command
+        """
+        self.flush_lines(partial=True)
+        if self._dropped:
+            self.console.add_line("[output truncated: %i characters not shown]" % self._dropped,
+                                  is_command=False)
+        self._written = 0
+        self._dropped = 0
 
 
 class VariableEnvironment(dict):
@@ -27,6 +97,10 @@ class VariableEnvironment(dict):
         self.variables = {}
         self.recently_touched = []
 
+        # name -> (module, attribute) imported the first time the
+        # name is looked up, so startup doesn't import every module
+        self.lazy = {}
+
     def __getitem__(self, var_name):
         """
         Update a data structure's state
@@ -45,13 +119,40 @@ class VariableEnvironment(dict):
         #     # append to recents list for redrawing
         #     self.recently_touched.append(var_name)
 
-        return self.variables[var_name]
+        try:
+            return self.variables[var_name]
+        except KeyError:
+            if var_name not in self.lazy:
+                raise
+        value = self.variables[var_name] = datastructures.load(*self.lazy[var_name])
+        del self.lazy[var_name]
+        return value
 
     def __setitem__(self, var_name, value):
+        self.lazy.pop(var_name, None)
         self.variables[var_name] = value
 
     def __delitem__(self, var_name):
-        del self.variables[var_name]
+        if self.lazy.pop(var_name, None) is None:
+            del self.variables[var_name]
+
+    def __contains__(self, var_name):
+        return var_name in self.variables or var_name in self.lazy
+
+    def values(self):
+        return self.variables.values()
+
+
+@lru_cache(maxsize=256)
+def compile_source(code):
+    """
+    Compile code for EmbeddedShell.compile_code, cached by source
+    text (code objects don't depend on the shell they run in)
+    """
+    tree = ast.parse(code, "<console>")
+    if len(tree.body) == 1 and isinstance(tree.body[0], ast.Expr):
+        return compile(ast.Expression(tree.body[0].value), "<console>", "eval"), True
+    return compile(tree, "<console>", "exec"), False
 
 
 class EmbeddedShell(InteractiveConsole):
@@ -67,38 +168,61 @@ class EmbeddedShell(InteractiveConsole):
         self.locals = VariableEnvironment()
         self.console = console
         self.my_std_out = MyStdOut(self.console)
+        self.timings = CodeTimings(0, 0)
+
+        # data structure classes, imported when first used
+        for module_name, class_name in datastructures.MODEL_TYPES.values():
+            self.locals.lazy[class_name] = (module_name, class_name)
 
-        self.runcode("from datastructures.arrays import *")
-        self.runcode("from datastructures.tree import BST, BinaryHeap")
-        self.runcode("from datastructures.graph import Graph")
+    def compile_code(self, code):
+        """
+        Parse code once and compile it as an expression if it is a
+        single expression (so its value can be shown), otherwise as
+        statements. Compiled code is cached by source text.
+
+        :return: (code object, is_expression)
+        :raises SyntaxError: if code isn't valid python
+        """
+        return compile_source(code)
+
+    def run_compiled(self, code_obj, is_expression):
+        """
+        Run code object from compile_code in the shell's
+        variables, returning the value of an expression
+        """
+        if is_expression:
+            return eval(code_obj, self.locals)
+        exec(code_obj, self.locals)
 
     def runcode(self, code):
         # reset list of recently touched data structures
         self.locals.recently_touched = []
         with redirect_stdout(self.my_std_out):
+            start = time.perf_counter()
+            compiled = None
             try:
-                # use temp_var to get return value from exec
-                self.locals["TEMP_VAR"] = None
+                code_obj, is_expression = self.compile_code(code)
+                compiled = time.perf_counter()
 
-                # try to assign return value to TEMP_VAR
-                try:
-                    exec("TEMP_VAR = " + code, self.locals)
-                except SyntaxError:
-                    exec(code, self.locals)
+                value = self.run_compiled(code_obj, is_expression)
 
                 # print return value if any
-                if self.locals["TEMP_VAR"] and "print" not in code \
-                        and "=" not in code:
-                    print(self.locals["TEMP_VAR"])
-
-                # clean up namespace
-                del self.locals["TEMP_VAR"]
+                if value:
+                    print(value)
 
             except SystemExit:
                 raise
             except Exception as e:
                 self.showtraceback()
                 print("[ERROR]: " + str(e))
+            finally:
+                end = time.perf_counter()
+                if compiled is None:
+                    self.timings = CodeTimings(end - start, 0)
+                else:
+                    self.timings = CodeTimings(compiled - start, end - compiled)
+                recorder.record("command", "python", end - start)
+                self.my_std_out.end_command()
 
         # return list of recently touched data structures for redrawing
         return self.locals.recently_touched
@@ -107,6 +231,7 @@ class EmbeddedShell(InteractiveConsole):
         self.console.add_line(line, is_command=False)
 
     def write(self, data):
-        self.console.add_line(data, is_command=False)
+        # tracebacks go through the same buffer so they stay in order
+        self.my_std_out.write(data)
 
 
@@ -1,20 +1,45 @@
-from datastructures import tree, graph, arrays
+from importlib import import_module
+
+# model type -> (module, class name). Modules (and the render and
+# command modules they pull in) are imported the first time a model
+# of that type is created, not when the package is imported.
+MODEL_TYPES = {
+    "bst": ("datastructures.tree", "BST"),
+    "pbst": ("datastructures.tree", "PersistentBST"),
+    "heap": ("datastructures.tree", "BinaryHeap"),
+    "graph": ("datastructures.graph", "Graph"),
+    "array": ("datastructures.arrays", "Array"),
+    "compact": ("datastructures.arrays", "CompactArray"),
+}
+
+SUBMODULES = ("tree", "graph", "arrays", "algorithms", "interactive", "basic", "history")
+
+
+def load(module_name, class_name):
+    return getattr(import_module(module_name), class_name)
+
+
+def __getattr__(name):
+    """
+    Import submodules on first access, so datastructures.tree
+    keeps working after a plain 'import datastructures'
+    """
+    if name in SUBMODULES:
+        return import_module("datastructures." + name)
+    raise AttributeError("module 'datastructures' has no attribute '%s'" % name)
+
 
 class ModelFactory(object):
     def __init__(self):
-        self.model_types = {
-            "bst": tree.BST,
-            "heap": tree.BinaryHeap,
-            "graph": graph.Graph,
-            "array": arrays.Array,
-        }
+        self.model_types = MODEL_TYPES
+
+    def get_model_class(self, model_type_name):
+        module_name, class_name = self.model_types[model_type_name]
+        return load(module_name, class_name)
 
     def create_model(self, model_type_name, *other_args):
         try:
-            model_class = self.model_types[model_type_name]
+            model_class = self.get_model_class(model_type_name)
             return model_class(*other_args)
         except KeyError as e:
             raise e
-
-
-
@@ -0,0 +1,326 @@
+from array import array
+from drawtools import dsDraw_colors
+from drawtools.animation import Animation
+
+
+# trace operations, stored as (op, a, b, c) rows
+COMPARE = 0     # compare a, b
+SWAP = 1        # swap a, b
+SET = 2         # set a to values[c]
+COLOR = 3       # color a..b (exclusive) with colors[c]
+
+
+class SortTrace(object):
+    def __init__(self, values):
+        """
+        Runs a sorting algorithm on a plain list of values and
+        records every compare, swap, write and coloring as a
+        flat array of (op, a, b, c) rows, so it can be played
+        back later at any speed.
+
+        Algorithms only touch values through less(), swap(),
+        set() and color() so every step is recorded.
+
+        :param values: list of values to sort (not modified)
+        """
+        self.values = list(values)
+        self.initial = list(values)
+        self.ops = array("q")
+
+        # side tables for SET values and COLOR names
+        self.set_values = []
+        self.colors = []
+        self._color_index = {}
+
+        self.compares = 0
+        self.swaps = 0
+
+    def __len__(self):
+        return len(self.ops) // 4
+
+    def __getitem__(self, step):
+        return tuple(self.ops[step * 4:step * 4 + 4])
+
+    def less(self, i, j):
+        self.ops.extend((COMPARE, i, j, 0))
+        self.compares += 1
+        return self.values[i] < self.values[j]
+
+    def less_value(self, i, value):
+        """
+        Compare values[i] with a value that isn't
+        in the array (e.g. merge buffer), recorded as compare i, i
+        """
+        self.ops.extend((COMPARE, i, i, 0))
+        self.compares += 1
+        return self.values[i] < value
+
+    def swap(self, i, j):
+        if i == j:
+            return
+        self.ops.extend((SWAP, i, j, 0))
+        self.swaps += 1
+        self.values[i], self.values[j] = self.values[j], self.values[i]
+
+    def set(self, i, value):
+        self.ops.extend((SET, i, 0, len(self.set_values)))
+        self.set_values.append(value)
+        self.values[i] = value
+
+    def color(self, color_name, low, high=None):
+        high = low + 1 if high is None else high
+        # plain Tk color names (e.g. white) pass through
+        color = dsDraw_colors.get(color_name, color_name)
+        if color not in self._color_index:
+            self._color_index[color] = len(self.colors)
+            self.colors.append(color)
+        self.ops.extend((COLOR, low, high, self._color_index[color]))
+
+
+def bubble_sort(t):
+    n = len(t.values)
+    for end in range(n - 1, 0, -1):
+        for i in range(end):
+            if t.less(i + 1, i):
+                t.swap(i, i + 1)
+        t.color("green", end)
+
+
+def selection_sort(t):
+    n = len(t.values)
+    for start in range(n - 1):
+        smallest = start
+        for i in range(start + 1, n):
+            if t.less(i, smallest):
+                smallest = i
+        t.swap(start, smallest)
+        t.color("green", start)
+
+
+def insertion_sort(t):
+    for i in range(1, len(t.values)):
+        j = i
+        while j > 0 and t.less(j, j - 1):
+            t.swap(j, j - 1)
+            j -= 1
+
+
+def quick_sort(t):
+    # explicit stack so large arrays don't hit recursion limit
+    stack = [(0, len(t.values) - 1)]
+    while stack:
+        low, high = stack.pop()
+        if low >= high:
+            if low == high:
+                t.color("green", low)
+            continue
+
+        # Lomuto partition with middle element as pivot
+        t.swap((low + high) // 2, high)
+        t.color("purple", high)
+        store = low
+        for i in range(low, high):
+            if t.less(i, high):
+                t.swap(i, store)
+                store += 1
+        t.swap(store, high)
+        t.color("green", store)
+
+        stack.append((store + 1, high))
+        stack.append((low, store - 1))
+
+
+def merge_sort(t):
+    n = len(t.values)
+    width = 1
+    while width < n:
+        for low in range(0, n, 2 * width):
+            mid = min(low + width, n)
+            high = min(low + 2 * width, n)
+            if mid >= high:
+                continue
+
+            t.color("light blue", low, high)
+
+            # merge using buffer of left run, writing back into array
+            left = t.values[low:mid]
+            i, k = 0, low
+            j = mid
+            while i < len(left) and j < high:
+                if t.less_value(j, left[i]):
+                    t.set(k, t.values[j])
+                    j += 1
+                else:
+                    t.set(k, left[i])
+                    i += 1
+                k += 1
+            while i < len(left):
+                t.set(k, left[i])
+                i += 1
+                k += 1
+
+            t.color("white", low, high)
+        width *= 2
+
+
+SORTS = {
+    "bubble": bubble_sort,
+    "selection": selection_sort,
+    "insertion": insertion_sort,
+    "quick": quick_sort,
+    "merge": merge_sort,
+}
+
+
+def record_sort(values, algorithm):
+    """
+    Run named sorting algorithm on values and return its SortTrace.
+    Whole array is colored green at the end.
+    """
+    try:
+        sort_func = SORTS[algorithm]
+    except KeyError:
+        raise ValueError("Unknown sorting algorithm '%s'. Choose from %s"
+                         % (algorithm, ", ".join(sorted(SORTS))))
+
+    trace = SortTrace(values)
+    sort_func(trace)
+    trace.color("green", 0, len(trace.values))
+    return trace
+
+
+class TracePlayer(Animation):
+    def __init__(self, model, render, trace, speed=20, on_done=None):
+        """
+        Plays a SortTrace back onto an array model, redrawing
+        at most once per frame no matter how many steps are applied.
+
+        :param model: Array/CompactArray the trace was recorded from
+        :param render: RenderArray of the model
+        :param trace: SortTrace
+        :param speed: steps per second at timeline speed 1
+        """
+        super().__init__(on_done)
+        self.model = model
+        self.render = render
+        self.trace = trace
+        self.speed = speed
+
+        self.position = 0
+        self.paused = False
+        self.stopped = False
+
+        self.compares = 0
+        self.swaps = 0
+
+        # step budget carried over between frames
+        self._pending = 0
+
+        # colors before playback, to rewind when seeking backwards
+        self._initial_colors = [model.get_color(i) for i in range(len(model))]
+
+    def __repr__(self):
+        return "TracePlayer(step %s of %s, %s compares, %s swaps)" \
+               % (self.position, len(self.trace), self.compares, self.swaps)
+
+    def apply(self, step):
+        """
+        Apply a single recorded step to the model. Returns
+        indices being compared (for highlighting), if any.
+        """
+        op, a, b, c = self.trace[step]
+        if op == COMPARE:
+            self.compares += 1
+            return a, b
+        elif op == SWAP:
+            self.swaps += 1
+            self.model.swap(a, b)
+        elif op == SET:
+            self.model.set_value(a, self.trace.set_values[c])
+        elif op == COLOR:
+            self.model.color_range(self.trace.colors[c], a, b)
+        return None
+
+    def advance(self, n, redraw=True):
+        """
+        Apply next n steps and redraw once.
+        """
+        if self.stopped:
+            return
+        compared = None
+        end = min(len(self.trace), self.position + n)
+        for step in range(self.position, end):
+            compared = self.apply(step) or compared
+        self.position = end
+        if redraw:
+            self.redraw(compared)
+
+    def redraw(self, compared=None):
+        """
+        Draw current state with compared pair highlighted and counts shown.
+        Highlight is only applied for drawing and then removed from model.
+        """
+        self.render.status = "step %s/%s  compares: %s  swaps: %s" \
+                             % (self.position, len(self.trace), self.compares, self.swaps)
+
+        if compared and self.position < len(self.trace):
+            old = [(i, self.model.get_color(i)) for i in set(compared)]
+            for i, _ in old:
+                self.model.set_color(i, dsDraw_colors["yellow"])
+            self.render.display(do_render=False)
+            for i, color in old:
+                self.model.set_color(i, color)
+        else:
+            self.render.display(do_render=False)
+
+    def step(self, dt):
+        if self.stopped:
+            return True
+        if self.paused:
+            return False
+
+        self._pending += dt * self.speed
+        n = int(self._pending)
+        if n:
+            self._pending -= n
+            self.advance(n)
+
+        return self.position >= len(self.trace)
+
+    def finish(self):
+        self.advance(len(self.trace) - self.position)
+
+    def stop(self):
+        """
+        Jump to the end without drawing, then leave the model alone:
+        later frames, seeks and skips do nothing (e.g. once the sort
+        is undone)
+        """
+        self.advance(len(self.trace) - self.position, redraw=False)
+        self.stopped = True
+        self.render.status = None
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    def skip(self, n):
+        """
+        Jump n steps ahead (or back if negative)
+        """
+        self.seek(self.position + n)
+
+    def seek(self, step):
+        """
+        Scrub to any step. Going backwards rewinds the model to the
+        initial values and replays up to step.
+        """
+        step = max(0, min(step, len(self.trace)))
+        if step < self.position:
+            for i, (value, color) in enumerate(zip(self.trace.initial, self._initial_colors)):
+                self.model.set_value(i, value)
+                self.model.set_color(i, color)
+            self.position = self.compares = self.swaps = 0
+        self.advance(step - self.position)
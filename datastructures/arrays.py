@@ -1,6 +1,7 @@
 from datastructures.basic import DataStructure
 from drawtools.render import RenderArray
 import datastructures.interactive
+from array import array
 import random
 
 
@@ -46,6 +47,31 @@ class Array(DataStructure):
     def __len__(self):
         return self.size
 
+    def get_value(self, index):
+        return self._array[index].value
+
+    def set_value(self, index, value):
+        self._array[index].value = value
+
+    def get_color(self, index):
+        return self._array[index].color
+
+    def set_color(self, index, color):
+        self._array[index].color = color
+
+    def color_range(self, color, low, high):
+        """
+        Color elements low to high (exclusive)
+        """
+        for i in range(low, high):
+            self._array[i].color = color
+
+    def swap(self, i, j):
+        self._array[i], self._array[j] = self._array[j], self._array[i]
+
+    def values(self):
+        return [arr_node.value for arr_node in self._array]
+
     def clone(self):
         """
         Copy value and color of each element.
@@ -72,3 +98,136 @@ class Array(DataStructure):
         return datastructures.interactive.InteractiveArray
 
 
+class CompactArrayNode(object):
+    __slots__ = ("array", "index")
+
+    def __init__(self, array, index):
+        """
+        View of one element of a CompactArray with the same
+        value and color attributes as ArrayNode. Reads and writes
+        go straight to the array's buffers, so the view always
+        refers to whatever element is at index.
+        """
+        self.array = array
+        self.index = index
+
+    def __repr__(self):
+        return "ArrayNode(%s)" % self.value
+
+    @property
+    def value(self):
+        return self.array.get_value(self.index)
+
+    @value.setter
+    def value(self, value):
+        self.array.set_value(self.index, value)
+
+    @property
+    def color(self):
+        return self.array.get_color(self.index)
+
+    @color.setter
+    def color(self, color):
+        self.array.set_color(self.index, color)
+
+
+class CompactArray(Array):
+    def __init__(self, prebuild=None, typecode="q"):
+        """
+        Struct-of-arrays version of Array for large sizes.
+        Values are kept in a typed buffer (array module) and
+        colors as one palette index byte per element, so no
+        per-element Python objects are created.
+
+        Has the same element interface as Array (get_value, set_value,
+        swap, color_range, ...). Iterating yields CompactArrayNode views
+        in place of ArrayNodes, created on the fly; values() gives the
+        plain values.
+
+        :param prebuild: integer or iterable of values
+        :param typecode: array module typecode for values, e.g. 'q' or 'd'
+        """
+        if prebuild is None:
+            # 8 cells fit nicely on screen as default size
+            prebuild = 8
+
+        if isinstance(prebuild, int):
+            self._values = array(typecode, random.choices(range(100), k=prebuild))
+        else:
+            # prebuild is some iterable
+            self._values = array(typecode, prebuild)
+
+        self.size = len(self._values)
+
+        # palette index 0 is the default color
+        self._palette = ["white"]
+        self._palette_index = {"white": 0}
+        self._colors = bytearray(self.size)
+
+    def __repr__(self):
+        return "CompactArray of size %s" % self.size
+
+    def __iter__(self):
+        for index in range(self.size):
+            yield CompactArrayNode(self, index)
+
+    def _color_index(self, color):
+        """
+        Get palette index for color, adding it
+        to the palette if it hasn't been used yet.
+        """
+        try:
+            return self._palette_index[color]
+        except KeyError:
+            if len(self._palette) == 256:
+                raise ValueError("Too many distinct colors in %s" % self)
+            self._palette_index[color] = len(self._palette)
+            self._palette.append(color)
+            return self._palette_index[color]
+
+    def get_value(self, index):
+        return self._values[index]
+
+    def set_value(self, index, value):
+        self._values[index] = value
+
+    def get_color(self, index):
+        return self._palette[self._colors[index]]
+
+    def set_color(self, index, color):
+        self._colors[index] = self._color_index(color)
+
+    def color_range(self, color, low, high):
+        """
+        Color elements low to high (exclusive) with a single slice assignment
+        """
+        self._colors[low:high] = bytes([self._color_index(color)]) * (high - low)
+
+    def swap(self, i, j):
+        self._values[i], self._values[j] = self._values[j], self._values[i]
+        self._colors[i], self._colors[j] = self._colors[j], self._colors[i]
+
+    def values(self):
+        return self._values.tolist()
+
+    def clone(self):
+        """
+        Copy value and color buffers.
+        """
+        clone = CompactArray((), typecode=self._values.typecode)
+        clone._values = array(self._values.typecode, self._values)
+        clone._colors = bytearray(self._colors)
+        clone._palette = list(self._palette)
+        clone._palette_index = dict(self._palette_index)
+        clone.size = self.size
+        return clone
+
+    def set_state(self, clone):
+        """
+        Replace current buffers with those of clone
+        """
+        self._values = clone._values
+        self._colors = clone._colors
+        self._palette = clone._palette
+        self._palette_index = clone._palette_index
+        self.size = clone.size
@@ -1,50 +1,74 @@
 import logging
+from contextlib import contextmanager
 import util.logging_util as log
-from copy import copy
-from collections import deque
+from datastructures.history import History
 
 
 class DataStructure(object):
+    # replaced by control's model logger in set_logger, default
+    # lets models be drawn without a control (e.g. headless)
+    logger = logging.getLogger("dsDraw.model")
 
     def set_name(self, name):
         self.name = name
 
     def set_logger(self, logger):
         self.logger = logger
-        self.clear_log()
         self.log("info", "\n\n\t----- new run -----\n")
 
         # excluding debug information
         self.log("info", "setting level to info")
         self.logger.setLevel(logging.INFO)
 
-    def clear_log(self):
-        with open('./logs/model_log.log', 'w') as _:
-            pass
-
-    def log(self, level_str, message, indent=0):
+    def log(self, level_str, message, *args, indent=0):
         """
         Wrapper function for logging -- data structure may be created
-        before the control object (and thus the logger) has been initialized
+        before the control object (and thus the logger) has been initialized.
+
+        message is only formatted with args (message % args) if the
+        logger is enabled for level_str, so pass values as args rather
+        than formatting them in the call.
+
         :param level_str: string specifying logging level
         :param message: message to log
-        :return:
+        :param args: values for % placeholders in message
+        :param indent: number of tabs before message
         """
-        message = "\t" * indent * 1 + message
+        logger = self.logger
+        if logger is None:
+            return
 
-        try:
-            if self.logger:
-                log_func = log.to_function(self.logger, level_str)
-                log_func(message)
-        except AttributeError:
-            pass
-            # print("no logger ; message was %s" % message)
+        level = log.LEVELS[level_str]
+        if logger.isEnabledFor(level):
+            logger.log(level, "\t" * indent + message, *args)
+
+    def log_enabled(self, level_str):
+        """
+        Whether messages of level_str would be logged. Recursive code
+        checks this once up front instead of calling log() per step.
+        """
+        return self.logger is not None and self.logger.isEnabledFor(log.LEVELS[level_str])
 
 
 
     def clone(self):
         raise NotImplementedError("Clone not implemented for %s" % self)
 
+    def snapshot_cost(self):
+        """
+        Approximate number of elements an undo snapshot
+        (clone) of this structure keeps alive.
+        """
+        return len(self)
+
+    def structure_key(self):
+        """
+        Hashable key describing everything the layout of
+        this structure depends on (shape, topology, values).
+        Used by render objects to cache layouts.
+        """
+        raise NotImplementedError("Structure key not implemented for %s" % self)
+
 
 class InteractiveDataStructure(object):
     """
@@ -65,20 +89,105 @@ class InteractiveDataStructure(object):
         self._control = control
         self._model = model
         self._render = render
-        self._state_history = deque(maxlen=50)
+        self._history = History(model)
+
+        # depth of nested batch() blocks
+        self._batch_depth = 0
 
     def save_state(self):
         """
-        Add current state to history deque
+        Take a full snapshot before a change which
+        has no cheap inverse (see record_change)
+        """
+        self._history.snapshot()
+
+    def record_change(self, undo, redo, cost=1):
+        """
+        Record a change that was just applied
+        along with functions to revert and reapply it
+        """
+        self._history.record(undo, redo, cost)
+
+    @contextmanager
+    def batch(self):
+        """
+        Group changes into one undo step and one redraw:
+
+            with a.batch():
+                for i in range(len(a)):
+                    a[i] = i * i
+
+        Inside the block nothing is drawn or animated, and once a
+        change needing a full snapshot has been made no further
+        undo information is kept for the rest of the block.
         """
-        current_state = self._model.clone()
-        self._state_history.appendleft(current_state)
+        self._batch_depth += 1
+        self._history.begin_group()
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            self._history.end_group()
+            self._display()
+
+    def _display(self):
+        """
+        Redraw after a change unless inside a batch
+        """
+        if not self._batch_depth:
+            self._render.display()
 
     def revert_state(self):
         """
-        Pop most recent state from history deque
-        and redraw canvas.
+        Undo most recent change and redraw canvas.
+        Raises IndexError if there is nothing to undo.
+        """
+        self._history.undo()
+        self._render.display(do_render=True)
+
+    def redo_state(self):
+        """
+        Redo most recently undone change and redraw canvas.
+        Raises IndexError if there is nothing to redo.
+        """
+        self._history.redo()
+        self._render.display(do_render=True)
+
+    def undo(self):
+        self.revert_state()
+
+    def redo(self):
+        self.redo_state()
+
+    def cache_info(self):
+        """
+        Hit/miss counts of the render object's layout cache
+        """
+        return self._render.layout_cache.info()
+
+
+class CameraView(object):
+    """
+    Console pan/zoom for interactive structures whose render
+    object draws through a Camera (trees, heaps and graphs)
+    """
+
+    def pan(self, dx, dy):
+        """
+        Move view of the structure by dx, dy pixels
+        (same as dragging with the right mouse button)
+        """
+        self._render.camera.pan(dx, dy)
+
+    def zoom(self, factor):
+        """
+        Scale view about the center of the canvas (> 1 zooms in)
+        """
+        canvas = self._render.canvas
+        self._render.camera.zoom_at(factor, canvas.width / 2, canvas.height / 2)
+
+    def reset_view(self):
+        """
+        Undo panning and zooming, fitting structure to canvas again
         """
-        previous_state = self._state_history.popleft()
-        self._model.set_state(previous_state)
-        self._render.display(do_render=True)
\ No newline at end of file
+        self._render.camera.reset()
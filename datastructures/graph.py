@@ -50,6 +50,9 @@ class Graph(DataStructure):
     def __iter__(self):
         return iter(self.nodes)
 
+    def __len__(self):
+        return len(self.nodes)
+
     def clone(self):
         """
         Deep copy graph by copying
@@ -57,14 +60,34 @@ class Graph(DataStructure):
         :return:
         """
         clone = Graph()
+        node_clones = {}
         for node in self.nodes:
-            clone.nodes.append(GraphNode(value=node.value, x=node.x, y=node.y))
+            node_clones[id(node)] = GraphNode(value=node.value, x=node.x, y=node.y)
+            node_clones[id(node)].color = node.color
+            clone.nodes.append(node_clones[id(node)])
 
+        # map by identity since values may not be unique
         for u, v in self.edges:
-            u_clone = clone.find(u.value)
-            v_clone = clone.find(v.value)
-            clone.create_edge(u_clone, v_clone)
+            clone.create_edge(node_clones[id(u)], node_clones[id(v)])
+
+        return clone
 
+    def set_state(self, clone):
+        """
+        Replace current nodes and edges with those of clone
+        """
+        self.nodes = clone.nodes
+        self.edges = clone.edges
+
+    def structure_key(self):
+        """
+        Node values plus edges given as pairs of
+        node positions (values may not be unique).
+        """
+        position = {id(node): i for i, node in enumerate(self.nodes)}
+        values = tuple(node.value for node in self.nodes)
+        edges = tuple((position[id(u)], position[id(v)]) for u, v in self.edges)
+        return values, edges
 
     def get_command_factory(self):
         return GraphCommandFactory(self)
@@ -96,6 +119,39 @@ class Graph(DataStructure):
         self.nodes.append(new)
         return new
 
+    def new_nodes(self, values):
+        """
+        Create a node (with no edges) for each value
+        :return: list of new GraphNodes
+        """
+        return [self.new_node(value) for value in values]
+
+    def connect_many(self, pairs):
+        """
+        Create an edge for each (a, b) pair, where a and b are
+        GraphNodes or values. Values are looked up once up front
+        and every pair is checked before any edge is added.
+        :return: list of new edges
+        """
+        by_value = {}
+        for node in self.nodes:
+            by_value.setdefault(node.value, node)
+        existing = {(id(u), id(v)) for u, v in self.edges}
+
+        new_edges = []
+        for a, b in pairs:
+            u = a if isinstance(a, GraphNode) else by_value.get(a)
+            v = b if isinstance(b, GraphNode) else by_value.get(b)
+            if u is None or v is None:
+                raise Exception("Can't connect %s and %s: not present" % (a, b))
+            if (id(u), id(v)) in existing or (id(v), id(u)) in existing:
+                raise Exception("'%s' and '%s' already connected" % (u, v))
+            existing.add((id(u), id(v)))
+            new_edges.append((u, v))
+
+        self.edges.extend(new_edges)
+        return new_edges
+
     def remove_node(self, node_to_remove):
         if node_to_remove in self.nodes:
             edges = [(u, v) for u, v in self.edges if node_to_remove in [u, v]]
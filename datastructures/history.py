@@ -0,0 +1,184 @@
+from collections import deque
+from copy import copy
+
+
+class Delta(object):
+    def __init__(self, undo, redo, cost=1):
+        """
+        History entry for a change with a cheap exact inverse
+        (insert/remove of a leaf, swap, old value of a cell, ...).
+
+        Undo/redo functions should refer to elements by index or
+        value rather than by object, since restoring a Snapshot
+        replaces the model's objects with clones.
+
+        :param undo: function reverting the change
+        :param redo: function reapplying the change
+        :param cost: approximate number of elements kept alive by this entry
+        """
+        self._undo = undo
+        self._redo = redo
+        self.cost = cost
+
+    def undo(self, model):
+        self._undo()
+
+    def redo(self, model):
+        self._redo()
+
+
+class Snapshot(object):
+    def __init__(self, model):
+        """
+        Keyframe for changes without a cheap exact inverse.
+        Keeps a full clone of the model taken before the change.
+        """
+        self.state = model.clone()
+        self.after = None
+        self.cost = max(1, self.state.snapshot_cost())
+
+    def undo(self, model):
+        # keep current objects around for redo
+        self.after = copy(model)
+        model.set_state(self.state)
+
+    def redo(self, model):
+        model.set_state(self.after)
+
+
+class Group(object):
+    def __init__(self):
+        """
+        Several changes undone/redone as one step (see History.begin_group).
+
+        Once a snapshot has been taken inside a group, later changes are
+        not recorded at all: undoing the snapshot already restores the
+        state before it, and the snapshot keeps the state at the time of
+        undo (the end of the group) for redo.
+        """
+        self.entries = []
+        self.cost = 0
+        self.frozen = False
+
+    def add(self, entry):
+        self.entries.append(entry)
+        self.cost += entry.cost
+        if isinstance(entry, Snapshot):
+            self.frozen = True
+
+    def undo(self, model):
+        for entry in reversed(self.entries):
+            entry.undo(model)
+
+    def redo(self, model):
+        for entry in self.entries:
+            entry.redo(model)
+
+
+class History(object):
+    def __init__(self, model, budget=2 * 10 ** 6):
+        """
+        Undo/redo journal for a single model. Most changes are
+        recorded as Deltas costing O(change) to apply either way,
+        falling back to Snapshots when there is no exact inverse.
+
+        History is bounded by the total cost of entries (roughly the
+        number of elements kept alive) rather than by number of entries.
+
+        :param model: DataStructure being tracked
+        :param budget: maximum total cost of undo entries
+        """
+        self.model = model
+        self.budget = budget
+        self.cost = 0
+
+        self._undo = deque()
+        self._redo = []
+
+        # open Group and nesting depth of begin_group calls
+        self._group = None
+        self._group_depth = 0
+
+        # counts entries pushed, undone and redone, so observers
+        # can tell whether the model changed since they last looked
+        self.version = 0
+
+    def __len__(self):
+        return len(self._undo)
+
+    def record(self, undo, redo, cost=1):
+        """
+        Record a change which has already been applied to the model.
+        """
+        if self._group is not None and self._group.frozen:
+            return
+        self._push(Delta(undo, redo, cost))
+
+    def snapshot(self):
+        """
+        Take a keyframe before applying a change.
+        """
+        if self._group is not None and self._group.frozen:
+            return
+        self._push(Snapshot(self.model))
+
+    def begin_group(self):
+        """
+        Collect changes until the matching end_group()
+        into a single entry. Groups may be nested.
+        """
+        self._group_depth += 1
+        if self._group_depth == 1:
+            self._group = Group()
+
+    def end_group(self):
+        self._group_depth -= 1
+        if self._group_depth == 0:
+            group, self._group = self._group, None
+            if group.entries:
+                self._push(group)
+
+    def _push(self, entry):
+        if self._group is not None:
+            self._group.add(entry)
+            return
+
+        self._undo.append(entry)
+        self.cost += entry.cost
+        self._redo.clear()
+        self.version += 1
+
+        # drop oldest entries, always keeping the newest
+        while self.cost > self.budget and len(self._undo) > 1:
+            self.cost -= self._undo.popleft().cost
+
+    def undo(self):
+        """
+        Revert most recent change. Raises IndexError if nothing to undo.
+        """
+        entry = self._undo.pop()
+        self.cost -= entry.cost
+        entry.undo(self.model)
+        self._redo.append(entry)
+        self.version += 1
+
+    def redo(self):
+        """
+        Reapply most recently undone change. Raises IndexError if nothing to redo.
+        """
+        entry = self._redo.pop()
+        entry.redo(self.model)
+        self._undo.append(entry)
+        self.cost += entry.cost
+        self.version += 1
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self.cost = 0
@@ -1,8 +1,9 @@
-import time
-from datastructures.basic import InteractiveDataStructure
+from datastructures.basic import InteractiveDataStructure, CameraView
 from datastructures import tree
 from datastructures import graph
+from datastructures import algorithms
 from drawtools import dsDraw_colors
+from drawtools.animation import SwapAnimation, Call
 from util.exceptions import InvalidCommandError
 
 
@@ -12,19 +13,64 @@ class InteractiveArray(InteractiveDataStructure):
         self._hide_values = False
         self._hide_indices = False
 
+        # a redraw is queued behind running swap/sort animations
+        self._redraw_queued = False
+
+        # player of the most recent sort, stopped before undo/redo
+        self._player = None
+
+    def _display(self):
+        """
+        Redraw after a change. While swaps or a sort are still
+        animating the redraw waits behind them on the array's
+        timeline channel, otherwise the canvas would jump to their
+        result and the animations would then play it backwards.
+        """
+        timeline = getattr(self._control, "timeline", None)
+        if self._batch_depth or timeline is None or not timeline.pending(self._model.name):
+            InteractiveDataStructure._display(self)
+        elif not self._redraw_queued:
+            self._redraw_queued = True
+            timeline.add(Call(self._queued_display), channel=self._model.name)
+
+    def _queued_display(self):
+        # waits again if more animations were queued meanwhile
+        self._redraw_queued = False
+        self._display()
+
+    def revert_state(self):
+        """
+        Undo most recent change and redraw canvas. A sort still
+        playing back is finished first, so the undo snapshot taken
+        before the sort is not written over by later steps.
+        """
+        self._stop_player()
+        InteractiveDataStructure.revert_state(self)
+
+    def redo_state(self):
+        self._stop_player()
+        InteractiveDataStructure.redo_state(self)
+
+    def _stop_player(self):
+        player, self._player = self._player, None
+        if player is not None and not player.stopped:
+            player.stop()
+
     def __getitem__(self, index):
         """
         Access array
         """
-        return self._model._array[index].value
+        return self._model.get_value(index)
 
     def __setitem__(self, index, value):
         """
         Modify array
         """
-        self.save_state()
-        self._model._array[index].value = value
-        self._render.display()
+        old_value = self._model.get_value(index)
+        self._model.set_value(index, value)
+        self.record_change(lambda: self._model.set_value(index, old_value),
+                           lambda: self._model.set_value(index, value))
+        self._display()
 
     def color(self, color_name, *indices):
         """
@@ -43,8 +89,6 @@ class InteractiveArray(InteractiveDataStructure):
         except KeyError:
             raise Exception("Invalid color '%s'" % color_name)
 
-        self.save_state()
-
         # if no indices provided, color entire array
         if len(indices) == 0:
             low, high = 0, self._model.size
@@ -54,19 +98,69 @@ class InteractiveArray(InteractiveDataStructure):
             low, high = indices
             high += 1
 
-        for i in range(low, high):
-            self._model._array[i].color = color
+        old_colors = [self._model.get_color(i) for i in range(low, high)]
+        self._model.color_range(color, low, high)
 
-        self._render.display()
+        def undo():
+            for i, old_color in zip(range(low, high), old_colors):
+                self._model.set_color(i, old_color)
+
+        self.record_change(undo, lambda: self._model.color_range(color, low, high),
+                           cost=len(old_colors))
+
+        self._display()
+
+    def color_many(self, color_name, ranges):
+        """
+        Color several indices and ranges with one redraw
+        and one undo step.
+        :param ranges: iterable of indices and (i, j) pairs (inclusive),
+                       pairs given as tuples or lists
+        """
+        try:
+            color = dsDraw_colors[color_name]
+        except KeyError:
+            raise Exception("Invalid color '%s'" % color_name)
+
+        spans = []
+        for r in ranges:
+            if isinstance(r, (tuple, list)):
+                if len(r) != 2:
+                    raise InvalidCommandError("Range %s should be an index or a pair (i, j)" % (r,))
+                low, high = r[0], r[1] + 1
+            else:
+                low, high = r, r + 1
+            # check every range before coloring any
+            if low < 0 or high > self._model.size or low >= high:
+                raise InvalidCommandError("Range %s out of bounds" % (r,))
+            spans.append((low, high))
+
+        old_colors = [[self._model.get_color(i) for i in range(low, high)] for low, high in spans]
+        for low, high in spans:
+            self._model.color_range(color, low, high)
+
+        def undo():
+            # restore in reverse so overlapping ranges end up as before
+            for (low, high), colors in zip(reversed(spans), reversed(old_colors)):
+                for i, old_color in zip(range(low, high), colors):
+                    self._model.set_color(i, old_color)
+
+        def redo():
+            for low, high in spans:
+                self._model.color_range(color, low, high)
+
+        self.record_change(undo, redo, cost=sum(map(len, old_colors)))
+        self._display()
 
     def swap(self, i, j):
         """
         Perform a swap of elements i and j
-        with animation.
+        with animation. Returns immediately, the animation
+        is queued on the control's timeline.
 
-        Animation: squares rise above array (.5s)
-                   squares move horizontally to change positions (1s)
-                   squares lower into new positions (.5s)
+        Animation: squares rise above array (.4s)
+                   squares move horizontally to change positions (.75s)
+                   squares lower into new positions (.4s)
         """
         if i == j:
             raise InvalidCommandError("Cannot swap element %s with itself" % i)
@@ -75,82 +169,112 @@ class InteractiveArray(InteractiveDataStructure):
         if j < 0 or j >= self._model.size:
             raise InvalidCommandError("Index %s out of bounds" % j)
 
-        self.save_state()
-
         # require i < j
         if j < i:
             temp = i
             i = j
             j = temp
 
-        rect_i = self._model.name + "_" + str(i)
-        rect_j = self._model.name + "_" + str(j)
+        # swap elements in actual data structure right away,
+        # animation only catches the canvas up
+        self._model.swap(i, j)
+        self.record_change(lambda: self._model.swap(i, j), lambda: self._model.swap(i, j))
 
-        # raise rectangles to top so they cover indices when
-        # moving over them
-        self._render.canvas.tag_raise(rect_i)
-        self._render.canvas.tag_raise(rect_j)
+        timeline = getattr(self._control, "timeline", None)
 
-        # number of steps to move vertically, horizontally
-        # (each step takes .1s)
-        v_steps = 5
-        h_steps = 10
+        # cells outside the viewport have no canvas items to animate
+        if timeline is None or timeline.instant or self._batch_depth or \
+                not (self._render.is_drawn(i) and self._render.is_drawn(j)):
+            self._display()
+            return
 
-        tick = 0.075
+        rect_i = self._model.name + "_" + str(i)
+        rect_j = self._model.name + "_" + str(j)
 
-        # translate rectangles up by 2 * cell_h
-        y_translate = 2 * self._render.cell_h
-        y_step = y_translate / v_steps
+        # swaps on the same array are queued one after another
+        channel = self._model.name
 
-        x_i, _, _, _ = self._render.canvas.coords(rect_i)
-        x_j, _, _, _ = self._render.canvas.coords(rect_j)
-        x_translate = int(x_j - x_i)
-        x_step = x_translate / h_steps
+        def swap_done():
+            # redraw once queued swaps have caught up with the model
+            if timeline.pending(channel) == 0:
+                self._display()
 
-        # do vertical translation upwards
-        for _ in range(v_steps):
-            self._render.canvas.move(rect_i, 0, -y_step)
-            self._render.canvas.move(rect_j, 0, -y_step)
-            time.sleep(tick)
+        # translate rectangles up by 2 * cell_h
+        animation = SwapAnimation(self._render.canvas, rect_i, rect_j,
+                                  lift=2 * self._render.cell_h, on_done=swap_done)
+        timeline.add(animation, channel=channel)
 
-        # brief pause
-        time.sleep(tick)
+    def sort(self, algorithm="quick", speed=20):
+        """
+        Sort array with a built-in algorithm. The algorithm runs
+        on the raw values first, recording a trace of compares, swaps
+        and colorings which is then played back on the canvas.
 
-        # horizontal translation
-        for _ in range(h_steps):
-            self._render.canvas.move(rect_i, x_step, 0)
-            self._render.canvas.move(rect_j, -x_step, 0)
-            time.sleep(tick)
+        :param algorithm: one of bubble, selection, insertion, quick, merge
+        :param speed: steps played back per second
+        :return: TracePlayer to pause(), resume(), seek(step) or skip(n)
+        """
+        # an earlier sort still playing back would keep changing the model
+        self._stop_player()
+        trace = algorithms.record_sort(self._model.values(), algorithm)
 
-        time.sleep(tick)
+        self.save_state()
 
-        # put rectangles back in place
-        for _ in range(v_steps):
-            self._render.canvas.move(rect_i, 0, y_step)
-            self._render.canvas.move(rect_j, 0, y_step)
-            time.sleep(tick)
+        player = self._player = algorithms.TracePlayer(self._model, self._render, trace, speed=speed)
 
-        # finally swap the elements in actual data structure
-        temp = self._model._array[i]
-        self._model._array[i] = self._model._array[j]
-        self._model._array[j] = temp
+        timeline = getattr(self._control, "timeline", None)
+        if self._batch_depth:
+            player.advance(len(trace), redraw=False)
+        elif timeline is None:
+            player.finish()
+        else:
+            timeline.add(player, channel=self._model.name)
 
-        # redraw array so tags get reassigned
-        self._render.display()
+        return player
 
     def hide_values(self):
         """
         Toggles hidden values
         """
-        self._render._hide_values = not self._render._hide_values
-        self._render.display()
+        self._render.set_hidden("label", not self._render._hide_values)
 
     def hide_indices(self):
         """
         Toggles hidden indices
         """
-        self._render._hide_indices = not self._render._hide_indices
-        self._render.display()
+        self._render.set_hidden("index", not self._render._hide_indices)
+
+    def scroll(self, cells):
+        """
+        Move viewport by some number of cells (negative to go left)
+        """
+        self._render.scroll(cells)
+
+    def scroll_to(self, index):
+        """
+        Scroll so that array[index] is the first visible cell
+        """
+        self._render.scroll_to(index)
+
+    def zoom(self, factor):
+        """
+        Scale cell size by factor (> 1 zooms in)
+        """
+        self._render.set_zoom(self._render.zoom * factor)
+
+    def pan(self, dx, dy):
+        """
+        Scroll viewport by dx pixels, rounded to whole cells.
+        Arrays are one row, so dy is ignored.
+        """
+        self._render.scroll(round(dx / self._render.cell_w))
+
+    def reset_view(self):
+        """
+        Scroll back to the first cell at default cell size
+        """
+        self._render.scroll_to(0)
+        self._render.set_zoom(1.0)
 
     def compress(self):
         """
@@ -158,10 +282,10 @@ class InteractiveArray(InteractiveDataStructure):
         causes array to compress regardless of size relative to canvas
         """
         self._render._force_compress = not self._render._force_compress
-        self._render.display()
+        self._display()
 
 
-class InteractiveBST(InteractiveDataStructure):
+class InteractiveBST(CameraView, InteractiveDataStructure):
     def __init__(self, control, model, render):
         InteractiveDataStructure.__init__(self, control, model, render)
 
@@ -172,17 +296,60 @@ class InteractiveBST(InteractiveDataStructure):
         """
         Insert new node into BST
         """
-        self.save_state()
-        self._model.insert(value)
-        self._render.display()
+        # new value ends up as a leaf which remove() takes
+        # out exactly, unless value was already present
+        if self._model.find(value) is not None:
+            self.save_state()
+            self._model.insert(value)
+        else:
+            self._model.insert(value)
+            self.record_change(lambda: self._model.remove(value),
+                               lambda: self._model.insert(value))
+        self._display()
 
     def remove(self, value):
         """
         Remove node from BST
         """
+        # removing a (unique) leaf is undone exactly by inserting
+        # it again, other removals restructure the tree
+        node = self._model.find(value)
+        if node is not None and node.is_leaf():
+            self._model.remove(value)
+            self.record_change(lambda: self._model.insert(value),
+                               lambda: self._model.remove(value))
+        else:
+            self.save_state()
+            self._model.remove(value)
+        self._display()
+
+    def insert_many(self, values):
+        """
+        Insert several values with one redraw and one undo step
+        """
+        values = list(values)
+
+        # new distinct values are removed exactly in reverse order
+        exact = len(set(values)) == len(values) and \
+            all(self._model.find(value) is None for value in values)
+        if not exact:
+            self.save_state()
+
+        self._model.insert_many(values)
+
+        if exact:
+            self.record_change(lambda: self._model.remove_many(reversed(values)),
+                               lambda: self._model.insert_many(values),
+                               cost=len(values))
+        self._display()
+
+    def remove_many(self, values):
+        """
+        Remove several values with one redraw and one undo step
+        """
         self.save_state()
-        self._model.remove(value)
-        self._render.display()
+        self._model.remove_many(values)
+        self._display()
 
     def find(self, value):
         """
@@ -203,6 +370,35 @@ class InteractiveBST(InteractiveDataStructure):
         rotate_left(self, node_a, node_b):
             precondition: node_b is right child of node_a
         """
+        parent, child, direction = self._rotation(node_a, node_b)
+
+        # rotation is its own inverse (with roles swapped) as long
+        # as both nodes can be found by value before and after it
+        p_value, c_value = parent.value, child.value
+        exact = self._model.find(p_value) is parent and self._model.find(c_value) is child
+        if not exact:
+            self.save_state()
+
+        self._rotate(p_value, c_value, direction, parent, child)
+
+        if exact:
+            if self._model.find(p_value) is parent and self._model.find(c_value) is child:
+                inverse = "left" if direction == "right" else "right"
+                self.record_change(lambda: self._rotate(c_value, p_value, inverse),
+                                   lambda: self._rotate(p_value, c_value, direction))
+            else:
+                # rotate back to take snapshot of state before rotation
+                self._rotate(c_value, p_value, "left" if direction == "right" else "right", child, parent)
+                self.save_state()
+                self._rotate(p_value, c_value, direction, parent, child)
+
+        self._display()
+
+    def _rotation(self, node_a, node_b):
+        """
+        Look up nodes (if values given) and determine
+        parent, child and direction of rotation
+        """
         a = node_a
         b = node_b
         if not isinstance(node_a, tree.TreeNode):
@@ -215,24 +411,76 @@ class InteractiveBST(InteractiveDataStructure):
         if node_b is None:
             raise InvalidCommandError("'%s' not present in tree" % b)
 
-        self.save_state()
-
-        # left rotation
         if node_b is node_a.left:
-            self._model.rotate_right(node_a, node_b)
+            return node_a, node_b, "right"
         elif node_a is node_b.left:
-            self._model.rotate_right(node_b, node_a)
+            return node_b, node_a, "right"
         elif node_b is node_a.right:
-            self._model.rotate_left(node_a, node_b)
+            return node_a, node_b, "left"
         elif node_a is node_b.right:
-            self._model.rotate_left(node_b, node_a)
+            return node_b, node_a, "left"
+        raise InvalidCommandError("Cannot rotate unconnected nodes %s, %s" % (node_a.value, node_b.value))
+
+    def _rotate(self, p_value, c_value, direction, parent=None, child=None):
+        """
+        Rotate child up over parent, looking nodes up by value if not given
+        """
+        parent = parent or self._model.find(p_value)
+        child = child or self._model.find(c_value)
+        if direction == "right":
+            self._model.rotate_right(parent, child)
         else:
-            raise InvalidCommandError("Cannot rotate unconnected nodes %s, %s" % (node_a.value, node_b.value))
+            self._model.rotate_left(parent, child)
 
-        self._render.display()
 
+class InteractivePersistentBST(InteractiveBST):
+    """
+    Undo snapshots of a PersistentBST are O(1), so
+    every change simply takes one.
+    """
 
-class InteractiveBinaryHeap(InteractiveDataStructure):
+    def insert(self, value):
+        self.save_state()
+        self._model.insert(value)
+        self._display()
+
+    def remove(self, value):
+        self.save_state()
+        self._model.remove(value)
+        self._display()
+
+    def insert_many(self, values):
+        self.save_state()
+        self._model.insert_many(values)
+        self._display()
+
+    def rotate(self, node_a, node_b):
+        parent, child, direction = self._rotation(node_a, node_b)
+        self.save_state()
+        self._rotate(parent.value, child.value, direction, parent, child)
+        self._display()
+
+    def versions(self):
+        """
+        Return (index, size) of every version of the tree, oldest first
+        """
+        return [(i, version.size if version else 0)
+                for i, version in enumerate(self._model.versions)]
+
+    def checkout(self, index):
+        """
+        Jump to any past version (undoable)
+        """
+        try:
+            self._model.versions[index]
+        except (IndexError, TypeError):
+            raise InvalidCommandError("No version %s of %s" % (index, self._model.name))
+        self.save_state()
+        self._model.checkout(index)
+        self._display()
+
+
+class InteractiveBinaryHeap(CameraView, InteractiveDataStructure):
 
     def __init__(self, control, model, render):
         InteractiveDataStructure.__init__(self, control, model, render)
@@ -243,7 +491,15 @@ class InteractiveBinaryHeap(InteractiveDataStructure):
         """
         self.save_state()
         self._model.insert_key(key)
-        self._render.display()
+        self._display()
+
+    def insert_many(self, keys):
+        """
+        Insert several keys with one redraw and one undo step
+        """
+        self.save_state()
+        self._model.insert_many(keys)
+        self._display()
 
     def remove_min(self):
         """
@@ -251,7 +507,7 @@ class InteractiveBinaryHeap(InteractiveDataStructure):
         """
         self.save_state()
         heap_node = self._model.remove_min()
-        self._render.display()
+        self._display()
         return heap_node.value
 
     def decrease_key(self, heap_node, new_value):
@@ -265,10 +521,10 @@ class InteractiveBinaryHeap(InteractiveDataStructure):
             raise InvalidCommandError("Cannot decrease to key greater than %s" % heap_node.value)
         self.save_state()
         self._model.decrease_key(heap_node, new_value)
-        self._render.display()
+        self._display()
 
 
-class InteractiveGraph(InteractiveDataStructure):
+class InteractiveGraph(CameraView, InteractiveDataStructure):
     def __init__(self, control, model, render):
         InteractiveDataStructure.__init__(self, control, model, render)
 
@@ -276,9 +532,52 @@ class InteractiveGraph(InteractiveDataStructure):
         """
         Add a new node with degree 0.
         """
-        self.save_state()
-        self._model.new_node(value)
-        self._render.display()
+        node = self._model.new_node(value)
+        x, y = node.x, node.y
+
+        # new node is always last in list of nodes
+        self.record_change(lambda: self._model.remove_node(self._model.nodes[-1]),
+                           lambda: self._model.nodes.append(graph.GraphNode(value, x=x, y=y)))
+        self._display()
+
+    def new_nodes(self, values):
+        """
+        Add a new node for each value
+        """
+        new = self._model.new_nodes(values)
+        saved = [(node.value, node.x, node.y) for node in new]
+
+        def undo():
+            del self._model.nodes[len(self._model.nodes) - len(saved):]
+
+        def redo():
+            self._model.nodes.extend(graph.GraphNode(value, x=x, y=y) for value, x, y in saved)
+
+        self.record_change(undo, redo, cost=len(saved))
+        self._display()
+
+    def connect_many(self, pairs):
+        """
+        Connect each (a, b) pair of nodes or values
+        """
+        try:
+            new_edges = self._model.connect_many(pairs)
+        except Exception as e:
+            raise InvalidCommandError(str(e))
+
+        # refer to nodes by position for redo
+        position = {id(node): i for i, node in enumerate(self._model.nodes)}
+        indices = [(position[id(u)], position[id(v)]) for u, v in new_edges]
+
+        def undo():
+            del self._model.edges[len(self._model.edges) - len(indices):]
+
+        def redo():
+            nodes = self._model.nodes
+            self._model.edges.extend((nodes[i], nodes[j]) for i, j in indices)
+
+        self.record_change(undo, redo, cost=len(indices))
+        self._display()
 
     def connect(self, a, b):
         if not isinstance(a, graph.GraphNode):
@@ -291,9 +590,12 @@ class InteractiveGraph(InteractiveDataStructure):
         if a is None:
             pass
 
-        self.save_state()
-
         self._model.create_edge(a, b)
 
-        self._render.display()
+        # refer to nodes by position, new edge is always last
+        i, j = self._model.nodes.index(a), self._model.nodes.index(b)
+        self.record_change(lambda: self._model.edges.pop(),
+                           lambda: self._model.create_edge(self._model.nodes[i], self._model.nodes[j]))
+
+        self._display()
 
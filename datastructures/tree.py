@@ -253,6 +253,9 @@ class Tree(DataStructure):
     def __iter__(self):
         return iter(self.root)
 
+    def __len__(self):
+        return self.root.get_size() if self.root else 0
+
     def set_name(self, name):
         self.name = name
 
@@ -309,6 +312,14 @@ class BST(Tree):
         """
         self.root = clone.root
 
+    def structure_key(self):
+        """
+        Preorder values along with which children
+        are present uniquely determine the shape of the tree.
+        """
+        return tuple((node.value, node.left is not None, node.right is not None)
+                     for node in self.preorder())
+
     def get_command_factory(self):
         """
         Return appropriate command factory for BST,
@@ -325,22 +336,24 @@ class BST(Tree):
         :param el: element being inserted
         :param change_color: shows traversal of tree for visual purposes
         """
-        self.log("info", "calling wrapper insert func with root %s to insert %s" % (self.root, el))
+        self.log("info", "calling wrapper insert func with root %s to insert %s", self.root, el)
         if self.root:
-            self.root = self._insert(self.root, el, change_color)
+            self.root = self._insert(self.root, el, change_color, self.log_enabled("debug"))
         else:
             self.root = TreeNode(el)
 
-    def _insert(self, cur_node, el, change_color):
+    def _insert(self, cur_node, el, change_color, trace=False):
         """
         Recursive insert function
         :param cur_node: current working node
         :param el: value being inserted
         :param depth: current depth in tree
         :param change_color: shows traversal of tree for visual purposes
+        :param trace: log each step (debug logging enabled)
         """
 
-        self.log("debug", "inserting %s; current node is %s" % (el, cur_node))
+        if trace:
+            self.log("debug", "inserting %s; current node is %s", el, cur_node)
 
         # change color to show traversal of tree
         # if change_color:
@@ -349,18 +362,22 @@ class BST(Tree):
         #     cur_node.color = 'white'
 
         if el <= cur_node.value:
-            self.log("debug", "%s <= %s; going left" % (el, cur_node.value))
+            if trace:
+                self.log("debug", "%s <= %s; going left", el, cur_node.value)
             if cur_node.left:
-                cur_node.left = self._insert(cur_node.left, el, change_color)
+                cur_node.left = self._insert(cur_node.left, el, change_color, trace)
             else:
-                self.log("debug", "new leaf (%s)" % (el))
+                if trace:
+                    self.log("debug", "new leaf (%s)", el)
                 cur_node.left = TreeNode(el, parent=cur_node)
         else:
-            self.log("debug", "%s > %s; going right" % (el, cur_node.value))
+            if trace:
+                self.log("debug", "%s > %s; going right", el, cur_node.value)
             if cur_node.right:
-                cur_node.right = self._insert(cur_node.right, el, change_color)
+                cur_node.right = self._insert(cur_node.right, el, change_color, trace)
             else:
-                self.log("debug", "new leaf (%s)" % (el))
+                if trace:
+                    self.log("debug", "new leaf (%s)", el)
                 cur_node.right = TreeNode(el, parent=cur_node)
 
         # update size
@@ -368,9 +385,23 @@ class BST(Tree):
 
         return cur_node
 
+    def insert_many(self, values):
+        """
+        Insert values in order
+        """
+        for value in values:
+            self.insert(value)
+
+    def remove_many(self, values):
+        """
+        Remove values in order
+        """
+        for value in values:
+            self.remove(value)
+
     def remove(self, el, change_color=False):
         """Wrapper method for recursive remove method"""
-        self.log("info", "calling wrapper remove func with root %s to remove %s" % (self.root, el))
+        self.log("info", "calling wrapper remove func with root %s to remove %s", self.root, el)
 
         if self.find(el, change_color=False):
             # if tree has exactly one node
@@ -611,6 +642,246 @@ class BST(Tree):
             node = node.parent
 
 
+class PNode(object):
+    __slots__ = ("value", "left", "right", "size")
+
+    def __init__(self, value, left=None, right=None):
+        """
+        Immutable node of a PersistentBST. Never modified once
+        created, so any number of tree versions can share it.
+        No parent reference since a node may have several parents
+        (one per version).
+        """
+        self.value = value
+        self.left = left
+        self.right = right
+        self.size = 1 + (left.size if left else 0) + (right.size if right else 0)
+
+    def __repr__(self):
+        return "PNode(%s)" % self.value
+
+
+class PersistentBST(BST):
+    """
+    BST where insert, remove and rotations copy only the path from
+    the root to the change and share every other subtree with previous
+    versions. Each change costs O(depth) new nodes, and cloning
+    (taking an undo snapshot) is O(1) since versions are never modified.
+
+    Every version is kept in self.versions, so any past state can be
+    checked out instantly. versions is never trimmed: it grows by one
+    entry (and O(depth) nodes) per change for the life of the tree.
+    A prebuilt tree starts with a single version. The TreeNode tree
+    used for rendering and find() is built from the current version
+    on first access.
+    """
+    def __init__(self, prebuild_size=0, root=None, name=None):
+        # root version of each change, oldest first
+        self.versions = []
+        self._version = None
+
+        # TreeNode copy of current version and version it was built from
+        self._tree_root = None
+        self._tree_version = None
+
+        super().__init__(prebuild_size, root, name)
+
+        # prebuilt (or given) tree is one initial version,
+        # not one version per prebuild insert
+        self.versions = [self._version] if self._version is not None else []
+
+    def __repr__(self):
+        return "PersistentBST with root %s" % (self._version and self._version.value)
+
+    def __len__(self):
+        return self._version.size if self._version else 0
+
+    @property
+    def root(self):
+        if self._tree_version is not self._version:
+            self._tree_root = self._to_tree(self._version)
+            self._tree_version = self._version
+        return self._tree_root
+
+    @root.setter
+    def root(self, node):
+        self._version = self._from_tree(node)
+
+    def _to_tree(self, pnode):
+        """
+        Build TreeNode copy of a version (iteratively,
+        since unbalanced trees can be deep)
+        """
+        if pnode is None:
+            return None
+        root = TreeNode(pnode.value)
+        stack = [(pnode, root)]
+        while stack:
+            pnode, node = stack.pop()
+            node.size = pnode.size
+            if pnode.left:
+                node.left = TreeNode(pnode.left.value, parent=node)
+                stack.append((pnode.left, node.left))
+            if pnode.right:
+                node.right = TreeNode(pnode.right.value, parent=node)
+                stack.append((pnode.right, node.right))
+        return root
+
+    def _from_tree(self, node):
+        """
+        Build version from a TreeNode tree (iterative postorder,
+        since PNodes are created after both of their children)
+        """
+        if node is None:
+            return None
+        built = {}
+        stack = [(node, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if not children_done:
+                stack.append((node, True))
+                stack.extend((child, False) for child in (node.left, node.right) if child)
+                continue
+            left = built.pop(id(node.left)) if node.left else None
+            right = built.pop(id(node.right)) if node.right else None
+            built[id(node)] = PNode(node.value, left, right)
+        # root is finished last
+        return built[id(node)]
+
+    def _commit(self, version):
+        self._version = version
+        self.versions.append(version)
+
+    def _copy_path(self, path, node):
+        """
+        Copy nodes along path (list of (node, went_left) from the root
+        down) bottom-up so that the last one points to node instead of
+        its old child. Returns new root.
+        """
+        for parent, went_left in reversed(path):
+            if went_left:
+                node = PNode(parent.value, node, parent.right)
+            else:
+                node = PNode(parent.value, parent.left, node)
+        return node
+
+    def _path_to(self, tree_node):
+        """
+        Path from root of current version to the node at the same
+        position as tree_node (a node of self.root). Returns (path, node).
+        """
+        directions = []
+        while tree_node.parent is not None:
+            directions.append(tree_node is tree_node.parent.left)
+            tree_node = tree_node.parent
+        if tree_node is not self._tree_root or self._tree_version is not self._version:
+            raise ValueError("%s does not belong to current version of %s" % (tree_node, self))
+
+        path = []
+        node = self._version
+        for went_left in reversed(directions):
+            path.append((node, went_left))
+            node = node.left if went_left else node.right
+        return path, node
+
+    def clone(self):
+        """
+        O(1) copy sharing the current version
+        """
+        clone = PersistentBST()
+        clone._version = self._version
+        return clone
+
+    def set_state(self, clone):
+        self._version = clone._version
+
+    def snapshot_cost(self):
+        """
+        Snapshot shares all nodes with the current version, later
+        changes each copy about one root-to-leaf path.
+        """
+        return max(1, len(self).bit_length())
+
+    def checkout(self, index):
+        """
+        Make a past version current. Further changes branch
+        off from it and are appended to versions as usual.
+        """
+        self._version = self.versions[index]
+
+    def insert(self, el, change_color=False):
+        path = []
+        node = self._version
+        while node is not None:
+            went_left = el <= node.value
+            path.append((node, went_left))
+            node = node.left if went_left else node.right
+
+        self._commit(self._copy_path(path, PNode(el)))
+
+    def remove(self, el, change_color=False):
+        """
+        Same cases as BST._remove, replacing a node with
+        two children by its predecessor.
+        """
+        path = []
+        node = self._version
+        while node is not None and node.value != el:
+            went_left = el < node.value
+            path.append((node, went_left))
+            node = node.left if went_left else node.right
+
+        if node is None:
+            raise Exception("Can't remove %s. Not present in tree" % el)
+
+        if node.left is None:
+            replacement = node.right
+        elif node.right is None:
+            replacement = node.left
+        else:
+            # take predecessor out of left subtree
+            pred_path = []
+            pred = node.left
+            while pred.right is not None:
+                pred_path.append((pred, False))
+                pred = pred.right
+            left = self._copy_path(pred_path, pred.left)
+            replacement = PNode(pred.value, left, node.right)
+
+        self._commit(self._copy_path(path, replacement))
+
+    def rotate_left(self, node_a, node_b):
+        """
+        Left rotation of TreeNodes node_a and node_b from self.root,
+        see BST.rotate_left. Only a, b and the path above them are copied.
+        """
+        if node_b is not node_a.right:
+            msg = "Cannot do left rotation: %s is not right child of %s" % (node_b, node_a)
+            raise ValueError(msg)
+
+        path, a = self._path_to(node_a)
+        b = a.right
+        rotated = PNode(b.value, PNode(a.value, a.left, b.left), b.right)
+        self._commit(self._copy_path(path, rotated))
+
+    def rotate_right(self, node_a, node_b):
+        """
+        Right rotation of TreeNodes node_a and node_b from self.root,
+        see BST.rotate_right.
+        """
+        if node_b is not node_a.left:
+            msg = "Cannot do right rotation: %s is not left child of %s" % (node_b, node_a)
+            raise ValueError(msg)
+
+        path, a = self._path_to(node_a)
+        b = a.left
+        rotated = PNode(b.value, b.left, PNode(a.value, b.right, a.right))
+        self._commit(self._copy_path(path, rotated))
+
+    def get_interactive_class(self):
+        return datastructures.interactive.InteractivePersistentBST
+
+
 class HeapNode(TreeNode):
     def __init__(self, value, heap, index=-1, parent=None):
         """
@@ -665,7 +936,10 @@ class BinaryHeap(Tree):
         try:
             self.heap_array[0] = node
         except IndexError:
-            self.heap_array.append(node)
+            # an empty heap stays an empty array,
+            # so clone() and len() never see a None root
+            if node is not None:
+                self.heap_array.append(node)
 
     def __repr__(self):
         return "Binary heap with root %s" % self.root
@@ -677,14 +951,27 @@ class BinaryHeap(Tree):
 
         return clone
 
+    def __len__(self):
+        return len(self.heap_array)
+
     def set_state(self, clone):
         """
         Replace current state with clone.
         Shallow copy is fine because clones
         are discarded after being used to revert
-        state.
+        state. Nodes are pointed back at this heap
+        since child lookups go through node.heap.
         """
         self.heap_array = clone.heap_array
+        for node in self.heap_array:
+            node.heap = self
+
+    def structure_key(self):
+        """
+        Shape of a heap is determined by its size,
+        so values in array order are enough.
+        """
+        return tuple(node.value for node in self.heap_array)
 
     def print_heap(self):
         print(list(map(lambda node: node.value, self.heap_array)))
@@ -750,6 +1037,43 @@ class BinaryHeap(Tree):
         self.heap_array.append(new_node)
         self.sift_up(new_index, change_color)
 
+    def insert_many(self, keys):
+        """
+        Insert several keys. Few keys are sifted up one at a time,
+        otherwise the whole array is rebuilt bottom-up in O(n) (Floyd).
+        """
+        new_nodes = [HeapNode(key, self) for key in keys]
+        if not new_nodes:
+            return
+
+        start = len(self.heap_array)
+        n = start + len(new_nodes)
+        self.heap_array.extend(new_nodes)
+
+        if len(new_nodes) * n.bit_length() < n:
+            for index in range(start, n):
+                self.sift_up(index, False)
+        else:
+            for index in range(n // 2 - 1, -1, -1):
+                self._sift_down_nodes(index)
+
+    def _sift_down_nodes(self, index):
+        """
+        Sift node at index down by moving node objects
+        (rather than values) using index arithmetic only
+        """
+        heap = self.heap_array
+        n = len(heap)
+        while True:
+            smallest = index
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < n and heap[child].value < heap[smallest].value:
+                    smallest = child
+            if smallest == index:
+                return
+            heap[index], heap[smallest] = heap[smallest], heap[index]
+            index = smallest
+
     def decrease_key(self, node, new_value, change_color=False):
         """
         Decrease key value and sift up/down as needed.
@@ -798,6 +1122,9 @@ class BinaryHeap(Tree):
         p = self.heap_array[index]
         l = self.heap_left(index)
         r = self.heap_right(index)
+        if l is None:
+            # no children (e.g. one node left after remove_min)
+            return
         if not r or l < r:
             child = l
             index = self.left_index(index)
@@ -1,5 +1,3 @@
-from tkinter.font import Font
-
 dsDraw_colors = {"red": "#e74c3c",
                  "pink": "#f1948a",
                  "orange": "#f39c12",
@@ -10,9 +8,19 @@ dsDraw_colors = {"red": "#e74c3c",
                  "light blue": "#5dade2",
                  "purple": "#a569bd"}
 
+# canvas tag of every annotation item, so render objects
+# can clear and redraw their own items without touching them
+# (defined here so render doesn't import tkinter through annotations)
+ANNOTATION_TAG = "annotation"
+
 def default_font():
     """
     Written as method because in order to create a Font
-    object, there must be an instance of Tk() running
+    object, there must be an instance of Tk() running.
+
+    Creates a new Font on every call, for widgets which resize
+    their own font. Render objects use the shared fonts of
+    drawtools.fonts.registry through canvas.default_font().
     """
+    from tkinter.font import Font
     return Font(family="Monospace", size=10, weight="normal")
\ No newline at end of file
@@ -0,0 +1,270 @@
+import threading
+import time
+from collections import deque
+
+
+class Animation(object):
+    """
+    Base class for anything run by a Timeline.
+
+    step(dt) advances the animation by dt seconds (already
+    scaled by the timeline speed) and returns True once finished.
+    finish() jumps straight to the final state.
+    """
+
+    def __init__(self, on_done=None):
+        self.on_done = on_done
+        self.started = False
+
+    def start(self):
+        """
+        Called when animation reaches the front of its channel,
+        so positions can be read from the canvas at that point
+        rather than when the animation was queued.
+        """
+        self.started = True
+
+    def step(self, dt):
+        raise NotImplementedError("Step not implemented for %s" % self)
+
+    def finish(self):
+        if not self.started:
+            self.start()
+        while not self.step(float("inf")):
+            pass
+
+    def done(self):
+        if self.on_done:
+            self.on_done()
+
+
+class Tween(Animation):
+    def __init__(self, canvas, tag, phases, on_done=None):
+        """
+        Move canvas items linearly through a series of phases.
+
+        :param canvas: canvas containing items
+        :param tag: tag or id of items being moved
+        :param phases: list of (dx, dy, seconds); (0, 0, t) is a pause
+        """
+        super().__init__(on_done)
+        self.canvas = canvas
+        self.tag = tag
+        self.phases = deque(phases)
+
+        # time spent in current phase and offset already applied
+        self._elapsed = 0
+        self._moved_x = 0
+        self._moved_y = 0
+
+    def step(self, dt):
+        while self.phases:
+            dx, dy, seconds = self.phases[0]
+            self._elapsed += dt
+
+            progress = 1 if seconds <= 0 else min(1, self._elapsed / seconds)
+            move_x = dx * progress - self._moved_x
+            move_y = dy * progress - self._moved_y
+            if move_x or move_y:
+                self.canvas.move(self.tag, move_x, move_y)
+            self._moved_x += move_x
+            self._moved_y += move_y
+
+            if progress < 1:
+                return False
+
+            # carry leftover time into next phase
+            dt = self._elapsed - seconds
+            self.phases.popleft()
+            self._elapsed = self._moved_x = self._moved_y = 0
+
+        return True
+
+
+class Parallel(Animation):
+    def __init__(self, *animations, on_done=None):
+        """
+        Run several animations at once, finishing
+        when the last one finishes.
+        """
+        super().__init__(on_done)
+        self.animations = list(animations)
+
+    def start(self):
+        super().start()
+        for animation in self.animations:
+            animation.start()
+
+    def step(self, dt):
+        self.animations = [a for a in self.animations if not a.step(dt)]
+        return not self.animations
+
+
+class Call(Animation):
+    def __init__(self, func):
+        """
+        Takes no time and calls func when done, so func runs once
+        the animations queued before it on its channel have finished
+        """
+        super().__init__(on_done=func)
+
+    def step(self, dt):
+        return True
+
+
+class SwapAnimation(Animation):
+    def __init__(self, canvas, tag_i, tag_j, lift, seconds=1.65, on_done=None):
+        """
+        Items tagged tag_i and tag_j rise above the array,
+        move horizontally to change positions and lower into
+        their new positions. Tags are exchanged afterwards so
+        later animations find items at their new index.
+
+        :param lift: vertical distance to raise items
+        :param seconds: total duration at speed 1
+        """
+        super().__init__(on_done)
+        self.canvas = canvas
+        self.tag_i = tag_i
+        self.tag_j = tag_j
+        self.lift = lift
+        self.seconds = seconds
+        self._tweens = None
+
+    def start(self):
+        super().start()
+
+        # raise items to top so they cover indices when
+        # moving over them
+        self.canvas.tag_raise(self.tag_i)
+        self.canvas.tag_raise(self.tag_j)
+
+        coords_i = self.canvas.coords(self.tag_i)
+        coords_j = self.canvas.coords(self.tag_j)
+        dx = coords_j[0] - coords_i[0] if coords_i and coords_j else 0
+
+        # rise, pause, move across, pause, lower
+        t = self.seconds / 22
+        up, across, down = (0, -self.lift, 5 * t), (dx, 0, 10 * t), (0, self.lift, 5 * t)
+        pause = (0, 0, t)
+
+        self._tweens = Parallel(Tween(self.canvas, self.tag_i, [up, pause, across, pause, down]),
+                                Tween(self.canvas, self.tag_j, [up, pause, (-dx, 0, 10 * t), pause, down]))
+
+    def step(self, dt):
+        return self._tweens.step(dt)
+
+    def done(self):
+        # exchange tags using a temporary tag
+        temp = self.tag_i + "_swapping"
+        self.canvas.addtag_withtag(temp, self.tag_i)
+        self.canvas.dtag(self.tag_i, self.tag_i)
+        self.canvas.addtag_withtag(self.tag_i, self.tag_j)
+        self.canvas.dtag(self.tag_j, self.tag_j)
+        self.canvas.addtag_withtag(self.tag_j, temp)
+        self.canvas.dtag(temp, temp)
+
+        super().done()
+
+
+class Timeline(object):
+    def __init__(self, widget, fps=60):
+        """
+        Runs animations from the Tk event loop with widget.after()
+        so that commands queueing animations return immediately.
+
+        Animations added to the same channel run one after another,
+        animations in different channels run at the same time.
+
+        :param widget: any Tk widget (used for after())
+        :param fps: target frames per second
+        """
+        self.widget = widget
+        self.interval = max(1, int(1000 / fps))
+
+        # global speed multiplier and flag to skip
+        # animations entirely (e.g. batch runs)
+        self.speed = 1.0
+        self.instant = False
+
+        self._channels = {}
+        self._lock = threading.Lock()
+        self._running = False
+        self._last_tick = 0
+
+    def add(self, animation, channel=None):
+        """
+        Queue animation on channel (None for its own channel).
+        Runs it to completion immediately in instant mode.
+        """
+        if self.instant or self.widget is None:
+            animation.finish()
+            animation.done()
+            return
+
+        if channel is None:
+            channel = animation
+
+        with self._lock:
+            self._channels.setdefault(channel, deque()).append(animation)
+            start_loop = not self._running
+            self._running = True
+
+        if start_loop:
+            self._last_tick = time.perf_counter()
+            self.widget.after(self.interval, self._tick)
+
+    def pending(self, channel):
+        """
+        Number of animations queued or running on channel
+        """
+        with self._lock:
+            return len(self._channels.get(channel, ()))
+
+    def idle(self):
+        with self._lock:
+            return not self._channels
+
+    def _tick(self):
+        now = time.perf_counter()
+        dt = (now - self._last_tick) * self.speed
+        self._last_tick = now
+
+        with self._lock:
+            channels = list(self._channels.items())
+
+        for channel, queue in channels:
+            animation = queue[0]
+            if not animation.started:
+                animation.start()
+
+            if self.instant:
+                animation.finish()
+            elif not animation.step(dt):
+                continue
+
+            with self._lock:
+                queue.popleft()
+                if not queue:
+                    del self._channels[channel]
+            animation.done()
+
+        with self._lock:
+            self._running = bool(self._channels)
+            keep_going = self._running
+
+        if keep_going:
+            self.widget.after(self.interval, self._tick)
+
+    def finish_all(self):
+        """
+        Jump every queued animation to its final state
+        """
+        with self._lock:
+            channels = list(self._channels.items())
+            self._channels.clear()
+
+        for channel, queue in channels:
+            for animation in queue:
+                animation.finish()
+                animation.done()
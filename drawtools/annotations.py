@@ -1,5 +1,5 @@
 from tkinter import Canvas, Entry, Text, WORD, LAST
-from drawtools import default_font
+from drawtools import default_font, ANNOTATION_TAG
 
 
 class TextBox(Text):
@@ -113,7 +113,8 @@ class Arrow(object):
 
         # save id for moving
         self.tk_id = self.parent.create_line(self.p_1.x, self.p_1.y, self.p_2.x, self.p_2.y,
-                                             self.p_3.x, self.p_3.y, smooth=True, arrow=LAST, **kwargs)
+                                             self.p_3.x, self.p_3.y, smooth=True, arrow=LAST,
+                                             tags=ANNOTATION_TAG, **kwargs)
 
         self.straight = True
 
@@ -166,11 +167,12 @@ class Arrow(object):
             if not self.straight or self.moving_point is self.p_2:
                 self.temp_id = self.parent.create_line(self.p_1.x, self.p_1.y, self.p_2.x, self.p_2.y,
                                                        self.p_3.x, self.p_3.y, smooth=True, arrow=LAST,
-                                                       **self.temp_kwargs)
+                                                       tags=ANNOTATION_TAG, **self.temp_kwargs)
                 self.straight = self.is_straight()
             elif self.straight:
                 self.temp_id = self.parent.create_line(self.p_1.x, self.p_1.y,
-                                        self.p_3.x, self.p_3.y, smooth=False, arrow=LAST, **self.temp_kwargs)
+                                        self.p_3.x, self.p_3.y, smooth=False, arrow=LAST,
+                                        tags=ANNOTATION_TAG, **self.temp_kwargs)
 
     def release_point(self, event):
         """
@@ -180,23 +182,19 @@ class Arrow(object):
         self.parent.delete(self.temp_id)
         # delete original arrow
         self.parent.delete(self.tk_id)
-        # remove original arrow id from annotations set
-        self.parent.annotator.annotation_ids.remove(self.tk_id)
-
 
         # redraw updated line
         if self.straight:
             self.tk_id = self.parent.create_line(self.p_1.x, self.p_1.y,
-                                             self.p_3.x, self.p_3.y, smooth=True, arrow=LAST, **self.kwargs)
+                                             self.p_3.x, self.p_3.y, smooth=True, arrow=LAST,
+                                             tags=ANNOTATION_TAG, **self.kwargs)
         else:
             self.tk_id = self.parent.create_line(self.p_1.x, self.p_1.y, self.p_2.x, self.p_2.y,
-                                                 self.p_3.x, self.p_3.y, smooth=True, arrow=LAST, **self.kwargs)
+                                                 self.p_3.x, self.p_3.y, smooth=True, arrow=LAST,
+                                                 tags=ANNOTATION_TAG, **self.kwargs)
 
         self.bind_events()
 
-        # replace tk_id in parent canvas.annotator.annotation_ids
-        self.parent.annotator.annotation_ids.add(self.tk_id)
-
     def translate_arrow(self, event):
         """Move arrow by dragging"""
         self.parent.lift(self.tk_id)
@@ -262,10 +260,6 @@ class Annotator(object):
         self.start_x = 0
         self.start_y = 0
 
-        # keep track of annotation ids so they
-        # don't get removed on clear_canvas()
-        self.annotation_ids = set()
-
     def canvas_clicked(self, event):
         """
         Left-click pushed somewhere on canvas
@@ -286,10 +280,12 @@ class Annotator(object):
         # to current position
         if current_mode == "text":
             self.canvas.delete(self.new_text_rect_id)
-            self.new_text_rect_id = self.canvas.create_rectangle(self.start_x, self.start_y, event.x, event.y)
+            self.new_text_rect_id = self.canvas.create_rectangle(self.start_x, self.start_y, event.x, event.y,
+                                                                 tags=ANNOTATION_TAG)
         elif current_mode == "arrow":
             self.canvas.delete(self.new_arrow_id)
-            self.new_arrow_id = self.canvas.create_line(self.start_x, self.start_y, event.x, event.y)
+            self.new_arrow_id = self.canvas.create_line(self.start_x, self.start_y, event.x, event.y,
+                                                        tags=ANNOTATION_TAG)
 
     def canvas_mouse_released(self, event):
         current_mode = self.get_annotation_mode()
@@ -302,13 +298,11 @@ class Annotator(object):
             if abs(self.start_x - event.x) > 25 and abs(self.start_y - event.y) > 25:
                 new_textbox = TextBox(self.canvas, self.start_x, self.start_y,
                                        event.x, event.y, bg="white")
-                self.annotation_ids.add(new_textbox)
 
         elif current_mode == "arrow":
             self.canvas.delete(self.new_arrow_id)
             new_arrow = Arrow(self.canvas, self.start_x, self.start_y, event.x, event.y,
                               fill="black", width=4)
-            self.annotation_ids.add(new_arrow.tk_id)
 
     def get_annotation_mode(self):
         """
@@ -0,0 +1,117 @@
+class Camera(object):
+    def __init__(self, canvas, tag, redraw, delay=120, min_zoom=0.05, max_zoom=50):
+        """
+        Pan and zoom for the structure drawn on one canvas. Layout
+        coordinates are never changed; the render object multiplies its
+        fit-to-canvas cell size by zoom and shifts by (x, y) when drawing.
+
+        When the camera moves, items already on the canvas are moved or
+        scaled in place (one Tk call for all items with tag) and a full
+        redraw, which culls to the new viewport, is scheduled once the
+        mouse has been still for delay ms.
+
+        Mouse wheel zooms about the pointer, dragging with the middle
+        or right button pans (left button is used for annotations).
+
+        :param canvas: canvas to bind to (None or headless: no bindings)
+        :param tag: canvas tag shared by all items of the structure
+        :param redraw: function redrawing the structure without running layout
+        :param delay: ms to wait after the last camera change before redrawing
+        """
+        self.canvas = canvas
+        self.tag = tag
+        self.redraw = redraw
+        self.delay = delay
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+
+        self.zoom = 1.0
+        self.x = 0
+        self.y = 0
+
+        # id of scheduled redraw and last pointer position of a drag
+        self._pending = None
+        self._drag = None
+
+        if canvas is not None and not canvas.headless:
+            canvas.bind("<MouseWheel>", self.on_mouse_wheel, add="+")
+            canvas.bind("<Button-4>", self.on_mouse_wheel, add="+")
+            canvas.bind("<Button-5>", self.on_mouse_wheel, add="+")
+            for button in (2, 3):
+                canvas.bind("<ButtonPress-%i>" % button, self.on_drag_start, add="+")
+                canvas.bind("<B%i-Motion>" % button, self.on_drag, add="+")
+            # layout is fit to the canvas, so redraw once resizing stops
+            canvas.bind("<Configure>", lambda event: self.schedule_redraw(), add="+")
+
+    def __repr__(self):
+        return "Camera(zoom=%.2f, x=%.1f, y=%.1f)" % (self.zoom, self.x, self.y)
+
+    @property
+    def moved(self):
+        return self.zoom != 1.0 or self.x != 0 or self.y != 0
+
+    def pan(self, dx, dy):
+        """
+        Shift view by dx, dy pixels
+        """
+        self.x += dx
+        self.y += dy
+        self.canvas.move(self.tag, dx, dy)
+        self.schedule_redraw()
+
+    def zoom_at(self, factor, x, y):
+        """
+        Scale view by factor keeping canvas point x, y fixed
+        """
+        zoom = max(self.min_zoom, min(self.zoom * factor, self.max_zoom))
+        factor = zoom / self.zoom
+        if factor == 1:
+            return
+
+        self.zoom = zoom
+        self.x = x + (self.x - x) * factor
+        self.y = y + (self.y - y) * factor
+        self.canvas.scale(self.tag, x, y, factor, factor)
+        self.schedule_redraw()
+
+    def reset(self):
+        """
+        Back to structure fit to canvas
+        """
+        self.zoom = 1.0
+        self.x = self.y = 0
+        self.redraw_now()
+
+    def schedule_redraw(self):
+        """
+        Redraw after delay ms, postponing any redraw already scheduled.
+        Headless canvases have no event loop so they redraw immediately.
+        """
+        if self.canvas is None:
+            return
+        if self.canvas.headless:
+            self.redraw_now()
+            return
+        if self._pending is not None:
+            self.canvas.after_cancel(self._pending)
+        self._pending = self.canvas.after(self.delay, self.redraw_now)
+
+    def redraw_now(self):
+        self._pending = None
+        self.redraw()
+
+    def on_mouse_wheel(self, event):
+        # Button-4/5 on X11, delta on Windows/macOS
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        self.zoom_at(1.25 if up else 0.8, event.x, event.y)
+
+    def on_drag_start(self, event):
+        self._drag = (event.x, event.y)
+
+    def on_drag(self, event):
+        if self._drag is None:
+            self._drag = (event.x, event.y)
+            return
+        x, y = self._drag
+        self._drag = (event.x, event.y)
+        self.pan(event.x - x, event.y - y)
@@ -0,0 +1,301 @@
+"""
+Offline export of algorithm steps as numbered SVG/PNG frames or an
+animated GIF. Frames are snapshots (clones) of a model; laying them out
+and drawing them is spread over a process pool.
+
+    python -m drawtools.export --sort quick --size 30 --out frames/
+    python -m drawtools.export --script demo.ds --name b --out demo.gif --format gif
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import datastructures
+from controller.headless import HeadlessControl, NoRender
+from datastructures import algorithms
+from drawtools import dsDraw_colors
+from drawtools.animation import Timeline
+from drawtools.headless import HeadlessCanvas
+
+# Pillow is only needed for PNG/GIF output
+try:
+    from PIL import Image, ImageDraw
+except ImportError:
+    Image = ImageDraw = None
+
+
+Frame = namedtuple("Frame", ["model", "status"])
+
+ExportResult = namedtuple("ExportResult", ["paths", "frames", "seconds", "fps"])
+
+
+def trace_frames(model, trace, every=1):
+    """
+    Replay a SortTrace on a copy of model, yielding a Frame
+    every `every` steps with the compared pair highlighted.
+
+    :param model: Array/CompactArray the trace was recorded from
+    :param trace: SortTrace
+    """
+    model = model.clone()
+    player = algorithms.TracePlayer(model, None, trace)
+
+    yield Frame(model.clone(), "step 0/%s" % len(trace))
+    compared = None
+    for step in range(len(trace)):
+        compared = player.apply(step) or compared
+        if (step + 1) % every and step + 1 < len(trace):
+            continue
+
+        frame = model.clone()
+        if compared and step + 1 < len(trace):
+            for i in set(compared):
+                frame.set_color(i, dsDraw_colors["yellow"])
+        compared = None
+        yield Frame(frame, "step %s/%s  compares: %s  swaps: %s"
+                    % (step + 1, len(trace), player.compares, player.swaps))
+
+
+class FrameRecorder(NoRender):
+    def __init__(self, render, frames):
+        """
+        Wraps a render object so that instead of drawing, it appends
+        a Frame of the model to frames when first shown and on every
+        redraw following a change recorded in history
+        """
+        super().__init__(render)
+        self.frames = frames
+        self.history = None
+        self._version = None
+
+        # set while a sort plays back, every step is a frame
+        self.playing = False
+
+    def display(self, do_render=True, do_sleep=False):
+        version = self.history.version if self.history is not None else None
+        if self.frames and version == self._version and not self.playing:
+            return
+        self._version = version
+        self.frames.append(Frame(self.render.model.clone(), getattr(self, "status", None)))
+
+
+class FrameTimeline(Timeline):
+    def __init__(self, control):
+        """
+        Instant timeline which plays sorts of the exported
+        structure one trace step per frame
+        """
+        super().__init__(None)
+        self.instant = True
+        self.control = control
+
+    def add(self, animation, channel=None):
+        recorder = self.control.my_renders.get(self.control.name)
+        if not isinstance(animation, algorithms.TracePlayer) or animation.render is not recorder:
+            super().add(animation, channel)
+            return
+
+        recorder.playing = True
+        try:
+            while animation.position < len(animation.trace) and not animation.stopped:
+                animation.advance(1)
+        finally:
+            recorder.playing = False
+        animation.done()
+
+
+class FrameControl(HeadlessControl):
+    def __init__(self, name, out=sys.stdout):
+        """
+        HeadlessControl recording a Frame each time the structure
+        shown as name would be redrawn, and every step of its sorts.
+        Nothing is drawn.
+        """
+        super().__init__(render=False, out=out)
+        self.timeline = FrameTimeline(self)
+        self.name = name
+        self.frames = []
+
+    def wrap_render(self, render):
+        if render.name == self.name:
+            return FrameRecorder(render, self.frames)
+        return super().wrap_render(render)
+
+    def add_model_to_view(self, model_name):
+        super().add_model_to_view(model_name)
+        if model_name == self.name:
+            self.my_renders[model_name].history = self.my_variables[model_name]._history
+
+
+def script_frames(lines, name):
+    """
+    Run a dsDraw script (as 'python -m dsdraw run' does) and return
+    a Frame of the structure shown as `name` after every change to
+    it and every step of its sorts, e.g. four frames (including the
+    empty tree) for
+
+        b = BST()
+        show b
+        for i in [5, 3, 8]: b.insert(i)
+
+    :param lines: script text, or any iterable of lines
+    :param name: variable holding the data structure to export
+    """
+    if isinstance(lines, str):
+        lines = lines.splitlines()
+    control = FrameControl(name)
+    control.run(lines)
+    return control.frames
+
+
+def draw_frame(model, status=None, width=800, height=600, name=""):
+    """
+    Lay out and draw model on a new HeadlessCanvas
+    """
+    canvas = HeadlessCanvas(width, height)
+    render = model.get_render_class()(model, canvas, name)
+    if status is not None:
+        render.status = status
+    render.display()
+    return canvas
+
+
+def rasterize(canvas):
+    """
+    Draw display list of a HeadlessCanvas onto a Pillow image
+    """
+    image = Image.new("RGB", (int(canvas.width), int(canvas.height)), "white")
+    draw = ImageDraw.Draw(image)
+
+    def color(value, default):
+        # Tk names like 'light blue' are written without spaces
+        # in Pillow, empty string means no fill/outline
+        if value is None:
+            return default
+        return str(value).replace(" ", "") if value != "" else None
+
+    for item_id in canvas.find_all():
+        item = canvas._items[item_id]
+        options = item.options
+        if options.get("state") == "hidden":
+            continue
+        if item.type == "line":
+            draw.line(item.coords, fill=color(options.get("fill"), "black"), width=int(options.get("width", 1)))
+        elif item.type in ("oval", "rectangle"):
+            x_0, y_0, x_1, y_1 = item.coords[:4]
+            box = [min(x_0, x_1), min(y_0, y_1), max(x_0, x_1), max(y_0, y_1)]
+            shape = draw.ellipse if item.type == "oval" else draw.rectangle
+            shape(box, fill=color(options.get("fill"), None), outline=color(options.get("outline"), "black"))
+        elif item.type == "polygon":
+            draw.polygon(item.coords, fill=color(options.get("fill"), "black"), outline=color(options.get("outline"), None))
+        elif item.type == "text" and options.get("text") not in (None, ""):
+            anchor = {"nw": "la", "ne": "ra"}.get(options.get("anchor"), "mm")
+            draw.text(item.coords[:2], str(options["text"]), fill=color(options.get("fill"), "black"), anchor=anchor)
+    return image
+
+
+def _export_frame(job):
+    """
+    Worker: draw one frame and write it to path, or return
+    PNG bytes if path is None (frames of a GIF)
+    """
+    model, status, width, height, name, fmt, path = job
+    canvas = draw_frame(model, status, width, height, name)
+
+    if fmt == "svg":
+        canvas.write_svg(path)
+        return path
+
+    image = rasterize(canvas)
+    if path is None:
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        return buffer.getvalue()
+    image.save(path)
+    return path
+
+
+def export(frames, out, fmt="svg", width=800, height=600, name="", workers=None, frame_ms=100):
+    """
+    Draw frames in a process pool and write them out.
+
+    :param frames: iterable of Frame (see trace_frames, script_frames)
+    :param out: directory for numbered svg/png frames, or .gif file
+    :param fmt: svg, png or gif
+    :param workers: number of processes (default: all cores, 0 to draw in this process)
+    :param frame_ms: duration of each GIF frame in milliseconds
+    :return: ExportResult with written paths and frames per second
+    """
+    if fmt not in ("svg", "png", "gif"):
+        raise ValueError("Unknown export format '%s'. Choose from svg, png, gif" % fmt)
+    if fmt != "svg" and Image is None:
+        raise ImportError("%s export requires Pillow (pip install Pillow); svg works without it" % fmt.upper())
+
+    start = time.perf_counter()
+
+    frames = list(frames)
+    if fmt == "gif":
+        paths = [None] * len(frames)
+    else:
+        os.makedirs(out, exist_ok=True)
+        paths = [os.path.join(out, "frame_%05d.%s" % (i, fmt)) for i in range(len(frames))]
+
+    jobs = [(frame.model, frame.status, width, height, name, fmt, path)
+            for frame, path in zip(frames, paths)]
+
+    if workers == 0:
+        results = list(map(_export_frame, jobs))
+    else:
+        workers = workers or os.cpu_count()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # send frames in chunks to cut down on pickling round trips
+            chunksize = max(1, len(jobs) // (4 * workers))
+            results = list(executor.map(_export_frame, jobs, chunksize=chunksize))
+
+    if fmt == "gif":
+        images = [Image.open(io.BytesIO(png)) for png in results]
+        if images:
+            images[0].save(out, save_all=True, append_images=images[1:], duration=frame_ms, loop=0)
+        results = [out]
+
+    seconds = time.perf_counter() - start
+    return ExportResult(results, len(frames), seconds, len(frames) / seconds if seconds else 0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export algorithm steps as image frames")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--sort", choices=sorted(algorithms.SORTS), help="record a sort of a random array")
+    source.add_argument("--script", help="dsDraw script to replay, one frame per change")
+    parser.add_argument("--name", default="a", help="variable exported from --script")
+    parser.add_argument("--size", type=int, default=20, help="array size for --sort")
+    parser.add_argument("--every", type=int, default=1, help="export every n-th step of --sort")
+    parser.add_argument("--out", required=True, help="output directory (svg/png) or .gif file")
+    parser.add_argument("--format", default="svg", choices=["svg", "png", "gif"])
+    parser.add_argument("--width", type=int, default=800)
+    parser.add_argument("--height", type=int, default=600)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    if args.sort:
+        model = datastructures.arrays.CompactArray(args.size)
+        trace = algorithms.record_sort(model.values(), args.sort)
+        frames = trace_frames(model, trace, every=args.every)
+    else:
+        with open(args.script) as f:
+            frames = script_frames(f, args.name)
+
+    try:
+        result = export(frames, args.out, fmt=args.format, width=args.width, height=args.height,
+                        name=args.name if args.script else args.sort, workers=args.workers)
+    except ImportError as e:
+        parser.error(str(e))
+    print("exported %s frames in %.2fs (%.1f frames/s)" % (result.frames, result.seconds, result.fps))
+
+
+if __name__ == '__main__':
+    main()
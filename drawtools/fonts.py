@@ -0,0 +1,86 @@
+from collections import namedtuple
+from tkinter.font import Font
+
+FontInfo = namedtuple("FontInfo", ["hits", "misses", "fonts", "measured"])
+
+
+class CachedFont(object):
+    def __init__(self, font):
+        """
+        Wraps a tkinter Font, memoizing measure() per string.
+        Can be passed anywhere Tk expects a font since it
+        converts to the font's name like Font does.
+
+        :param font: tkinter.font.Font (or anything with measure())
+        """
+        self.font = font
+        self._widths = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def __str__(self):
+        return str(self.font)
+
+    def __getitem__(self, option):
+        return self.font[option]
+
+    def __len__(self):
+        return len(self._widths)
+
+    def measure(self, text):
+        text = str(text)
+        try:
+            width = self._widths[text]
+            self.hits += 1
+        except KeyError:
+            width = self._widths[text] = self.font.measure(text)
+            self.misses += 1
+        return width
+
+    def configure(self, **options):
+        """
+        Changing the font invalidates measurements
+        """
+        self.font.configure(**options)
+        self._widths.clear()
+
+
+class FontRegistry(object):
+    def __init__(self, font_class=Font):
+        """
+        Creates each (family, size, weight) font once per Tk root
+        and hands out the same CachedFont on every later request.
+
+        Fonts from the registry are shared, so they must not be
+        reconfigured -- widgets that resize their font (e.g. Console)
+        should create their own with drawtools.default_font().
+        """
+        self.font_class = font_class
+        self._fonts = {}
+
+    def get(self, widget, family="Monospace", size=10, weight="normal"):
+        """
+        :param widget: any widget of the Tk instance the font is for
+        """
+        key = (widget._root(), family, size, weight)
+        try:
+            return self._fonts[key]
+        except KeyError:
+            font = self.font_class(root=key[0], family=family, size=size, weight=weight)
+            self._fonts[key] = CachedFont(font)
+            return self._fonts[key]
+
+    def info(self):
+        """
+        Measurement cache hits/misses summed over all fonts
+        """
+        fonts = list(self._fonts.values())
+        return FontInfo(sum(f.hits for f in fonts), sum(f.misses for f in fonts),
+                        len(fonts), sum(map(len, fonts)))
+
+    def clear(self):
+        self._fonts.clear()
+
+
+registry = FontRegistry()
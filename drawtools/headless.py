@@ -0,0 +1,302 @@
+from collections import Counter
+
+
+class HeadlessFont(object):
+    def __init__(self, family="Monospace", size=10):
+        """
+        Stand-in for tkinter.font.Font without a Tk instance.
+        Text width is approximated from character count, which
+        is close enough for a monospace font.
+        """
+        self.family = family
+        self.size = size
+        self.char_width = round(size * 0.8)
+
+    def measure(self, text):
+        return len(str(text)) * self.char_width
+
+    def configure(self, family=None, size=None, **options):
+        self.family = family or self.family
+        if size is not None:
+            self.size = size
+            self.char_width = round(size * 0.8)
+
+    def __getitem__(self, option):
+        return {"family": self.family, "size": self.size}[option]
+
+    def metrics(self, option=None):
+        metrics = {"ascent": self.size, "descent": self.size // 4,
+                   "linespace": self.size + self.size // 4 + 1, "fixed": 1}
+        return metrics[option] if option else metrics
+
+
+class CanvasItem(object):
+    __slots__ = ("id", "type", "coords", "options", "tags")
+
+    def __init__(self, id, type, coords, options, tags):
+        self.id = id
+        self.type = type
+        self.coords = coords
+        self.options = options
+        self.tags = tags
+
+    def __repr__(self):
+        return "CanvasItem(%s, %s, %s)" % (self.id, self.type, self.coords)
+
+
+class HeadlessAnnotator(object):
+    """
+    Headless canvases have no mouse, so no annotations are ever made
+    """
+
+
+class HeadlessCanvas(object):
+    # render objects check this to avoid threads and
+    # sleeping meant for the interactive view
+    headless = True
+
+    def __init__(self, width=800, height=600):
+        """
+        In-memory replacement for DrawCanvas. Implements the
+        subset of the tkinter Canvas interface used by render
+        objects and animations, keeping items in a display list
+        (in stacking order) which can be inspected or written as SVG.
+
+        :param width: canvas width in pixels
+        :param height: canvas height in pixels
+        """
+        self.width = width
+        self.height = height
+
+        self.annotator = HeadlessAnnotator()
+
+        self._items = {}
+        self._next_id = 1
+        self._font = HeadlessFont()
+
+        # number of calls per canvas operation, for benchmarks
+        self.op_counts = Counter()
+
+    def default_font(self):
+        return self._font
+
+    def __len__(self):
+        return len(self._items)
+
+    # tkinter Canvas methods
+
+    def _create(self, item_type, args, options):
+        self.op_counts["create"] += 1
+
+        # coordinates may be given as separate args or one sequence
+        if len(args) == 1 and isinstance(args[0], (list, tuple)):
+            args = args[0]
+
+        # tag option can be abbreviated and given as a string
+        tags = options.pop("tags", options.pop("tag", ()))
+        if isinstance(tags, str):
+            tags = tags.split()
+
+        item = CanvasItem(self._next_id, item_type, [float(c) for c in args], options, set(tags))
+        self._items[item.id] = item
+        self._next_id += 1
+        return item.id
+
+    def create_line(self, *args, **options):
+        return self._create("line", args, options)
+
+    def create_oval(self, *args, **options):
+        return self._create("oval", args, options)
+
+    def create_rectangle(self, *args, **options):
+        return self._create("rectangle", args, options)
+
+    def create_polygon(self, *args, **options):
+        return self._create("polygon", args, options)
+
+    def create_text(self, *args, **options):
+        return self._create("text", args, options)
+
+    def _find(self, tag_or_id):
+        if isinstance(tag_or_id, str) and tag_or_id.isdigit():
+            tag_or_id = int(tag_or_id)
+        if isinstance(tag_or_id, int):
+            item = self._items.get(tag_or_id)
+            return [item] if item else []
+        if tag_or_id == "all":
+            return list(self._items.values())
+        return [item for item in self._items.values() if tag_or_id in item.tags]
+
+    def find_all(self):
+        return tuple(self._items)
+
+    def find_withtag(self, tag_or_id):
+        return tuple(item.id for item in self._find(tag_or_id))
+
+    def delete(self, *tags_or_ids):
+        self.op_counts["delete"] += 1
+        for tag_or_id in tags_or_ids:
+            for item in self._find(tag_or_id):
+                del self._items[item.id]
+
+    def coords(self, tag_or_id, *new_coords):
+        items = self._find(tag_or_id)
+        if new_coords:
+            if len(new_coords) == 1:
+                new_coords = new_coords[0]
+            for item in items:
+                item.coords = [float(c) for c in new_coords]
+            return None
+        return list(items[0].coords) if items else []
+
+    def move(self, tag_or_id, dx, dy):
+        self.op_counts["move"] += 1
+        for item in self._find(tag_or_id):
+            item.coords = [c + (dy if i % 2 else dx) for i, c in enumerate(item.coords)]
+
+    def scale(self, tag_or_id, x_origin, y_origin, x_scale, y_scale):
+        for item in self._find(tag_or_id):
+            item.coords = [(y_origin + (c - y_origin) * y_scale) if i % 2
+                           else (x_origin + (c - x_origin) * x_scale)
+                           for i, c in enumerate(item.coords)]
+
+    def itemconfigure(self, tag_or_id, **options):
+        self.op_counts["itemconfigure"] += 1
+        tags = options.pop("tags", options.pop("tag", None))
+        if isinstance(tags, str):
+            tags = tags.split()
+        for item in self._find(tag_or_id):
+            item.options.update(options)
+            if tags is not None:
+                item.tags = set(tags)
+
+    itemconfig = itemconfigure
+
+    def itemcget(self, tag_or_id, option):
+        items = self._find(tag_or_id)
+        return items[0].options.get(option, "") if items else ""
+
+    def type(self, tag_or_id):
+        items = self._find(tag_or_id)
+        return items[0].type if items else None
+
+    def gettags(self, tag_or_id):
+        items = self._find(tag_or_id)
+        return tuple(items[0].tags) if items else ()
+
+    def addtag_withtag(self, new_tag, tag_or_id):
+        for item in self._find(tag_or_id):
+            item.tags.add(new_tag)
+
+    def dtag(self, tag_or_id, tag_to_delete=None):
+        tag_to_delete = tag_or_id if tag_to_delete is None else tag_to_delete
+        for item in self._find(tag_or_id):
+            item.tags.discard(tag_to_delete)
+
+    def tag_raise(self, tag_or_id, above=None):
+        for item in self._find(tag_or_id):
+            self._items[item.id] = self._items.pop(item.id)
+
+    def tag_lower(self, tag_or_id, below=None):
+        lowered = self._find(tag_or_id)
+        rest = [item for item in self._items.values() if item not in lowered]
+        self._items = {item.id: item for item in lowered + rest}
+
+    def bind(self, sequence=None, func=None, add=None):
+        pass
+
+    def update(self):
+        pass
+
+    # output
+
+    def to_svg(self):
+        """
+        Current display list as an SVG document (hidden items are skipped)
+        """
+        lines = ['<svg xmlns="http://www.w3.org/2000/svg" width="%s" height="%s" '
+                 'font-family="monospace" font-size="%s">' % (self.width, self.height, self._font.size),
+                 '<rect width="100%" height="100%" fill="white"/>']
+
+        for item in self._items.values():
+            if item.options.get("state") == "hidden":
+                continue
+            svg = _SVG_ITEMS[item.type](item)
+            if svg:
+                lines.append(svg)
+
+        lines.append("</svg>")
+        return "\n".join(lines)
+
+    def write_svg(self, path):
+        with open(path, "w") as f:
+            f.write(self.to_svg())
+
+
+# same as xml.sax.saxutils escape/quoteattr, which would import
+# urllib (and most of the email package) at startup
+def _escape(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _quoteattr(value):
+    return '"%s"' % _escape(value).replace('"', "&quot;")
+
+
+def _color(value, default):
+    # empty string means no fill/outline in Tk
+    if value is None:
+        return _quoteattr(default)
+    return _quoteattr(str(value) if value != "" else "none")
+
+
+def _svg_line(item):
+    points = " ".join("%.1f,%.1f" % tuple(item.coords[i:i + 2]) for i in range(0, len(item.coords) - 1, 2))
+    return '<polyline points="%s" fill="none" stroke=%s stroke-width="%s"/>' \
+           % (points, _color(item.options.get("fill"), "black"), item.options.get("width", 1))
+
+
+def _svg_oval(item):
+    x_0, y_0, x_1, y_1 = item.coords[:4]
+    return '<ellipse cx="%.1f" cy="%.1f" rx="%.1f" ry="%.1f" fill=%s stroke=%s/>' \
+           % ((x_0 + x_1) / 2, (y_0 + y_1) / 2, abs(x_1 - x_0) / 2, abs(y_1 - y_0) / 2,
+              _color(item.options.get("fill"), "none"), _color(item.options.get("outline"), "black"))
+
+
+def _svg_rectangle(item):
+    x_0, y_0, x_1, y_1 = item.coords[:4]
+    return '<rect x="%.1f" y="%.1f" width="%.1f" height="%.1f" fill=%s stroke=%s/>' \
+           % (min(x_0, x_1), min(y_0, y_1), abs(x_1 - x_0), abs(y_1 - y_0),
+              _color(item.options.get("fill"), "none"), _color(item.options.get("outline"), "black"))
+
+
+def _svg_polygon(item):
+    points = " ".join("%.1f,%.1f" % tuple(item.coords[i:i + 2]) for i in range(0, len(item.coords) - 1, 2))
+    return '<polygon points="%s" fill=%s stroke=%s/>' \
+           % (points, _color(item.options.get("fill"), "black"), _color(item.options.get("outline"), "none"))
+
+
+# Tk anchor -> (text-anchor, dominant-baseline)
+_ANCHORS = {"nw": ("start", "hanging"), "n": ("middle", "hanging"), "ne": ("end", "hanging"),
+            "w": ("start", "central"), "center": ("middle", "central"), "e": ("end", "central"),
+            "sw": ("start", "text-after-edge"), "s": ("middle", "text-after-edge"),
+            "se": ("end", "text-after-edge")}
+
+
+def _svg_text(item):
+    text = item.options.get("text", "")
+    if text in (None, ""):
+        return None
+    text_anchor, baseline = _ANCHORS.get(item.options.get("anchor", "center"), _ANCHORS["center"])
+    return '<text x="%.1f" y="%.1f" text-anchor="%s" dominant-baseline="%s" fill=%s>%s</text>' \
+           % (item.coords[0], item.coords[1], text_anchor, baseline,
+              _color(item.options.get("fill"), "black"), _escape(str(text)))
+
+
+_SVG_ITEMS = {
+    "line": _svg_line,
+    "oval": _svg_oval,
+    "rectangle": _svg_rectangle,
+    "polygon": _svg_polygon,
+    "text": _svg_text,
+}
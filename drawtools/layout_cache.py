@@ -0,0 +1,66 @@
+from collections import OrderedDict, namedtuple
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class LayoutCache(object):
+    """
+    Least recently used cache of layouts for a single render object.
+
+    Keys are structural keys produced by the model (see
+    structure_key() on each DataStructure) so that any two states
+    with the same shape and values share coordinates. Values are
+    whatever the render object needs to restore a layout without
+    running its layout algorithm again.
+    """
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._layouts = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._layouts)
+
+    def __contains__(self, key):
+        return key in self._layouts
+
+    def get(self, key):
+        """
+        Return layout stored for key (and mark it as most
+        recently used) or None if it isn't cached.
+        """
+        try:
+            layout = self._layouts[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        self._layouts.move_to_end(key)
+        self.hits += 1
+        return layout
+
+    def put(self, key, layout):
+        """
+        Store layout for key, evicting the least
+        recently used layout if cache is full.
+        """
+        self._layouts[key] = layout
+        self._layouts.move_to_end(key)
+
+        while len(self._layouts) > self.maxsize:
+            self._layouts.popitem(last=False)
+
+    def clear(self):
+        self._layouts.clear()
+        self.hits = self.misses = 0
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._layouts))
+
+    def __repr__(self):
+        return "LayoutCache(hits=%s, misses=%s, size=%s/%s)" \
+               % (self.hits, self.misses, len(self._layouts), self.maxsize)
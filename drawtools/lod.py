@@ -0,0 +1,79 @@
+class LODPolicy(object):
+    def __init__(self, label_px=14, point_px=3, summary_px=8, cull=True):
+        """
+        Level of detail thresholds for drawing trees and graphs
+        whose cells have shrunk to a few pixels. Below label_px
+        labels are hidden, below point_px nodes are drawn as single
+        points (at most one per pixel), subtrees narrower than
+        summary_px are drawn as one glyph (like the '...' of a
+        compressed array) and items outside the canvas are skipped.
+
+        :param label_px: smallest cell size (pixels) labels are drawn at
+        :param point_px: smallest node radius drawn as a circle
+        :param summary_px: narrowest subtree drawn node by node
+        :param cull: skip items outside the canvas
+        """
+        self.label_px = label_px
+        self.point_px = point_px
+        self.summary_px = summary_px
+        self.cull = cull
+
+    def __repr__(self):
+        return "LODPolicy(label_px=%s, point_px=%s, summary_px=%s, cull=%s)" \
+               % (self.label_px, self.point_px, self.summary_px, self.cull)
+
+    def active(self, cell_w, cell_h):
+        """
+        Cells big enough for labels are drawn normally
+        """
+        return min(cell_w, cell_h) < self.label_px
+
+    def as_points(self, cell_w, cell_h):
+        # nodes are drawn at half the cell size
+        return min(cell_w, cell_h) / 4 < self.point_px
+
+    def in_view(self, x_0, y_0, x_1, y_1, width, height):
+        """
+        True if box (or line) x_0, y_0 -> x_1, y_1 may be visible
+        """
+        if not self.cull:
+            return True
+        return max(x_0, x_1) >= 0 and min(x_0, x_1) <= width and \
+            max(y_0, y_1) >= 0 and min(y_0, y_1) <= height
+
+
+def subtree_extents(root, children_of):
+    """
+    (min x, max x, max y) of each subtree in layout
+    units, keyed by id of subtree root. Iterative postorder
+    since unbalanced trees can be deep.
+
+    :param children_of: function returning list of children of a node
+    """
+    extents = {}
+    stack = [(root, False)]
+    while stack:
+        node, children_done = stack.pop()
+        children = children_of(node)
+        if not children_done:
+            stack.append((node, True))
+            stack.extend((child, False) for child in children)
+            continue
+
+        min_x = max_x = node.x
+        max_y = node.y
+        for child in children:
+            c_min_x, c_max_x, c_max_y = extents[id(child)]
+            min_x = min(min_x, c_min_x)
+            max_x = max(max_x, c_max_x)
+            max_y = max(max_y, c_max_y)
+        extents[id(node)] = (min_x, max_x, max_y)
+    return extents
+
+
+def point_color(color):
+    """
+    Points are too small to have an outline, so
+    uncolored (white) nodes are drawn black
+    """
+    return "black" if color == "white" else color
@@ -1,7 +1,11 @@
 from collections import defaultdict
 from util.my_threads import GraphSimThread
-from time import sleep
-from drawtools import default_font
+from time import sleep, perf_counter
+from drawtools.layout_cache import LayoutCache
+from drawtools import lod
+from drawtools.camera import Camera
+from drawtools import ANNOTATION_TAG
+from util.instrumentation import recorder
 import random
 
 
@@ -14,13 +18,57 @@ class RenderObject(object):
         self.tick = .15
         self.focused = False
 
+        # layouts of previously seen states (undo, re-show)
+        self.layout_cache = LayoutCache()
+
+        # level of detail for small cells (None to always draw everything)
+        self.lod = lod.LODPolicy()
+
+        # canvas tag on every item drawn for this structure
+        # (except its title, which the camera doesn't move)
+        self.tag = "ds_%s" % name
+
+    def role_tag(self, role):
+        """
+        Tag of this structure's items with role node, edge,
+        label, index or title, e.g. for hiding all labels at once
+        """
+        return "%s_%s" % (self.tag, role)
+
+    def tags(self, role, *other_tags):
+        """
+        Tags for a new item: structure tag and role tag
+        """
+        return (self.tag, self.role_tag(role)) + other_tags
+
+    def phase(self, name, func, count_items=False):
+        """
+        Run one phase of display(), recording its time under this
+        render class in util.instrumentation.recorder. Phases which
+        draw also record the number of items this structure has on
+        the canvas after them if recorder.count_items is set.
+        """
+        if not recorder.enabled:
+            return func()
+        start = perf_counter()
+        result = func()
+        seconds = perf_counter() - start
+
+        items = len(self.canvas.find_withtag(self.tag)) if count_items and recorder.count_items else None
+        recorder.record("render", "%s.%s" % (type(self).__name__, name), seconds, items)
+        return result
+
     def clear_canvas(self):
         """
         Only delete items created by render object/data structure.
         """
-        for id in self.canvas.find_all():
-            if id not in self.canvas.annotator.annotation_ids:
-                self.canvas.delete(id)
+        self.canvas.delete(self.tag, self.role_tag("title"))
+
+    def raise_annotations(self):
+        """
+        Keep annotations on top of the freshly drawn structure
+        """
+        self.canvas.tag_raise(ANNOTATION_TAG)
 
 class RenderTree(RenderObject):
     """
@@ -34,6 +82,9 @@ class RenderTree(RenderObject):
         super().__init__(model, canvas, name)
         self.tree = self.model
 
+        # whether the layout logs debug messages (set per layout)
+        self.trace = False
+
         # used for centering tree on canvas
         self.max_x = 0
         self.max_y = 0
@@ -44,6 +95,9 @@ class RenderTree(RenderObject):
         # on the same level
         self.minsep = 1
 
+        # pan/zoom, applied on top of fitting layout to the canvas
+        self.camera = Camera(canvas, self.tag, lambda: self.display(do_render=False))
+
     def display(self, do_render=True, do_sleep=False):
         """Renders data structure (preprocess),
             clears canvas, and draws to canvas
@@ -54,13 +108,14 @@ class RenderTree(RenderObject):
             return
 
         if do_render:
-            self.render()
+            self.phase("render", self.render)
 
         # determine node sizes
-        self.preprocess()
+        self.phase("preprocess", self.preprocess)
 
-        self.clear_canvas()
-        self.draw_on_canvas()
+        self.phase("clear_canvas", self.clear_canvas)
+        self.phase("draw_on_canvas", self.draw_on_canvas, count_items=True)
+        self.raise_annotations()
 
         if do_sleep:
             self.canvas.update()
@@ -74,10 +129,10 @@ class RenderTree(RenderObject):
         width = self.canvas.width
         height = self.canvas.height
 
-        self.cell_w = width / (self.max_x - self.min_x + 1)
-        self.cell_h = height / (self.max_y - self.min_y + 1)
+        self.cell_w = width / (self.max_x - self.min_x + 1) * self.camera.zoom
+        self.cell_h = height / (self.max_y - self.min_y + 1) * self.camera.zoom
 
-        self.model.logger.debug("cell size set; width: %s, height: %s" % (self.cell_w, self.cell_h))
+        self.model.logger.debug("cell size set; width: %s, height: %s", self.cell_w, self.cell_h)
 
     def draw_on_canvas(self, circle=False):
         """
@@ -87,7 +142,9 @@ class RenderTree(RenderObject):
                :param circle: if True, draw nodes as circles
                """
         # show name in top left corner
-        name = self.canvas.create_text(5, 5, text=self.name, anchor="nw", font=default_font())
+        font = self.canvas.default_font()
+        name = self.canvas.create_text(5, 5, text=self.name, anchor="nw", font=font,
+                                       tags=self.role_tag("title"))
 
         # if circle set to True, then
         # pick smaller of width/height
@@ -97,23 +154,35 @@ class RenderTree(RenderObject):
             cell_w = self.cell_w
             cell_h = self.cell_h
 
+        if self.lod is not None and self.lod.active(cell_w, cell_h):
+            self.draw_lod(cell_w, cell_h)
+            return
+
         # traverse tree in preorder so lines get drawn
         # first and nodes are placed on top
+        cam_x, cam_y = self.camera.x, self.camera.y
+        width, height = self.canvas.width, self.canvas.height
+        in_view = self.lod.in_view if self.lod is not None else lambda *box: True
         for node in self.tree.preorder():
-            x0 = node.x * cell_w
-            y0 = node.y * cell_h
+            x0 = node.x * cell_w + cam_x
+            y0 = node.y * cell_h + cam_y
             for c in node.children():
-                x1 = c.x * cell_w
-                y1 = c.y * cell_h
+                x1 = c.x * cell_w + cam_x
+                y1 = c.y * cell_h + cam_y
                 center_offsets = [cell_w / 2, cell_h / 2] * 2
 
                 pts = [x0, y0, x1, y1]
                 centers = [pt + off for pt, off in zip(pts, center_offsets)]
+                if not in_view(*centers, width, height):
+                    continue
 
                 # show color for bst property
                 color = "blue" if c.value <= node.value else "red"
                 color = "green" if c.value == node.value else color
-                edge = self.canvas.create_line(*centers, fill=color, width=2)
+                edge = self.canvas.create_line(*centers, fill=color, width=2, tags=self.tags("edge"))
+
+            if not in_view(x0, y0, x0 + cell_w, y0 + cell_h, width, height):
+                continue
 
             # draw nodes at 50% size as to not block
             # drawing of edges
@@ -121,7 +190,8 @@ class RenderTree(RenderObject):
 
             # self.model.logger.debug("Drawing Node(%s) at %.2f, %.2f" % (node.value, x0_n, y0_n))
 
-            oval = self.canvas.create_oval(x0_n, y0_n, x0_n + cell_w / 2, y0_n + cell_h / 2, fill=node.color)
+            oval = self.canvas.create_oval(x0_n, y0_n, x0_n + cell_w / 2, y0_n + cell_h / 2, fill=node.color,
+                                           tags=self.tags("node"))
             # node_text = ("%sCC:\n%i, %i\ns:%i, d:%i"
             #                               % (node, node.x, node.y,
             #                                  node.get_size(), node.depth))
@@ -131,9 +201,102 @@ class RenderTree(RenderObject):
             # node_text = ""
 
             val_text = self.canvas.create_text(x0 + cell_w / 2, y0 + cell_h / 2,
-                                    text=node_text, font=default_font())
+                                    text=node_text, font=font, tags=self.tags("label"))
+
+    def children_of(self):
+        """
+        Function returning children of a node. Heap children are
+        found by index since HeapNode.children() searches the heap array.
+        """
+        heap = getattr(self.tree, "heap_array", None)
+        if heap is None:
+            return lambda node: node.children()
+
+        n = len(heap)
+        index = {id(node): i for i, node in enumerate(heap)}
+        return lambda node: [heap[j] for j in (2 * index[id(node)] + 1, 2 * index[id(node)] + 2) if j < n]
+
+    def draw_lod(self, cell_w, cell_h):
+        """
+        Draw tree with reduced detail (see LODPolicy). Subtrees
+        too narrow to tell apart are drawn as a single triangle, so the
+        number of items depends on canvas size rather than tree size.
+        """
+        policy = self.lod
+        width, height = self.canvas.width, self.canvas.height
+        cam_x, cam_y = self.camera.x, self.camera.y
+        points = policy.as_points(cell_w, cell_h)
+
+        children_of = self.children_of()
+        extents = lod.subtree_extents(self.tree.root, children_of)
+
+        # pixels already holding a point
+        drawn = set()
+
+        stack = [self.tree.root]
+        while stack:
+            node = stack.pop()
+            x = (node.x + .5) * cell_w + cam_x
+            y = (node.y + .5) * cell_h + cam_y
+            children = children_of(node)
+
+            min_x, max_x, max_y = extents[id(node)]
+            if children and (max_x - min_x + 1) * cell_w < policy.summary_px:
+                # summary glyph spanning the whole subtree
+                x_0, x_1 = min_x * cell_w + cam_x, (max_x + 1) * cell_w + cam_x
+                y_1 = (max_y + 1) * cell_h + cam_y
+                if policy.in_view(x_0, y, x_1, y_1, width, height):
+                    self.canvas.create_polygon(x, y, x_1, y_1, x_0, y_1, fill="gray", outline="",
+                                               tags=self.tags("node"))
+                continue
+
+            for child in children:
+                x_c = (child.x + .5) * cell_w + cam_x
+                y_c = (child.y + .5) * cell_h + cam_y
+                if policy.in_view(x, y, x_c, y_c, width, height):
+                    color = "blue" if child.value <= node.value else "red"
+                    color = "green" if child.value == node.value else color
+                    self.canvas.create_line(x, y, x_c, y_c, fill=color, tags=self.tags("edge"))
+                stack.append(child)
+
+            if not policy.in_view(x, y, x, y, width, height):
+                continue
+
+            if points:
+                pixel = (int(x), int(y))
+                if pixel in drawn:
+                    continue
+                drawn.add(pixel)
+                self.canvas.create_rectangle(x - 1, y - 1, x + 1, y + 1,
+                                             fill=lod.point_color(node.color), outline="",
+                                             tags=self.tags("node"))
+            else:
+                self.canvas.create_oval(x - cell_w / 4, y - cell_h / 4, x + cell_w / 4, y + cell_h / 4,
+                                        fill=node.color, tags=self.tags("node"))
 
     def render(self):
+        """
+        Assign coordinates to each node, reusing the layout
+        of an identical tree shape if one has been computed before.
+        """
+        key = self.tree.structure_key()
+        nodes = list(self.tree.root)
+
+        layout = self.layout_cache.get(key)
+        if layout is not None:
+            coords, (self.min_x, self.max_x, self.min_y, self.max_y) = layout
+            for node, (x, y) in zip(nodes, coords):
+                node.x = x
+                node.y = node.depth = y
+            return
+
+        self.reingold_tilford(nodes)
+
+        coords = [(node.x, node.y) for node in nodes]
+        bounds = (self.min_x, self.max_x, self.min_y, self.max_y)
+        self.layout_cache.put(key, (coords, bounds))
+
+    def reingold_tilford(self, nodes):
         # # Reingold-Tilford algorithm - O(n)
 
         # do two O(n) passes to update depths and extreme descendants
@@ -145,14 +308,14 @@ class RenderTree(RenderObject):
 
         # determine max/min x/y
         self.max_x = self.max_y = self.min_x = self.min_y = 0
-        for node in self.tree.root:
+        for node in nodes:
             self.max_x = max(node.x, self.max_x)
             self.max_y = max(node.y, self.max_y)
             self.min_x = min(node.x, self.min_x)
             self.min_y = min(node.y, self.min_y)
 
         # temporary fix to place everything on screen
-        for node in self.tree.root:
+        for node in nodes:
             node.x += abs(self.min_x)
 
         # print("x: %i, %i; y: %i, %i" % (self.min_x, self.max_x, self.min_y, self.max_y))
@@ -161,11 +324,16 @@ class RenderTree(RenderObject):
         """
         Wrapper function for Reingold-Tilford algorithm
         """
+        # checked once here, not for each of the dozens
+        # of debug messages per node in the recursion
+        self.trace = self.model.log_enabled("debug")
         self._setup_tr(self.tree.root, 0, self.tree.root.get_xleft(), self.tree.root.get_xright())
 
     def _setup_tr(self, T, depth, rmost, lmost):
         MINSEP = self.minsep
         LL = LR = RL = RR = None
+        trace = self.trace
+        log = self.model.log
 
         if T:
             L = T.left_child()
@@ -196,14 +364,13 @@ class RenderTree(RenderObject):
             self._setup_tr(L, depth + 1, LR, LL)
             self._setup_tr(R, depth + 1, RR, RL)
 
-            self.model.log("debug", "IN TR SETUP: COMPARING %s and %s ; lmost=%s, rmost=%s; ROOT IS %s" % (L, R, lmost, rmost, T),
-                        indent=depth)
-            self.model.log("debug", "IN TR SETUP: LOFFSUM = %s, ROFFSUM = %s" % (LOFFSUM, ROFFSUM),
-                     indent=depth)
+            if trace:
+                log("debug", "IN TR SETUP: COMPARING %s and %s ; lmost=%s, rmost=%s; ROOT IS %s", L, R, lmost, rmost, T,
+                    indent=depth)
+                log("debug", "IN TR SETUP: LOFFSUM = %s, ROFFSUM = %s", LOFFSUM, ROFFSUM, indent=depth)
 
             # if T is a leaf
             if not (T.left_child() or T.right_child()):
-                self.model.log("debug", "%s is a leaf" % T, indent=depth)
                 rmost = T
                 lmost = T
 
@@ -212,7 +379,9 @@ class RenderTree(RenderObject):
                 rmost.root_offset = 0
                 lmost.root_offset = 0
                 T.par_offset = 0
-                self.model.log("debug", "SETTING %s.par_offset = 0" % T, indent=depth)
+                if trace:
+                    log("debug", "%s is a leaf", T, indent=depth)
+                    log("debug", "SETTING %s.par_offset = 0", T, indent=depth)
 
             else:
                 # "superimpose" the subtrees on one another, starting with separation of 0
@@ -225,90 +394,75 @@ class RenderTree(RenderObject):
                 # one subtree is exhausted,
                 # pushing apart when necessary
                 while L and R:
-                    self.model.log("debug", "\n" + ("\t" * depth) + "IN WHILE: L = %s; R = %s; CURSEP = %s" % (L, R, CURSEP),
-                             indent=depth)
+                    if trace:
+                        log("debug", "\n" + "\t" * depth + "IN WHILE: L = %s; R = %s; CURSEP = %s", L, R, CURSEP,
+                            indent=depth)
 
                     if CURSEP < MINSEP:
                         # push apart
                         push = MINSEP - CURSEP
-                        self.model.log("debug", "--- PUSHING APART BY %s" % push,
-                                 indent=depth)
+                        if trace:
+                            log("debug", "--- PUSHING APART BY %s", push, indent=depth)
                         ROOTSEP += push
                         CURSEP = MINSEP
 
                     # advance L and R along respective contours
                     if L.right_child():
                         LOFFSUM += L.par_offset
-                        self.model.log("debug", "IN WHILE: LOFFSUM += %s; NOW = %s" % (L.par_offset, LOFFSUM),
-                                 indent=depth)
-
-                        self.model.log("debug", "IN WHILE: CURSEP -= L.offset: %s" % L.par_offset,
-                                 indent=depth)
                         CURSEP -= L.par_offset
-
-                        self.model.log("debug", "IN WHILE: L -> %s" % L.right_child(),
-                                 indent=depth)
+                        if trace:
+                            log("debug", "IN WHILE: LOFFSUM += %s; NOW = %s", L.par_offset, LOFFSUM, indent=depth)
+                            log("debug", "IN WHILE: CURSEP -= L.offset: %s", L.par_offset, indent=depth)
+                            log("debug", "IN WHILE: L -> %s", L.right_child(), indent=depth)
                         L = L.right_child()
                     else:
                         LOFFSUM -= L.par_offset
-                        self.model.log("debug", "IN WHILE: LOFFSUM -= %s; NOW = %s" % (L.par_offset, LOFFSUM),
-                                 indent=depth)
-
-                        self.model.log("debug", "IN WHILE: CURSEP += L.offset: %s" % L.par_offset,
-                                 indent=depth)
                         CURSEP += L.par_offset
-                        self.model.log("debug", "IN WHILE: L -> %s" % L.left_child(),
-                                 indent=depth)
+                        if trace:
+                            log("debug", "IN WHILE: LOFFSUM -= %s; NOW = %s", L.par_offset, LOFFSUM, indent=depth)
+                            log("debug", "IN WHILE: CURSEP += L.offset: %s", L.par_offset, indent=depth)
+                            log("debug", "IN WHILE: L -> %s", L.left_child(), indent=depth)
                         L = L.left_child()
 
                     if R.left_child():
                         ROFFSUM -= R.par_offset
-                        self.model.log("debug", "IN WHILE: ROFFSUM += %s; NOW = %s" % (R.par_offset, ROFFSUM),
-                                 indent=depth)
-
-                        self.model.log("debug", "IN WHILE: CURSEP -= R.offset: %s" % R.par_offset,
-                                 indent=depth)
                         CURSEP -= R.par_offset
-                        self.model.log("debug", "IN WHILE: R -> %s" % R.left_child(),
-                                 indent=depth)
+                        if trace:
+                            log("debug", "IN WHILE: ROFFSUM += %s; NOW = %s", R.par_offset, ROFFSUM, indent=depth)
+                            log("debug", "IN WHILE: CURSEP -= R.offset: %s", R.par_offset, indent=depth)
+                            log("debug", "IN WHILE: R -> %s", R.left_child(), indent=depth)
                         R = R.left_child()
                     else:
                         ROFFSUM += R.par_offset
-                        self.model.log("debug", "IN WHILE: ROFFSUM += %s; NOW = %s" % (R.par_offset, ROFFSUM),
-                                 indent=depth)
-
-                        self.model.log("debug", "IN WHILE: CURSEP += R.offset: %s" % R.par_offset,
-                                 indent=depth)
                         CURSEP += R.par_offset
-                        self.model.log("debug", "IN WHILE: R -> %s" % R.right_child(),
-                                 indent=depth)
+                        if trace:
+                            log("debug", "IN WHILE: ROFFSUM += %s; NOW = %s", R.par_offset, ROFFSUM, indent=depth)
+                            log("debug", "IN WHILE: CURSEP += R.offset: %s", R.par_offset, indent=depth)
+                            log("debug", "IN WHILE: R -> %s", R.right_child(), indent=depth)
                         R = R.right_child()
 
-                self.model.log("debug", "WHILE TERMINATED", indent=depth)
-
                 # set the offset in T and include it in
                 # accumulated offsets for L and R
                 T.par_offset = (ROOTSEP + 1) // 2
-                self.model.log("debug", "SETTING %s.par_offset = (ROOTSEP: %s + 1) // 2" % (T, ROOTSEP),
-                         indent=depth)
-                self.model.log("debug", "SETTING %s.par_offset = %s" % (T, T.par_offset),
-                         indent=depth)
-
-                self.model.log("debug", "CURRENT ROOTSEP = %s" % ROOTSEP, indent=depth)
 
                 LOFFSUM -= T.par_offset
                 ROFFSUM += T.par_offset
-                self.model.log("debug", "LOFFSUM -= %s; NOW = %s" % (T.par_offset, LOFFSUM), indent=depth)
-                self.model.log("debug", "ROFFSUM += %s; NOW = %s" % (T.par_offset, ROFFSUM), indent=depth)
-
+                if trace:
+                    log("debug", "WHILE TERMINATED", indent=depth)
+                    log("debug", "SETTING %s.par_offset = (ROOTSEP: %s + 1) // 2", T, ROOTSEP, indent=depth)
+                    log("debug", "SETTING %s.par_offset = %s", T, T.par_offset, indent=depth)
+                    log("debug", "CURRENT ROOTSEP = %s", ROOTSEP, indent=depth)
+                    log("debug", "LOFFSUM -= %s; NOW = %s", T.par_offset, LOFFSUM, indent=depth)
+                    log("debug", "ROFFSUM += %s; NOW = %s", T.par_offset, ROFFSUM, indent=depth)
+                    log("debug", "UPDATING EXTREME DESCENDANTS", indent=depth)
 
-                self.model.log("debug", "UPDATING EXTREME DESCENDANTS", indent=depth)
                 # update extreme descendants information
                 if T.left_child() is None or ((RL and LL) and RL.depth > LL.depth):
                     lmost = RL
                     lmost.root_offset += T.par_offset
-                    self.model.log("debug", "%s.root_offset += T.par: %s; NOW = %s" % (lmost, T.par_offset, lmost.root_offset),
-                             indent=depth)
+                    if trace:
+                        log("debug", "%s.root_offset += T.par: %s; NOW = %s", lmost, T.par_offset, lmost.root_offset,
+                            indent=depth)
                 else:
                     lmost = LL
 
@@ -316,17 +470,20 @@ class RenderTree(RenderObject):
                     # leaf nodes (where rmost and lmost are the same node)
                     if lmost is not rmost:
                         lmost.root_offset -= T.par_offset
-                        self.model.log("debug", "%s.root_offset -= T.par: %s; NOW = %s" % (lmost, T.par_offset, lmost.root_offset),
-                                 indent=depth)
+                        if trace:
+                            log("debug", "%s.root_offset -= T.par: %s; NOW = %s", lmost, T.par_offset,
+                                lmost.root_offset, indent=depth)
 
-                self.model.log("debug", "lmost = %s" % lmost, indent=depth)
+                if trace:
+                    log("debug", "lmost = %s", lmost, indent=depth)
 
                 # if LR and RR:
                 if T.right_child() is None or ((LR and RR) and LR.depth > RR.depth):
                     rmost = LR
                     rmost.root_offset -= T.par_offset
-                    self.model.log("debug", "%s.root_offset -= T.par: %s; NOW = %s" % (rmost, T.par_offset, rmost.root_offset),
-                             indent=depth)
+                    if trace:
+                        log("debug", "%s.root_offset -= T.par: %s; NOW = %s", rmost, T.par_offset, rmost.root_offset,
+                            indent=depth)
                 else:
                     rmost = RR
 
@@ -334,15 +491,17 @@ class RenderTree(RenderObject):
                     # leaf nodes (where rmost and lmost are the same node)
                     if lmost is not rmost:
                         rmost.root_offset += T.par_offset
-                        self.model.log("debug", "%s.root_offset += T.par: %s; NOW = %s" % (rmost, T.par_offset, rmost.root_offset),
-                                 indent=depth)
-                self.model.log("debug", "rmost = %s" % rmost, indent=depth)
+                        if trace:
+                            log("debug", "%s.root_offset += T.par: %s; NOW = %s", rmost, T.par_offset,
+                                rmost.root_offset, indent=depth)
 
+                if trace:
+                    log("debug", "rmost = %s", rmost, indent=depth)
+                    log("debug", "PRE-THREADING: LL = %s, RR = %s, T.par_offset = %s", LL, RR, T.par_offset,
+                        indent=depth)
+                    log("debug", "PRE-THREADING: L = %s, R = %s, LOFFSUM = %s, ROFFSUM = %s", L, R, LOFFSUM, ROFFSUM,
+                        indent=depth)
 
-                self.model.log("debug", "PRE-THREADING: LL = %s, RR = %s, T.par_offset = %s" % (LL, RR, T.par_offset)
-                         , indent=depth)
-                self.model.log("debug", "PRE-THREADING: L = %s, R = %s, LOFFSUM = %s, ROFFSUM = %s" % (L, R, LOFFSUM, ROFFSUM),
-                         indent=depth)
                 # if subtrees of T have different heights,
                 # check if threading necessary - at most 1 thread
                 # will be inserted
@@ -350,12 +509,11 @@ class RenderTree(RenderObject):
                     # create a thread
                     RR.has_thread = True
                     RR.par_offset = abs((RR.root_offset + T.par_offset) - LOFFSUM)
-                    self.model.log("debug", "RR.par_offset =  abs((RR.root_offset: %s + T.par_offset) - LOFFSUM)"
-                             % RR.root_offset
-                             ,indent=depth)
-                    self.model.log("debug", "SETTING %s.par_offset = %s" % (RR, RR.par_offset),
-                             indent=depth)
-                    self.model.log("debug", "THREADING (L) %s to %s" % (RR, L), indent=depth)
+                    if trace:
+                        log("debug", "RR.par_offset =  abs((RR.root_offset: %s + T.par_offset) - LOFFSUM)",
+                            RR.root_offset, indent=depth)
+                        log("debug", "SETTING %s.par_offset = %s", RR, RR.par_offset, indent=depth)
+                        log("debug", "THREADING (L) %s to %s", RR, L, indent=depth)
                     if LOFFSUM - T.par_offset <= RR.root_offset:
                         RR.set_left(L)
                     else:
@@ -365,24 +523,25 @@ class RenderTree(RenderObject):
                     # create a thread
                     LL.has_thread = True
                     LL.par_offset = abs((LL.root_offset - T.par_offset) - ROFFSUM)
-                    self.model.log("debug", "LL.par_offset = abs((LL.root_offset: %s - T.par_offset) - ROFFSUM)"
-                             % LL.root_offset
-                             , indent=depth)
-                    self.model.log("debug", "SETTING %s.par_offset = %s" % (LL, LL.par_offset),
-                             indent=depth)
-
-                    self.model.log("debug", "THREADING (R) %s to %s" % (LL, R), indent=depth)
+                    if trace:
+                        log("debug", "LL.par_offset = abs((LL.root_offset: %s - T.par_offset) - ROFFSUM)",
+                            LL.root_offset, indent=depth)
+                        log("debug", "SETTING %s.par_offset = %s", LL, LL.par_offset, indent=depth)
+                        log("debug", "THREADING (R) %s to %s", LL, R, indent=depth)
                     if ROFFSUM + T.par_offset >= LL.root_offset:
                         LL.set_right(R)
                     else:
                         LL.set_left(R)
-                self.model.log("debug", "DONE THREADING", indent=depth)
+
+                if trace:
+                    log("debug", "DONE THREADING", indent=depth)
 
     def petrify_tr(self):
         """Wrapper function for petrify method in
             Reingold-Tilford algorithm -- assigns
             absolute coordinates after setup_tr has
             determined relative placements"""
+        self.trace = self.model.log_enabled("debug")
         self._petrify_tr(self.tree.root, 0)
 
     def _petrify_tr(self, T, x):
@@ -391,7 +550,8 @@ class RenderTree(RenderObject):
             removes all 'threads' created from setup"""
 
         if T:
-            self.model.log("debug", "IN PETRIFY: T = %s, offset = %s" % (T, T.par_offset))
+            if self.trace:
+                self.model.log("debug", "IN PETRIFY: T = %s, offset = %s", T, T.par_offset)
             T.x = x
             if T.has_thread:
                 T.has_thread = False
@@ -421,6 +581,13 @@ class RenderGraph(RenderObject):
         # flag to keep one simulation thread going at a time
         self.simulating = False
 
+        # structure key of graph being simulated, layout
+        # gets cached under it once simulation finishes
+        self._simulated_key = None
+
+        # pan/zoom, applied on top of fitting layout to the canvas
+        self.camera = Camera(canvas, self.tag, lambda: self.display(do_render=False))
+
     def display(self, do_render=True, do_sleep=False):
         """Renders data structure (preprocess),
             clears canvas, and draws to canvas
@@ -431,13 +598,14 @@ class RenderGraph(RenderObject):
             return
 
         if do_render:
-            self.render()
+            self.phase("render", self.render)
 
         # determine node sizes
-        self.preprocess()
+        self.phase("preprocess", self.preprocess)
 
-        self.clear_canvas()
-        self.draw_on_canvas()
+        self.phase("clear_canvas", self.clear_canvas)
+        self.phase("draw_on_canvas", self.draw_on_canvas, count_items=True)
+        self.raise_annotations()
 
         if do_sleep:
             sleep(self.tick)
@@ -467,17 +635,19 @@ class RenderGraph(RenderObject):
         width = self.canvas.width
         height = self.canvas.height
 
-        self.cell_w = width / (self.max_x - self.min_x + 1)
-        self.cell_h = height / (self.max_y - self.min_y + 1)
+        self.cell_w = width / (self.max_x - self.min_x + 1) * self.camera.zoom
+        self.cell_h = height / (self.max_y - self.min_y + 1) * self.camera.zoom
 
-        self.model.logger.debug("cell size set; width: %s, height: %s" % (self.cell_w, self.cell_h))
+        self.model.logger.debug("cell size set; width: %s, height: %s", self.cell_w, self.cell_h)
 
     def draw_on_canvas(self, circle=False):
         """
         Draw graph to canvas, edges first so nodes cover them up.
         """
         # show name in top left corner
-        name = self.canvas.create_text(5, 5, text=self.name, anchor="nw", font=default_font())
+        font = self.canvas.default_font()
+        name = self.canvas.create_text(5, 5, text=self.name, anchor="nw", font=font,
+                                       tags=self.role_tag("title"))
         
 
         # if circle set to True, then
@@ -488,35 +658,89 @@ class RenderGraph(RenderObject):
             cell_w = self.cell_w
             cell_h = self.cell_h
 
+        if self.lod is not None and self.lod.active(cell_w, cell_h):
+            self.draw_lod(cell_w, cell_h)
+            return
+
+        cam_x, cam_y = self.camera.x, self.camera.y
+        width, height = self.canvas.width, self.canvas.height
+        in_view = self.lod.in_view if self.lod is not None else lambda *box: True
+
         # draw edges first
         for u, v in self.graph.edges:
-            x0 = u.x * cell_w
-            y0 = u.y * cell_h
-            x1 = v.x * cell_w
-            y1 = v.y * cell_h
+            x0 = u.x * cell_w + cam_x
+            y0 = u.y * cell_h + cam_y
+            x1 = v.x * cell_w + cam_x
+            y1 = v.y * cell_h + cam_y
             center_offsets = [cell_w / 2, cell_h / 2] * 2
 
             pts = [x0, y0, x1, y1]
             centers = [pt + off for pt, off in zip(pts, center_offsets)]
+            if not in_view(*centers, width, height):
+                continue
 
             color = "black"
-            edge = self.canvas.create_line(*centers, fill=color, width=2)
+            edge = self.canvas.create_line(*centers, fill=color, width=2, tags=self.tags("edge"))
             
         for node in self.graph.nodes:
-            x0 = node.x * cell_w
-            y0 = node.y * cell_h
+            x0 = node.x * cell_w + cam_x
+            y0 = node.y * cell_h + cam_y
+            if not in_view(x0, y0, x0 + cell_w, y0 + cell_h, width, height):
+                continue
 
             # draw nodes at 50% size as to not block
             # drawing of edges
             x0_n, y0_n = [x0 + 4 * cell_w / 10, y0 + 4 * cell_h / 10]
 
-            node.tk_id = self.canvas.create_oval(x0_n, y0_n, x0_n + 2 * cell_w / 10, y0_n + 2 * cell_h / 10, fill=node.color)
+            node.tk_id = self.canvas.create_oval(x0_n, y0_n, x0_n + 2 * cell_w / 10, y0_n + 2 * cell_h / 10, fill=node.color,
+                                              tags=self.tags("node"))
             
 
             node_text = node.value
             val_text = self.canvas.create_text(x0 + cell_w / 2, y0 + cell_h / 2,
-                                    text=node_text, font=default_font())
+                                    text=node_text, font=font, tags=self.tags("label"))
+
+
+    def draw_lod(self, cell_w, cell_h):
+        """
+        Draw graph with reduced detail (see LODPolicy): no labels,
+        nodes as points at most one per pixel, one line per pair of
+        end pixels and nothing outside the canvas.
+        """
+        policy = self.lod
+        width, height = self.canvas.width, self.canvas.height
+        cam_x, cam_y = self.camera.x, self.camera.y
+        points = policy.as_points(cell_w, cell_h)
+
+        def center(node):
+            return (node.x + .5) * cell_w + cam_x, (node.y + .5) * cell_h + cam_y
 
+        drawn_edges = set()
+        for u, v in self.graph.edges:
+            (x_0, y_0), (x_1, y_1) = center(u), center(v)
+            pixels = (int(x_0), int(y_0), int(x_1), int(y_1))
+            if pixels in drawn_edges or not policy.in_view(x_0, y_0, x_1, y_1, width, height):
+                continue
+            drawn_edges.add(pixels)
+            self.canvas.create_line(x_0, y_0, x_1, y_1, fill="black", tags=self.tags("edge"))
+
+        drawn = set()
+        for node in self.graph.nodes:
+            x, y = center(node)
+            if not policy.in_view(x, y, x, y, width, height):
+                continue
+            if points:
+                pixel = (int(x), int(y))
+                if pixel in drawn:
+                    continue
+                drawn.add(pixel)
+                self.canvas.create_rectangle(x - 1, y - 1, x + 1, y + 1,
+                                             fill=lod.point_color(node.color), outline="",
+                                             tags=self.tags("node"))
+            else:
+                self.canvas.create_oval(x - cell_w / 10, y - cell_h / 10,
+                                        x + cell_w / 10, y + cell_h / 10, fill=node.color,
+                                        tags=self.tags("node"))
 
     def move_nodes(self):
 
@@ -632,7 +856,18 @@ class RenderGraph(RenderObject):
         can be displayed while other tasks go on.
 
         (modeled after Fruchterman and Reingold algorithm)
+
+        If this topology has been simulated before, the cached
+        coordinates are reused and no simulation is started.
         """
+        key = self.graph.structure_key()
+
+        layout = self.layout_cache.get(key)
+        if layout is not None:
+            for node, (x, y) in zip(self.graph.nodes, layout):
+                node.x = x
+                node.y = y
+            return
 
         n = len(self.graph.nodes)
         # randomly initialize node placement
@@ -647,12 +882,32 @@ class RenderGraph(RenderObject):
         # # move in each iteration
         self.temp = .03
 
+        # without a display there is nothing to show
+        # while simulating, so finish layout right away
+        if getattr(self.canvas, "headless", False):
+            self._simulated_key = key
+            for _ in range(iterations):
+                self.move_nodes()
+            self.cache_layout()
+            return
+
         # create a new thread to handle moving nodes with
         # simulated forces of attraction/repulsion
         if not self.simulating:
+            self._simulated_key = key
             simulation_thread = GraphSimThread(n_iter=iterations, render=self)
             simulation_thread.start()
 
+    def cache_layout(self):
+        """
+        Called once simulation finishes. Layout is only cached if
+        the graph wasn't modified while the simulation was running.
+        """
+        key = self._simulated_key
+        self._simulated_key = None
+        if key is not None and key == self.graph.structure_key():
+            self.layout_cache.put(key, [(v.x, v.y) for v in self.graph.nodes])
+
 
 class RenderArray(RenderObject):
     def __init__(self, model, canvas, name=None):
@@ -667,6 +922,36 @@ class RenderArray(RenderObject):
 
         self.tick = 0.02
 
+        # viewport: index of first visible cell, zoom relative
+        # to default cell size and number of cells drawn past
+        # either edge of the viewport
+        self.offset = 0
+        self.zoom = 1.0
+        self.overscan = 2
+        self.visible = 0
+
+        # canvas items of drawn cells ([rect, value, index] per cell)
+        # reused when scrolling
+        self._slots = []
+        self._position_id = None
+
+        # optional line of text shown under the name (e.g. sort progress)
+        self.status = None
+
+        # canvas font, looked up once per frame in preprocess
+        self.font = None
+
+        # id of redraw scheduled after the canvas was resized
+        self._resize_pending = None
+        self.resize_delay = 120
+
+        if canvas is not None:
+            canvas.bind("<MouseWheel>", self.on_mouse_wheel, add="+")
+            canvas.bind("<Button-4>", self.on_mouse_wheel, add="+")
+            canvas.bind("<Button-5>", self.on_mouse_wheel, add="+")
+            # cells are sized from the canvas, so redraw once resizing stops
+            canvas.bind("<Configure>", lambda event: self.schedule_resize(), add="+")
+
     def display(self, do_render=True, do_sleep=False):
         """Renders data structure (preprocess),
             clears canvas, and draws to canvas
@@ -678,13 +963,14 @@ class RenderArray(RenderObject):
             return
 
         if do_render:
-            self.render()
+            self.phase("render", self.render)
 
         # determine node sizes
-        self.preprocess()
+        self.phase("preprocess", self.preprocess)
 
-        self.clear_canvas()
-        self.draw_on_canvas()
+        self.phase("clear_canvas", self.clear_canvas)
+        self.phase("draw_on_canvas", self.draw_on_canvas, count_items=True)
+        self.raise_annotations()
 
         if do_sleep:
             self.canvas.update()
@@ -695,131 +981,241 @@ class RenderArray(RenderObject):
         Determine the size of each cell in the array.
         Leave some room on either side between edge of canvas
         and edge of array.
+
+        Cells are never made narrower than a 3 digit value (unless
+        zoomed out). Arrays that don't fit are shown through
+        a scrollable viewport starting at self.offset.
         """
         # give 1/25 space on either edge of canvas
         self.side_space = self.canvas.width / 25
+        view_w = self.canvas.width - self.side_space * 2
 
-        self.cell_w = (self.canvas.width - self.side_space * 2) / len(self.array)
         self.cell_h = self.canvas.height / 4
+        self.font = self.canvas.default_font()
 
-        # check if values will fit inside cell nicely
-        if default_font().measure("000") > self.cell_w or self._force_compress:
+        if self._force_compress:
             # resize cells and only draw ends of array
             num_shown = min(3, self.array.size // 2)
 
             # denominator = num_shown * 2 + size of (...) (2)
-            self.cell_w = (self.canvas.width - self.side_space * 2) / (num_shown * 2 + 2)
-            self.cell_h = self.canvas.height / 4
+            self.cell_w = view_w / (num_shown * 2 + 2)
             self._compressed = True
         else:
+            min_w = self.font.measure("000")
+            self.cell_w = max(view_w / len(self.array), min_w) * self.zoom
             self._compressed = False
 
         self.cell_w = self.cell_h = min(self.cell_w, self.cell_h)
 
+        # keep viewport inside the array
+        self.visible = max(1, int(view_w // self.cell_w))
+        self.offset = max(0, min(self.offset, len(self.array) - self.visible))
+
     def render(self):
         """
         No algorithmic placement of coordinates needed for arrays.
         """
         pass
 
+    def window(self):
+        """
+        Range of indices to draw: visible cells plus overscan.
+        """
+        first = max(0, self.offset - self.overscan)
+        last = min(len(self.array), self.offset + self.visible + self.overscan)
+        return first, last
+
+    def is_drawn(self, index):
+        """
+        True if cell at index currently has canvas items.
+        """
+        if self._compressed:
+            num_shown = min(3, self.array.size // 2)
+            return index < num_shown or index >= len(self.array) - num_shown
+        first, last = self.window()
+        return first <= index < last
+
     def draw_on_canvas(self):
         """
-        Draw array from left to right at center of canvas.
+        Draw visible part of array from left to right at center of canvas.
         """
         # show name in top left corner
-        name = self.canvas.create_text(5, 5, text=self.name, anchor="nw", font=default_font())
-
-        # draw entire array
-        if not self._compressed:
-            for index, arr_node in enumerate(self.array):
-                # draw rectangles
-                x_0 = self.side_space + index * self.cell_w
-                y_0 = (self.canvas.height - self.cell_h) / 2
-                x_1 = x_0 + self.cell_w
-                y_1 = y_0 + self.cell_h
-
-                # tags used for animations
-                element_tag = self.name + "_" + str(index)
-
-                rect = self.canvas.create_rectangle(x_0, y_0, x_1, y_1, fill=arr_node.color,
-                                                    tag=element_tag)
-
-                # draw text for value
-                if not self._hide_values:
-                    val_text = self.canvas.create_text(x_0 + self.cell_w / 2, y_0 + self.cell_h / 2,
-                                            text=arr_node.value, font=default_font(), tag=element_tag)
-
-                # draw indices
-                if not self._hide_indices:
-                    ind = self.canvas.create_text(x_0 + self.cell_w / 2, y_0 - self.cell_h / 2,
-                                                text=index, font=default_font())
+        name = self.canvas.create_text(5, 5, text=self.name, anchor="nw", font=self.font,
+                                       tags=self.role_tag("title"))
+        if self.status:
+            self.canvas.create_text(5, 25, text=self.status, anchor="nw", font=self.font,
+                                    tags=self.role_tag("title"))
+
+        if self._compressed:
+            self.draw_compressed()
+            return
+
+        first, last = self.window()
+        y_0 = (self.canvas.height - self.cell_h) / 2
+        self._slots = [self.draw_cell(index, self.side_space + (index - self.offset) * self.cell_w, y_0)
+                       for index in range(first, last)]
+
+        # show which part of the array is in view
+        self._position_id = None
+        if self.visible < len(self.array):
+            self._position_id = self.canvas.create_text(self.canvas.width - 5, 5, anchor="ne",
+                                                        text=self.position_text(), font=self.font,
+                                                        tags=self.role_tag("title"))
+
+    def draw_cell(self, index, x_0, y_0):
+        """
+        Draw rectangle, value and index for one cell.
+        Returns list of canvas ids [rect, value, index].
+        """
+        x_1 = x_0 + self.cell_w
+        y_1 = y_0 + self.cell_h
+
+        # tags used for animations
+        element_tag = self.name + "_" + str(index)
+
+        rect = self.canvas.create_rectangle(x_0, y_0, x_1, y_1, fill=self.array.get_color(index),
+                                            tags=self.tags("node", element_tag))
+
+        # draw text for value
+        val_text = self.canvas.create_text(x_0 + self.cell_w / 2, y_0 + self.cell_h / 2,
+                                           text=self.array.get_value(index), font=self.font,
+                                           state=self.label_state("label"), tags=self.tags("label", element_tag))
+
+        # draw indices
+        ind = self.canvas.create_text(x_0 + self.cell_w / 2, y_0 - self.cell_h / 2,
+                                      text=index, font=self.font,
+                                      state=self.label_state("index"), tags=self.tags("index"))
+
+        return [rect, val_text, ind]
+
+    def draw_compressed(self):
+        """
+        Draw first 3 elements ... last 3 elements (or less if array is < 6)
+        """
+        num_shown = min(3, self.array.size // 2)
+        y_0 = (self.canvas.height - self.cell_h) / 2
+
+        # drawing first num_shown elements
+        for index in range(num_shown):
+            self.draw_cell(index, self.side_space + index * self.cell_w, y_0)
+
+        # draw ...
+        truncated_x_0 = self.side_space + num_shown * self.cell_w
+        truncated_y_0 = y_0
+        truncated_x_1 = truncated_x_0 + self.cell_w * 2
+        truncated_y_1 = truncated_y_0 + self.cell_h
+        tr = self.canvas.create_rectangle(truncated_x_0, truncated_y_0,
+                                          truncated_x_1, truncated_y_1, fill="white", tags=self.tags("node"))
+        # draw ... in array and for indices
+        tr1 = self.canvas.create_text(truncated_x_0 + self.cell_w, truncated_y_0 + self.cell_h/2,
+                                      text=" ... ", font=self.font,
+                                      state=self.label_state("label"), tags=self.tags("label"))
+        tr2 = self.canvas.create_text(truncated_x_0 + self.cell_w, truncated_y_0 - self.cell_h / 2,
+                                      text=" ... ", font=self.font,
+                                      state=self.label_state("index"), tags=self.tags("index"))
+
+        # draw last num_shown elements
+        for index in range(num_shown):
+            true_index = index + len(self.array) - num_shown
+            self.draw_cell(true_index, truncated_x_1 + index * self.cell_w, y_0)
+
+    def position_text(self):
+        last = min(len(self.array), self.offset + self.visible) - 1
+        return "[%s:%s] of %s" % (self.offset, last, len(self.array))
+
+    def scroll(self, cells):
+        """
+        Move viewport by some number of cells. If the same number
+        of cells stays drawn, existing canvas items are reused and only
+        their fill/text is updated, so scrolling is O(visible).
+        """
+        if self._compressed or not self._slots:
+            self.offset += cells
+            self.display(do_render=False)
+            return
+
+        old_offset = self.offset
+        old_first, old_last = self.window()
+        self.offset = max(0, min(self.offset + cells, len(self.array) - self.visible))
+        first, last = self.window()
+
+        if self.offset == old_offset:
+            return
+
+        if first - old_first != self.offset - old_offset or last - first != len(self._slots):
+            # window got clipped by either end of the array,
+            # so cells can't stay at the same positions
+            self.display(do_render=False)
+            return
+
+        for index, (rect, val_text, ind) in zip(range(first, last), self._slots):
+            element_tag = self.name + "_" + str(index)
+            self.canvas.itemconfigure(rect, fill=self.array.get_color(index), tags=self.tags("node", element_tag))
+            self.canvas.itemconfigure(val_text, text=self.array.get_value(index),
+                                      tags=self.tags("label", element_tag))
+            self.canvas.itemconfigure(ind, text=index)
+
+        if self._position_id is not None:
+            self.canvas.itemconfigure(self._position_id, text=self.position_text())
+
+    def label_state(self, role):
+        """
+        Canvas state of new value (role label) or index text
+        """
+        hidden = self._hide_values if role == "label" else self._hide_indices
+        return "hidden" if hidden else "normal"
+
+    def set_hidden(self, role, hidden):
+        """
+        Hide or show all values (role label) or indices
+        with one canvas call instead of redrawing
+        """
+        if role == "label":
+            self._hide_values = hidden
         else:
-            # draw first 3 elements ... last 3 elements (or less if array is < 6)
-            num_shown = min(3, self.array.size // 2)
-            
-            # drawing first num_shown elements
-            for index, arr_node in enumerate(self.array._array[:num_shown]):
-                # draw rectangles
-                x_0 = self.side_space + index * self.cell_w
-                y_0 = (self.canvas.height - self.cell_h) / 2
-                x_1 = x_0 + self.cell_w
-                y_1 = y_0 + self.cell_h
-
-                # tags used for animations
-                element_tag = self.name + "_" + str(index)
-
-                rect = self.canvas.create_rectangle(x_0, y_0, x_1, y_1, fill=arr_node.color,
-                                                    tag=element_tag)
-
-                # draw text for value
-                if not self._hide_values:
-                    val_text = self.canvas.create_text(x_0 + self.cell_w / 2, y_0 + self.cell_h / 2,
-                                            text=arr_node.value, font=default_font(), tag=element_tag)
-                    
-
-                # draw indices
-                if not self._hide_indices:
-                    ind = self.canvas.create_text(x_0 + self.cell_w / 2, y_0 - self.cell_h / 2,
-                                            text=index, font=default_font())
-                
-            # draw ...
-            truncated_x_0 = self.side_space + num_shown * self.cell_w
-            truncated_y_0 = (self.canvas.height - self.cell_h) / 2
-            truncated_x_1 = truncated_x_0 + self.cell_w * 2
-            truncated_y_1 = truncated_y_0 + self.cell_h
-            tr = self.canvas.create_rectangle(truncated_x_0, truncated_y_0,
-                                         truncated_x_1, truncated_y_1, fill="white")
-            # draw ... in array and for indices
-            if not self._hide_values:
-                tr1 = self.canvas.create_text(truncated_x_0 + self.cell_w, truncated_y_0 + self.cell_h/2,
-                                        text=" ... ", font=default_font())
-            if not self._hide_indices:
-                tr2 = self.canvas.create_text(truncated_x_0 + self.cell_w, truncated_y_0 - self.cell_h / 2,
-                                        text=" ... ", font=default_font())
-            
-            # draw last num_shown elements
-            for index, arr_node in enumerate(self.array._array[-num_shown:]):
-                # draw rectangles
-                x_0 = truncated_x_1 + index * self.cell_w
-                y_0 = (self.canvas.height - self.cell_h) / 2
-                x_1 = x_0 + self.cell_w
-                y_1 = y_0 + self.cell_h
-
-                true_index = index + len(self.array) - num_shown
-                # tags used for animations
-                element_tag = self.name + "_" + str(true_index)
-
-                rect = self.canvas.create_rectangle(x_0, y_0, x_1, y_1, fill=arr_node.color,
-                                                    tag=element_tag)
-
-                # draw text for value
-                if not self._hide_values:
-                    val_text = self.canvas.create_text(x_0 + self.cell_w / 2, y_0 + self.cell_h / 2,
-                                            text=arr_node.value, font=default_font(), tag=element_tag)
-                    
-
-                # draw indices
-                if not self._hide_indices:
-                    ind = self.canvas.create_text(x_0 + self.cell_w / 2, y_0 - self.cell_h / 2,
-                                            text=true_index, font=default_font())
+            self._hide_indices = hidden
+        self.canvas.itemconfigure(self.role_tag(role), state=self.label_state(role))
+
+    def scroll_to(self, index):
+        """
+        Scroll so that index is the first visible cell.
+        """
+        self.scroll(index - self.offset)
+
+    def set_zoom(self, zoom):
+        """
+        Change cell size relative to default, keeping
+        first visible cell the same.
+        """
+        self.zoom = max(0.05, min(zoom, 20))
+        self.display(do_render=False)
+
+    def schedule_resize(self):
+        """
+        Redraw for the new canvas size after resize_delay ms, postponing
+        any redraw already scheduled (same debounce as Camera).
+        Headless canvases have no event loop so they redraw immediately.
+        """
+        if self.canvas.headless:
+            self.display(do_render=False)
+            return
+        if self._resize_pending is not None:
+            self.canvas.after_cancel(self._resize_pending)
+        self._resize_pending = self.canvas.after(self.resize_delay, self.resized)
+
+    def resized(self):
+        self._resize_pending = None
+        self.display(do_render=False)
 
+    def on_mouse_wheel(self, event):
+        """
+        Scroll viewport with mouse wheel, zoom with Control + wheel.
+        """
+        # Button-4/5 on X11, delta on Windows/macOS
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+
+        if event.state & 0x4:
+            self.set_zoom(self.zoom * (1.25 if up else 0.8))
+        else:
+            step = max(1, self.visible // 10)
+            self.scroll(-step if up else step)
@@ -1,9 +1,7 @@
 import tkinter as tk
 from tkinter import Canvas, Button, Entry, font as tkfont
-from drawtools import default_font
+from drawtools import default_font, fonts, ANNOTATION_TAG
 from drawtools.annotations import Annotator
-from controller import drawcontrol as ctrl
-from command.bst_command import BSTInsertCommand, BSTRemoveCommand
 from collections import deque, defaultdict
 from textwrap import wrap
 from functools import partial
@@ -55,17 +53,41 @@ class Console(Canvas):
             self.text = str(text)
             self.is_command = is_command
 
+            # rows of last wrap and the width they were wrapped to
+            self._wrap_width = None
+            self._rows = None
+
         def __repr__(self):
             return self.text
 
-    def __init__(self, parent, console_input, **kwargs):
+        def rows(self, width):
+            """
+            Text broken into rows of at most width characters,
+            commands prefixed with >>. Cached until width changes.
+            """
+            if width != self._wrap_width:
+                rows = wrap(self.text, width)
+                if rows and self.is_command:
+                    rows[0] = ">> " + rows[0]
+                self._wrap_width = width
+                self._rows = rows
+            return self._rows
+
+    def __init__(self, parent, console_input, scrollback=5000, **kwargs):
+        """
+        :param scrollback: number of lines kept, oldest are dropped
+        """
         Canvas.__init__(self, parent, **kwargs)
         self.input = console_input
 
-        # used to keep track of all ConsoleLine objects
-        self.console_history = deque()
+        # used to keep track of all ConsoleLine objects (newest first)
+        self.console_history = deque(maxlen=scrollback)
         # used only to track command objects (for cycling with keys)
-        self.command_history = deque()
+        self.command_history = deque(maxlen=scrollback)
+
+        # canvas ids of drawn rows, bottom row first. Only
+        # rows that fit on the console are kept as items.
+        self._row_ids = deque()
 
         self.bind("<Configure>", self.on_resize)
         self.bind("<Button-1>", lambda ev: self.input.focus())
@@ -103,9 +125,6 @@ class Console(Canvas):
         nwidth = event.width
         nheight = event.height
         self.configure(width=nwidth, height=nheight)
-        wscale = float(event.width) / self.width
-        hscale = float(event.height) / self.height
-        self.scale("all", 0, 0, wscale, hscale)
         self.width = nwidth
         self.height = nheight
 
@@ -125,6 +144,9 @@ class Console(Canvas):
 
         self.font.configure(size=min(new_font_size_x, new_font_size_y))
 
+        # row spacing and number of visible rows changed
+        self.redraw()
+
     def reset_cycle(self):
         """Used to reset cycle when command is entered from
             using arrow key history."""
@@ -135,6 +157,7 @@ class Console(Canvas):
 
     def clear_console(self, event=None):
         self.delete("all")
+        self._row_ids.clear()
         # calling clear on deque, but command history still exists
         # for cycling with arrow keys
         self.console_history.clear()
@@ -174,6 +197,22 @@ class Console(Canvas):
         if is_command:
             self.command_history.appendleft(new_line)
         self.console_history.appendleft(new_line)
+        self.draw_line(new_line)
+
+    def add_lines(self, texts, is_command=False):
+        """
+        Add several lines at once. Only the rows left
+        visible afterwards are drawn.
+        """
+        if len(texts) == 1:
+            self.add_line(texts[0], is_command)
+            return
+
+        for text in texts:
+            new_line = Console.ConsoleLine(text, is_command)
+            if is_command:
+                self.command_history.appendleft(new_line)
+            self.console_history.appendleft(new_line)
         self.redraw()
 
     def last_line(self):
@@ -187,40 +226,64 @@ class Console(Canvas):
         super().update()
         self.redraw()
 
+    def row_spacing(self):
+        return self.font.measure("_") * 3
+
+    def row_x(self, row_index):
+        """
+        x of a row: wrapped rows are indented past the >>
+        """
+        if row_index > 0:
+            return self.font.measure(">>  ")
+        return self.font.measure("   " if self.seq_mode else " ")
+
+    def max_rows(self):
+        return self.winfo_height() // self.row_spacing() + 1
+
+    def draw_line(self, console_line):
+        """
+        Draw a new line at the bottom of the console, shifting rows
+        already drawn up and deleting the ones pushed off the top
+        """
+        rows = console_line.rows(self.chars_per_line - 5)
+        if not rows:
+            return
+
+        y_spacing = self.row_spacing()
+        y = self.winfo_height() - y_spacing
+
+        self.move("all", 0, -len(rows) * y_spacing)
+        for row_index, row in enumerate(rows):
+            row_y = y - (len(rows) - 1 - row_index) * y_spacing
+            self._row_ids.appendleft(self.create_text(self.row_x(row_index), row_y,
+                                                      text=row, anchor="w", font=self.font))
+
+        max_rows = self.max_rows()
+        while len(self._row_ids) > max_rows:
+            self.delete(self._row_ids.pop())
+
     def redraw(self):
         """Delete previous contents of canvas and redraw
             command history with the top of the stack at
-            the bottom of the console"""
+            the bottom of the console, stopping once the
+            top of the console is reached"""
         self.delete("all")
+        self._row_ids.clear()
 
-        y_spacing = self.font.measure("_") * 3
+        y_spacing = self.row_spacing()
         y = self.winfo_height() - y_spacing
+        max_rows = self.max_rows()
+        width = self.chars_per_line - 5
 
         for console_line in self.console_history:
-            # grab text from console_line object
-            line_text = console_line.text
-
-            # break longer strings into line-sized chunks
-            line_wrapped = wrap(line_text, self.chars_per_line - 5)
-
             # lines have to be drawn in reverse since bottom of console
             # should be the end of the command
-            for line in reversed(line_wrapped):
-                if line == line_wrapped[0]:
-                    # show separator for each new command
-                    x = self.font.measure(" ")
-
-                    if self.seq_mode:
-                        x = self.font.measure("   ")
-
-                    # only show >> for commands
-                    if console_line.is_command:
-                        line = ">> " + line
-                else:
-                    # offset wrapped lines
-                    x = self.font.measure(">>  ")
-
-                self.create_text(x, y, text=line, anchor='w', font=self.font)
+            rows = console_line.rows(width)
+            for row_index in reversed(range(len(rows))):
+                if len(self._row_ids) >= max_rows:
+                    return
+                self._row_ids.append(self.create_text(self.row_x(row_index), y,
+                                                      text=rows[row_index], anchor="w", font=self.font))
                 y -= y_spacing
 
     def sequence_mode(self, mode):
@@ -234,6 +297,8 @@ class DrawCanvas(Canvas):
     with a binding to <Configure>. This is necessary
     to resize the objects within the canvas (tree, array, etc)
     """
+    headless = False
+
     def __init__(self, parent, **kwargs):
         Canvas.__init__(self, parent, **kwargs)
         self.parent = parent
@@ -246,15 +311,17 @@ class DrawCanvas(Canvas):
     def on_resize(self, event):
         """
         Function to automatically update
-        canvas width/height and scale its
-        components when it gets resized
+        canvas width/height when it gets resized.
+        Render objects redraw for the new size (see Camera
+        and RenderArray.schedule_resize), annotations have
+        nothing redrawing them so they are scaled.
         """
         nwidth = event.width
         nheight = event.height
+        wscale = float(nwidth) / self.width
+        hscale = float(nheight) / self.height
+        self.scale(ANNOTATION_TAG, 0, 0, wscale, hscale)
         self.configure(width=nwidth, height=nheight)
-        wscale = float(event.width) / self.width
-        hscale = float(event.height) / self.height
-        self.scale("all", 0, 0, wscale, hscale)
         self.width = nwidth
         self.height = nheight
 
@@ -268,6 +335,13 @@ class DrawCanvas(Canvas):
     def get_geometry(self):
         return self.relx, self.rely, self.relwidth, self.relheight
 
+    def default_font(self):
+        """
+        Shared font used by render objects drawing on this canvas
+        (see HeadlessCanvas for the version without Tk)
+        """
+        return fonts.registry.get(self)
+
     def get_annotation_mode(self):
         """
         Ask parent for annotation mode (will terminate at CompositeCanvas)
@@ -386,12 +460,6 @@ class DrawApp(tk.Frame):
 
     def set_logger(self, logger):
         self.logger = logger
-        self.clear_log()
-        self.logger.info("\n\n\t----- new run -----\n")
-
-    def clear_log(self):
-        with open("./logs/view_log.log", "w"):
-            pass
 
     def on_resize(self, event):
         """Updates width/height and redraws canvas on resize"""
@@ -451,8 +519,9 @@ class DrawApp(tk.Frame):
         # toggle console while console has focus or root window has focus
         self.bind_all("<Control-t>", self.toggle_console)
 
-        # undo with Control-z
+        # undo with Control-z, redo with Control-y
         self.bind_all("<Control-z>", self.control.process_undo)
+        self.bind_all("<Control-y>", self.control.process_redo)
 
     def clear_canvas(self):
         self.canvas.delete("all")
@@ -465,7 +534,7 @@ class DrawApp(tk.Frame):
         """
 
         command_text = self.console_input.get()
-        self.logger.info("'%s' entered into command prompt." % command_text)
+        self.logger.info("'%s' entered into command prompt.", command_text)
         self.console.clear_input()
 
         # reset arrow key cycle
@@ -0,0 +1,55 @@
+"""
+Command line entry point.
+
+    python -m dsdraw                            start the interactive app (same as main.py)
+    python -m dsdraw run script.ds              run commands from a file without a display
+    python -m dsdraw run script.ds --no-render  same, skipping drawing entirely
+    python -m dsdraw run script.ds --svg out/   write every shown structure as SVG at the end
+
+Scripts hold one console line per line: dsDraw commands or python code.
+A timing summary per command type is printed once the script is done.
+"""
+import argparse
+import os
+import sys
+
+
+def run(args):
+    from controller.headless import HeadlessControl
+
+    control = HeadlessControl(args.width, args.height, render=not args.no_render)
+    if args.script == "-":
+        control.run(sys.stdin)
+    else:
+        with open(args.script) as script:
+            control.run(script)
+
+    if args.svg:
+        os.makedirs(args.svg, exist_ok=True)
+        for name, render in control.my_renders.items():
+            render.canvas.write_svg(os.path.join(args.svg, name + ".svg"))
+
+    print(control.format_summary(), file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="dsdraw", description="Draw and animate data structures.")
+    actions = parser.add_subparsers(dest="action")
+
+    run_parser = actions.add_parser("run", help="run a script of commands without a display")
+    run_parser.add_argument("script", help="file with one command per line ('-' for stdin)")
+    run_parser.add_argument("--no-render", action="store_true", help="don't draw anything")
+    run_parser.add_argument("--svg", metavar="DIR", help="write shown structures as SVG files to DIR")
+    run_parser.add_argument("--width", type=int, default=800)
+    run_parser.add_argument("--height", type=int, default=600)
+
+    args = parser.parse_args(argv)
+    if args.action == "run":
+        run(args)
+    else:
+        import main as app
+        app.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,6 @@
+import time
+start = time.perf_counter()
+
 from controller import drawcontrol as dc
 from tkinter import Tk
 
@@ -14,8 +17,12 @@ def main():
     height = root.winfo_screenheight()
 
     d = dc.DrawControl(root, width, height)
+
+    # first idle callback runs once the window is drawn and
+    # the console takes input
+    d.view.after_idle(lambda: d.logger.info("started in %.3f s", time.perf_counter() - start))
     d.view.mainloop()
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,158 @@
+import unittest
+from drawtools.animation import Tween, Parallel, Timeline
+
+
+class RecordingCanvas(object):
+    """
+    Keeps track of total movement per tag
+    and callbacks scheduled with after()
+    """
+    def __init__(self):
+        self.offsets = {}
+        self.callbacks = []
+
+    def move(self, tag, dx, dy):
+        x, y = self.offsets.get(tag, (0, 0))
+        self.offsets[tag] = (x + dx, y + dy)
+
+    def after(self, ms, callback):
+        self.callbacks.append(callback)
+
+    def run_frames(self, n):
+        for _ in range(n):
+            if not self.callbacks:
+                return
+            self.callbacks.pop(0)()
+
+
+class TweenTest(unittest.TestCase):
+
+    def setUp(self):
+        self.canvas = RecordingCanvas()
+
+    def test_phases_sum(self):
+        tween = Tween(self.canvas, "a", [(0, -10, 1), (0, 0, 1), (30, 0, 2), (0, 10, 1)])
+        done = False
+        while not done:
+            done = tween.step(0.3)
+        x, y = self.canvas.offsets["a"]
+        self.assertAlmostEqual(x, 30)
+        self.assertAlmostEqual(y, 0)
+
+    def test_partial_progress(self):
+        tween = Tween(self.canvas, "a", [(10, 0, 1)])
+        self.assertFalse(tween.step(0.5))
+        self.assertAlmostEqual(self.canvas.offsets["a"][0], 5)
+
+    def test_finish_jumps_to_end(self):
+        tween = Parallel(Tween(self.canvas, "a", [(10, 0, 1)]), Tween(self.canvas, "b", [(0, 5, 3)]))
+        tween.finish()
+        self.assertEqual(self.canvas.offsets, {"a": (10, 0), "b": (0, 5)})
+
+
+class TimelineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.canvas = RecordingCanvas()
+        self.timeline = Timeline(self.canvas)
+        self.finished = []
+
+    def tween(self, tag, seconds=1.0):
+        return Tween(self.canvas, tag, [(10, 0, seconds)], on_done=lambda: self.finished.append(tag))
+
+    def test_add_returns_immediately(self):
+        self.timeline.add(self.tween("a"))
+        self.assertEqual(self.finished, [])
+        self.assertFalse(self.timeline.idle())
+
+    def test_instant_mode(self):
+        self.timeline.instant = True
+        self.timeline.add(self.tween("a"))
+        self.assertEqual(self.finished, ["a"])
+        self.assertEqual(self.canvas.offsets["a"], (10, 0))
+
+    def test_same_channel_is_queued(self):
+        # huge speed so each animation finishes within one frame
+        self.timeline.speed = 10 ** 6
+        self.timeline.add(self.tween("a"), channel="arr")
+        self.timeline.add(self.tween("b"), channel="arr")
+        self.assertEqual(self.timeline.pending("arr"), 2)
+
+        self.canvas.run_frames(1)
+        self.assertEqual(self.finished, ["a"])
+        self.canvas.run_frames(1)
+        self.assertEqual(self.finished, ["a", "b"])
+        self.assertTrue(self.timeline.idle())
+
+    def test_different_channels_run_together(self):
+        self.timeline.speed = 10 ** 6
+        self.timeline.add(self.tween("a"))
+        self.timeline.add(self.tween("b"))
+        self.canvas.run_frames(1)
+        self.assertEqual(sorted(self.finished), ["a", "b"])
+
+    def test_finish_all(self):
+        self.timeline.add(self.tween("a"), channel="arr")
+        self.timeline.add(self.tween("b"), channel="arr")
+        self.timeline.finish_all()
+        self.assertEqual(self.finished, ["a", "b"])
+        self.assertTrue(self.timeline.idle())
+
+
+class ArraySwapTimelineTest(unittest.TestCase):
+
+    def setUp(self):
+        import io
+        from controller.headless import HeadlessControl
+        self.control = HeadlessControl(out=io.StringIO())
+        self.control.run(["a = Array([10, 20, 30])", "show a"])
+        self.frames = RecordingCanvas()
+        self.control.timeline = Timeline(self.frames)
+        self.a = self.control.my_variables["a"]
+        self.canvas = self.control.my_renders["a"].canvas
+
+    def shown(self):
+        """
+        (x, value, color) of each cell, left to right
+        """
+        cells = []
+        for rect in self.canvas.find_all():
+            if self.canvas.type(rect) != "rectangle" or "node" not in " ".join(self.canvas.gettags(rect)):
+                continue
+            x0, y0, x1, y1 = self.canvas.coords(rect)
+            texts = [t for t in self.canvas.find_all() if self.canvas.type(t) == "text"
+                     and "label" in " ".join(self.canvas.gettags(t))
+                     and x0 < self.canvas.coords(t)[0] < x1 and y0 < self.canvas.coords(t)[1] < y1]
+            cells.append((x0, self.canvas.itemcget(texts[0], "text"), self.canvas.itemcget(rect, "fill")))
+        return [(value, color) for _, value, color in sorted(cells)]
+
+    def test_swap_then_color(self):
+        before = self.shown()
+        self.a.swap(0, 1)
+        self.a.color("red", 0)
+        self.assertEqual(self.shown(), before)
+
+        # partway through, cells are still moving from their old places
+        self.frames.run_frames(1)
+        self.assertEqual([value for value, _ in self.shown()], [10, 20, 30])
+
+        self.control.timeline.speed = 10 ** 6
+        self.frames.run_frames(10)
+        self.assertTrue(self.control.timeline.idle())
+        shown = self.shown()
+        self.assertEqual([value for value, _ in shown], [20, 10, 30])
+        self.assertEqual(shown[0][1], self.control.my_variables["_a"].get_color(0))
+        self.assertNotEqual(shown[0][1], before[0][1])
+
+    def test_swap_color_swap(self):
+        self.a.swap(0, 1)
+        self.a.color("red", 2)
+        self.a.swap(0, 1)
+        self.control.timeline.speed = 10 ** 6
+        self.frames.run_frames(10)
+        self.assertTrue(self.control.timeline.idle())
+        self.assertEqual([value for value, _ in self.shown()], [10, 20, 30])
+
+
+if __name__ == '__main__':
+    unittest.main()
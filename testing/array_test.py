@@ -0,0 +1,75 @@
+import unittest
+from datastructures import arrays
+
+
+class ArrayTest(unittest.TestCase):
+    """
+    Element interface shared by the array backends.
+    """
+    array_class = arrays.Array
+
+    def setUp(self):
+        self.array = self.array_class(range(10))
+
+    def test_values(self):
+        self.assertEqual(self.array.values(), list(range(10)))
+        self.assertEqual(len(self.array), 10)
+
+    def test_set_value(self):
+        self.array.set_value(3, 42)
+        self.assertEqual(self.array.get_value(3), 42)
+
+    def test_swap_moves_color_with_value(self):
+        self.array.set_color(0, "red")
+        self.array.swap(0, 9)
+        self.assertEqual(self.array.get_value(0), 9)
+        self.assertEqual(self.array.get_value(9), 0)
+        self.assertEqual(self.array.get_color(9), "red")
+        self.assertEqual(self.array.get_color(0), "white")
+
+    def test_color_range(self):
+        self.array.color_range("blue", 2, 5)
+        colors = [self.array.get_color(i) for i in range(10)]
+        self.assertEqual(colors, ["white"] * 2 + ["blue"] * 3 + ["white"] * 5)
+
+    def test_clone_is_independent(self):
+        clone = self.array.clone()
+        self.array.set_value(0, 100)
+        self.array.set_color(1, "red")
+        self.assertEqual(clone.get_value(0), 0)
+        self.assertEqual(clone.get_color(1), "white")
+
+        self.array.set_state(clone)
+        self.assertEqual(self.array.values(), list(range(10)))
+
+    def test_random_prebuild(self):
+        a = self.array_class(25)
+        self.assertEqual(len(a), 25)
+        self.assertTrue(all(0 <= a.get_value(i) < 100 for i in range(25)))
+
+    def test_iter_nodes(self):
+        self.assertEqual([node.value for node in self.array], self.array.values())
+        for node in self.array:
+            if node.value % 2:
+                node.color = "red"
+                node.value *= 10
+        self.assertEqual(self.array.values()[:4], [0, 10, 2, 30])
+        self.assertEqual(self.array.get_color(3), "red")
+        self.assertEqual(self.array.get_color(2), "white")
+
+
+class CompactArrayTest(ArrayTest):
+    array_class = arrays.CompactArray
+
+    def test_palette_reuse(self):
+        self.array.color_range("red", 0, 10)
+        self.array.set_color(3, "red")
+        self.assertEqual(len(self.array._palette), 2)
+
+    def test_float_typecode(self):
+        a = arrays.CompactArray([0.5, 1.5], typecode="d")
+        self.assertEqual(a.get_value(1), 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
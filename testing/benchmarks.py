@@ -0,0 +1,226 @@
+"""
+Micro benchmarks for dsDraw. Not collected by the test runner.
+
+    python -m testing.benchmarks            run all benchmarks
+    python -m testing.benchmarks array      run one benchmark by name
+"""
+import sys
+import time
+import random
+import tracemalloc
+
+
+def timed(func, *args):
+    """
+    Return (result, seconds) of calling func(*args)
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def traced(func, *args):
+    """
+    Return (result, seconds, peak bytes allocated) of calling func(*args)
+    """
+    tracemalloc.start()
+    try:
+        result, seconds = timed(func, *args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, seconds, peak
+
+
+def bench_array(n=10 ** 6, n_ops=10 ** 5):
+    """
+    Compare object-per-cell Array with CompactArray:
+    construction time/memory and throughput of element operations.
+    """
+    from datastructures.arrays import Array, CompactArray
+
+    indices = [(random.randrange(n), random.randrange(n)) for _ in range(n_ops)]
+
+    def mutate(a):
+        for i, j in indices:
+            a.set_value(i, a.get_value(j))
+            a.swap(i, j)
+        a.color_range("#e74c3c", 0, n // 2)
+
+    print("array: n=%s, %s get/set/swap ops" % (n, n_ops))
+    for array_class in (Array, CompactArray):
+        a, build_s, peak = traced(array_class, n)
+        _, ops_s = timed(mutate, a)
+        print("  %-12s build %.3fs  peak %7.1f MB  ops %.3fs"
+              % (array_class.__name__, build_s, peak / 2 ** 20, ops_s))
+
+
+def bench_render(frames=200):
+    """
+    Time draw paths in isolation by rendering frames to a HeadlessCanvas
+    (layout cached after the first frame).
+    """
+    from datastructures import tree, graph, arrays
+    from drawtools.render import RenderTree, RenderGraph, RenderArray
+    from drawtools.headless import HeadlessCanvas
+
+    cases = [(RenderTree, tree.BST(200)), (RenderGraph, graph.Graph(20)),
+             (RenderArray, arrays.CompactArray(10 ** 5))]
+
+    print("render: %s headless frames" % frames)
+    for render_class, model in cases:
+        canvas = HeadlessCanvas()
+        render = render_class(model, canvas, "bench")
+        render.display()
+
+        def draw():
+            for _ in range(frames):
+                render.display()
+
+        _, seconds = timed(draw)
+        print("  %-12s %7.1f frames/s  %5s items"
+              % (render_class.__name__, frames / seconds, len(canvas)))
+
+
+def bench_sequence(iterations=10 ** 4):
+    """
+    Time a for sequence compiled once against parsing and
+    compiling its lines again on every iteration.
+    """
+    import datastructures
+    from command.command_factory import ControlCommandFactory
+    from command.sequence import SequenceFactory
+    from controller.shell import EmbeddedShell
+
+    class Output(object):
+        def add_line(self, text, is_command=True):
+            pass
+
+        def add_lines(self, texts, is_command=False):
+            pass
+
+    class Control(object):
+        def __init__(self):
+            self.python_shell = EmbeddedShell(Output())
+            self.my_variables = self.python_shell.locals
+            self.my_renders = {}
+
+        def display(self, do_render=True, do_sleep=False):
+            pass
+
+    lines = ["total += i", "assign last $i"]
+    control = Control()
+    control.my_variables["total"] = 0
+
+    seq = SequenceFactory().create_sequence(control, "s", "for", "i", "range(%i)" % iterations)
+    for line in lines:
+        seq.add_command(line)
+
+    def reparsed():
+        variables = control.my_variables
+        for i in range(iterations):
+            variables["i"] = i
+            exec(compile(lines[0], "<console>", "exec"), variables)
+            spl = lines[1].split(" ")
+            ControlCommandFactory(control).create_command(spl[0], spl[1], variables[spl[2][1:]]).execute()
+
+    print("sequence: for loop of %s iterations, %s lines" % (iterations, len(lines)))
+    _, seconds = timed(reparsed)
+    print("  %-12s %.3fs" % ("reparsed", seconds))
+    _, seconds = timed(seq.execute)
+    print("  %-12s %.3fs" % ("compiled", seconds))
+
+
+def bench_logging(n=500, repeats=50):
+    """
+    Time Reingold-Tilford layout and BST inserts, both full of debug
+    log calls, with debug logging disabled (the default).
+    """
+    import random
+    from datastructures import tree
+    from drawtools.render import RenderTree
+    from drawtools.headless import HeadlessCanvas
+
+    bst = tree.BST(n)
+    render = RenderTree(bst, HeadlessCanvas(), "bench")
+    nodes = list(bst.root)
+
+    def layout():
+        for _ in range(repeats):
+            render.reingold_tilford(nodes)
+
+    values = random.sample(range(10 ** 6), n * 10)
+
+    def insert():
+        t = tree.BST()
+        for value in values:
+            t.insert(value)
+
+    print("logging: debug disabled, %s nodes" % n)
+    _, seconds = timed(layout)
+    print("  %-12s %7.2f ms/layout" % ("layout", seconds / repeats * 1000))
+    _, seconds = timed(insert)
+    print("  %-12s %7.2f us/insert" % ("insert", seconds / len(values) * 10 ** 6))
+
+
+# starts the headless app in a new interpreter, printing the seconds
+# until it takes its first command (the interactive app's first prompt)
+STARTUP_CODE = """
+import time
+start = time.perf_counter()
+from controller.headless import HeadlessControl
+HeadlessControl()
+print(time.perf_counter() - start)
+"""
+
+
+def cold_start(*python_args):
+    """
+    Run STARTUP_CODE in a fresh interpreter from the repo root,
+    returning (seconds to first prompt, stderr)
+    """
+    import os
+    import subprocess
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable] + list(python_args) + ["-c", STARTUP_CODE],
+                            cwd=root, capture_output=True, text=True, check=True)
+    return float(result.stdout.split()[-1]), result.stderr
+
+
+def bench_startup(runs=5, top=10):
+    """
+    Time cold starts and list the modules taking longest
+    to import (from python -X importtime)
+    """
+    seconds = [cold_start()[0] for _ in range(runs)]
+    print("startup: time to first prompt, best of %i" % runs)
+    print("  %-12s %.3fs" % ("headless", min(seconds)))
+
+    _, stderr = cold_start("-X", "importtime")
+    imports = []
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "self [us]" not in line:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            imports.append((int(self_us), int(cumulative_us), name.strip()))
+
+    print("  slowest imports (self / cumulative ms):")
+    for self_us, cumulative_us, name in sorted(imports, reverse=True)[:top]:
+        print("    %-32s %7.2f %7.2f" % (name, self_us / 1000, cumulative_us / 1000))
+
+
+BENCHMARKS = {
+    "array": bench_array,
+    "render": bench_render,
+    "sequence": bench_sequence,
+    "logging": bench_logging,
+    "startup": bench_startup,
+}
+
+
+def main(names):
+    for name in names or BENCHMARKS:
+        BENCHMARKS[name]()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,134 @@
+import unittest
+import random
+from datastructures import tree, graph, arrays
+from datastructures.history import Delta, Snapshot
+from drawtools import dsDraw_colors
+from testing.history_test import interactive
+from util.exceptions import InvalidCommandError
+
+
+class BulkBSTTest(unittest.TestCase):
+
+    def setUp(self):
+        self.model = tree.BST()
+        self.model.insert_many([50, 25, 75])
+        self.b = interactive(self.model)
+
+    def test_insert_many_is_one_delta(self):
+        before = self.model.structure_key()
+        values = random.sample(range(100, 1000), 200)
+        self.b.insert_many(values)
+
+        self.assertEqual(len(self.model), 203)
+        self.assertEqual(self.b._render.displays, 1)
+        self.assertIsInstance(self.b._history._undo[-1], Delta)
+
+        self.b.undo()
+        self.assertEqual(self.model.structure_key(), before)
+        self.b.redo()
+        self.assertEqual(len(self.model), 203)
+
+    def test_insert_many_duplicates_snapshot(self):
+        self.b.insert_many([10, 10, 50])
+        self.assertIsInstance(self.b._history._undo[-1], Snapshot)
+        self.assertEqual(len(self.model), 6)
+
+    def test_remove_many(self):
+        self.b.remove_many([25, 75])
+        self.assertEqual([n.value for n in self.model], [50])
+        self.b.undo()
+        self.assertEqual([n.value for n in self.model], [25, 50, 75])
+
+
+class BulkHeapTest(unittest.TestCase):
+
+    def check_heap(self, heap):
+        values = [node.value for node in heap.heap_array]
+        for i in range(1, len(values)):
+            self.assertLessEqual(values[(i - 1) // 2], values[i])
+
+    def test_insert_many(self):
+        for existing, added in [(0, 100), (500, 3), (20, 20)]:
+            heap = tree.BinaryHeap(existing)
+            keys = [random.randrange(1000) for _ in range(added)]
+            heap.insert_many(keys)
+            self.assertEqual(len(heap), existing + added)
+            self.check_heap(heap)
+
+    def test_interactive_undo(self):
+        model = tree.BinaryHeap(10)
+        h = interactive(model)
+        h.insert_many(range(-5, 0))
+        self.assertEqual(model.root.value, -5)
+        h.undo()
+        self.assertEqual(len(model), 10)
+
+    def test_interactive_empty_heap(self):
+        model = tree.BinaryHeap()
+        self.assertEqual(len(model), 0)
+        h = interactive(model)
+        h.insert_many(range(10))
+        h.insert(-1)
+        self.assertEqual((len(model), model.root.value), (11, -1))
+        self.check_heap(model)
+
+        h.undo()
+        h.undo()
+        self.assertEqual((len(model), model.root), (0, None))
+        self.assertEqual(model.snapshot_cost(), 0)
+
+
+class BulkGraphTest(unittest.TestCase):
+
+    def test_new_nodes_connect_many(self):
+        model = graph.Graph()
+        g = interactive(model)
+        g.new_nodes(range(5))
+        g.connect_many([(0, 1), (1, 2), (model.nodes[3], 4)])
+        self.assertEqual(len(model.edges), 3)
+        self.assertEqual(g._render.displays, 2)
+
+        g.undo()
+        self.assertEqual(model.edges, [])
+        g.undo()
+        self.assertEqual(model.nodes, [])
+        g.redo()
+        g.redo()
+        self.assertEqual(model.structure_key(), (tuple(range(5)), ((0, 1), (1, 2), (3, 4))))
+
+    def test_connect_many_checks_first(self):
+        model = graph.Graph()
+        g = interactive(model)
+        g.new_nodes([1, 2])
+        self.assertRaises(Exception, g.connect_many, [(1, 2), (1, 3)])
+        self.assertRaises(Exception, g.connect_many, [(1, 2), (2, 1)])
+        self.assertEqual(model.edges, [])
+
+
+class BulkArrayTest(unittest.TestCase):
+
+    def test_color_many(self):
+        model = arrays.CompactArray(range(10))
+        a = interactive(model)
+        a.color("red", 4)
+        a.color_many("green", [0, (2, 5), (4, 6)])
+        self.assertEqual(len(a._history), 2)
+
+        a.undo()
+        self.assertEqual(model.get_color(4), dsDraw_colors["red"])
+        self.assertEqual(model.get_color(0), "white")
+        self.assertEqual(model.get_color(5), "white")
+
+    def test_color_many_list_ranges(self):
+        model = arrays.Array(range(10))
+        a = interactive(model)
+        a.color_many("red", [[0, 1], 3, [7, 9]])
+        red = dsDraw_colors["red"]
+        self.assertEqual([i for i in range(10) if model.get_color(i) == red], [0, 1, 3, 7, 8, 9])
+
+        a.undo()
+        self.assertRaises(InvalidCommandError, a.color_many, "red", [[0, 1], [8, 10]])
+        self.assertRaises(InvalidCommandError, a.color_many, "red", [[0, 1, 2]])
+        self.assertRaises(InvalidCommandError, a.color_many, "red", [-1])
+        self.assertEqual([model.get_color(i) for i in range(10)], ["white"] * 10)
+        self.assertEqual(len(a._history), 0)
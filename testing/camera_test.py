@@ -0,0 +1,109 @@
+import unittest
+import random
+from datastructures import tree, graph
+from drawtools.render import RenderTree, RenderGraph
+from drawtools.headless import HeadlessCanvas
+from drawtools.lod import LODPolicy
+
+
+def random_bst(n):
+    t = tree.BST()
+    values = list(range(n))
+    random.shuffle(values)
+    t.insert_many(values)
+    return t
+
+
+def ovals(canvas):
+    return [canvas.coords(i) for i in canvas.find_all() if canvas.type(i) == "oval"]
+
+
+class CameraTest(unittest.TestCase):
+
+    def setUp(self):
+        self.render = RenderTree(random_bst(100), HeadlessCanvas(800, 600), "t")
+        self.render.lod = LODPolicy(label_px=0, point_px=0, summary_px=0)
+        self.render.display()
+
+    def test_pan_keeps_layout(self):
+        before = sorted(ovals(self.render.canvas))
+        layout = [(n.x, n.y) for n in self.render.tree]
+
+        self.render.camera.pan(0, 10)
+        after = sorted(ovals(self.render.canvas))
+        self.assertEqual([(n.x, n.y) for n in self.render.tree], layout)
+        for moved, original in zip(after, before):
+            self.assertEqual(moved[0::2], original[0::2])
+            self.assertEqual([round(y - 10, 6) for y in moved[1::2]], [round(y, 6) for y in original[1::2]])
+
+        # title stays in the corner
+        title = self.render.canvas.find_all()[0]
+        self.assertEqual(self.render.canvas.coords(title), [5, 5])
+
+    def test_zoom_culls(self):
+        self.assertEqual(len(ovals(self.render.canvas)), 100)
+
+        self.render.camera.zoom_at(2, 400, 300)
+        self.assertLess(len(ovals(self.render.canvas)), 100)
+        self.assertGreater(len(ovals(self.render.canvas)), 0)
+
+        self.render.camera.reset()
+        self.assertEqual(len(ovals(self.render.canvas)), 100)
+
+    def test_zoom_about_point(self):
+        camera = self.render.camera
+        camera.zoom_at(2, 100, 50)
+        self.assertEqual((camera.zoom, camera.x, camera.y), (2, -100, -50))
+
+        camera.zoom_at(10 ** 6, 0, 0)
+        self.assertEqual(camera.zoom, camera.max_zoom)
+
+    def test_graph_pan(self):
+        g = graph.Graph()
+        nodes = g.new_nodes(range(3))
+        g.connect_many([(nodes[0], nodes[1]), (nodes[1], nodes[2])])
+        for i, node in enumerate(nodes):
+            node.x, node.y = i, i
+
+        render = RenderGraph(g, HeadlessCanvas(300, 300), "g")
+        render.layout_cache.put(g.structure_key(), [(n.x, n.y) for n in nodes])
+        render.display()
+        before = ovals(render.canvas)
+
+        render.camera.pan(-150, 0)
+        after = ovals(render.canvas)
+        self.assertEqual(len(after), 2)
+        self.assertEqual(after[0][0], before[1][0] - 150)
+
+
+class ArrayViewTest(unittest.TestCase):
+
+    def test_array_pan_and_reset(self):
+        import io
+        from controller.headless import HeadlessControl
+        control = HeadlessControl(out=io.StringIO())
+        control.run(["a = Array(500)", "show a"])
+        a, render = control.my_variables["a"], control.my_renders["a"]
+        self.assertFalse(hasattr(render, "camera"))
+
+        a.zoom(2)
+        a.pan(render.cell_w * 3, 10)
+        self.assertEqual(render.offset, 3)
+        a.pan(-render.cell_w, 0)
+        self.assertEqual(render.offset, 2)
+
+        a.reset_view()
+        self.assertEqual((render.offset, render.zoom), (0, 1.0))
+
+    def test_array_redraws_on_resize(self):
+        from datastructures.arrays import Array
+        from drawtools.render import RenderArray
+        render = RenderArray(Array(8), HeadlessCanvas(800, 600), "a")
+        render.display()
+        cell_w = render.cell_w
+
+        render.canvas.width, render.canvas.height = 400, 300
+        render.schedule_resize()
+        self.assertAlmostEqual(render.cell_w, cell_w / 2)
+        rects = [i for i in render.canvas.find_all() if render.canvas.type(i) == "rectangle"]
+        self.assertTrue(all(render.canvas.coords(i)[2] <= 400 for i in rects))
@@ -0,0 +1,78 @@
+import unittest
+from unittest import mock
+from tkinter import Canvas
+import datastructures
+from drawtools.view import Console
+from drawtools.headless import HeadlessCanvas, HeadlessFont
+
+
+class FakeParent(object):
+    mono_font = HeadlessFont()
+
+
+class HeadlessConsole(Console):
+    """Console drawing to a HeadlessCanvas instead of Tk"""
+    def __init__(self, height, scrollback):
+        self.canvas = HeadlessCanvas(200, height)
+        with mock.patch.object(Canvas, "__init__", lambda *args, **kwargs: None):
+            super().__init__(FakeParent(), None, scrollback=scrollback)
+
+    def bind(self, *args):
+        pass
+
+    def winfo_reqwidth(self):
+        return self.canvas.width
+
+    def winfo_reqheight(self):
+        return self.canvas.height
+
+    winfo_height = winfo_reqheight
+
+    def create_text(self, *args, **options):
+        return self.canvas.create_text(*args, **options)
+
+    def move(self, *args):
+        self.canvas.move(*args)
+
+    def delete(self, *args):
+        self.canvas.delete(*args)
+
+
+class ConsoleTest(unittest.TestCase):
+
+    def setUp(self):
+        self.console = HeadlessConsole(height=240, scrollback=50)
+        self.spacing = self.console.row_spacing()
+
+    def test_rows_cached(self):
+        line = Console.ConsoleLine("word " * 20, is_command=True)
+        rows = line.rows(30)
+        self.assertTrue(rows[0].startswith(">> "))
+        self.assertIs(line.rows(30), rows)
+        self.assertIsNot(line.rows(20), rows)
+        self.assertEqual(Console.ConsoleLine("\n", False).rows(30), [])
+
+    def test_only_visible_rows_drawn(self):
+        for i in range(200):
+            self.console.add_line(i, is_command=False)
+
+        self.assertEqual(len(self.console.console_history), 50)
+        self.assertEqual(len(self.console.canvas), self.console.max_rows())
+
+        # newest line at the bottom, older lines above it
+        bottom, above = self.console._row_ids[0], self.console._row_ids[1]
+        self.assertEqual(self.console.canvas.itemcget(bottom, "text"), "199")
+        self.assertEqual(self.console.canvas.coords(bottom)[1], 240 - self.spacing)
+        self.assertEqual(self.console.canvas.coords(above)[1], 240 - 2 * self.spacing)
+
+    def test_redraw_matches_incremental(self):
+        self.console.add_line("a long command " * 5)
+        for i in range(30):
+            self.console.add_line(i, is_command=False)
+        drawn = [(self.console.canvas.itemcget(i, "text"), self.console.canvas.coords(i))
+                 for i in self.console._row_ids]
+
+        self.console.redraw()
+        redrawn = [(self.console.canvas.itemcget(i, "text"), self.console.canvas.coords(i))
+                   for i in self.console._row_ids]
+        self.assertEqual(drawn, redrawn)
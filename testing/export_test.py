@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+from xml.etree import ElementTree
+from datastructures import arrays, algorithms
+from drawtools import export, dsDraw_colors
+
+
+class ExportTest(unittest.TestCase):
+
+    def setUp(self):
+        self.model = arrays.Array([5, 2, 7, 1, 9, 3])
+        self.trace = algorithms.record_sort(self.model.values(), "insertion")
+
+    def test_trace_frames(self):
+        frames = list(export.trace_frames(self.model, self.trace))
+        self.assertEqual(len(frames), len(self.trace) + 1)
+        self.assertEqual(frames[0].model.values(), [5, 2, 7, 1, 9, 3])
+        self.assertEqual(frames[-1].model.values(), [1, 2, 3, 5, 7, 9])
+
+        # source model is untouched
+        self.assertEqual(self.model.values(), [5, 2, 7, 1, 9, 3])
+
+        every = list(export.trace_frames(self.model, self.trace, every=5))
+        self.assertEqual(every[-1].model.values(), [1, 2, 3, 5, 7, 9])
+        self.assertLess(len(every), len(frames))
+
+    def test_script_frames(self):
+        source = "b = BST()\nshow b\nfor i in [5, 3, 8]: b.insert(i)\nx = 1\nb.remove(3)\n"
+        frames = export.script_frames(source, "b")
+        self.assertEqual([len(frame.model) for frame in frames], [0, 1, 2, 3, 2])
+
+    def test_script_frames_console_calls(self):
+        lines = ["a = Array([5, 2, 7])", "show a", "b = BST(3)", "show b", "b.insert(10)",
+                 "a[0] = 1", "a.color('red', 1)", "a.swap(0, 2)", "a.undo()"]
+        frames = export.script_frames(lines, "a")
+        self.assertEqual([frame.model.values() for frame in frames],
+                         [[5, 2, 7], [1, 2, 7], [1, 2, 7], [7, 2, 1], [1, 2, 7]])
+        self.assertNotEqual(frames[2].model.get_color(1), frames[1].model.get_color(1))
+
+    def test_script_frames_sort(self):
+        frames = export.script_frames(["a = Array([5, 2, 7, 1])", "show a", "a.sort('bubble')", "a[0] = 0"], "a")
+        trace = algorithms.record_sort([5, 2, 7, 1], "bubble")
+        self.assertEqual(len(frames), len(trace) + 2)
+        self.assertEqual(frames[0].model.values(), [5, 2, 7, 1])
+        self.assertEqual(frames[1].status, "step 1/%s  compares: 1  swaps: 0" % len(trace))
+        self.assertEqual(frames[1].model.get_color(0), dsDraw_colors["yellow"])
+        self.assertEqual(frames[-2].model.values(), [1, 2, 5, 7])
+        self.assertEqual(frames[-1].model.values(), [0, 2, 5, 7])
+
+    def test_export_svg(self):
+        frames = list(export.trace_frames(self.model, self.trace, every=4))
+        with tempfile.TemporaryDirectory() as out:
+            result = export.export(frames, out, workers=2, name="a")
+            self.assertEqual(result.frames, len(frames))
+            self.assertEqual(sorted(os.listdir(out)), [os.path.basename(p) for p in result.paths])
+
+            svg = ElementTree.parse(result.paths[-1]).getroot()
+            texts = [e.text for e in svg if e.tag.endswith("text")]
+            self.assertIn("a", texts)
+
+    @unittest.skipIf(export.Image is not None, "Pillow installed")
+    def test_raster_requires_pillow(self):
+        self.assertRaises(ImportError, export.export, [], "out.gif", fmt="gif")
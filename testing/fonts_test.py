@@ -0,0 +1,77 @@
+import unittest
+from datastructures import arrays
+from drawtools.fonts import FontRegistry, CachedFont
+from drawtools.headless import HeadlessCanvas, HeadlessFont
+from drawtools.render import RenderArray
+
+
+class FakeRoot(object):
+    pass
+
+
+class FakeWidget(object):
+    def __init__(self, root):
+        self.root = root
+
+    def _root(self):
+        return self.root
+
+
+class CountingFont(HeadlessFont):
+    """Font stand-in (no Tk) counting real measurements"""
+    created = 0
+
+    def __init__(self, root=None, family="Monospace", size=10, weight="normal"):
+        super().__init__(family, size)
+        self.measured = 0
+        CountingFont.created += 1
+
+    def measure(self, text):
+        self.measured += 1
+        return super().measure(text)
+
+
+class RegistryCanvas(HeadlessCanvas):
+    """Headless canvas getting its font from a registry like DrawCanvas"""
+    def __init__(self, registry, widget):
+        super().__init__(400, 200)
+        self.registry = registry
+        self.widget = widget
+
+    def default_font(self):
+        return self.registry.get(self.widget)
+
+
+class FontRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        CountingFont.created = 0
+        self.registry = FontRegistry(font_class=CountingFont)
+
+    def test_one_font_per_root(self):
+        root_a, root_b = FakeRoot(), FakeRoot()
+        font = self.registry.get(FakeWidget(root_a))
+        self.assertIs(self.registry.get(FakeWidget(root_a)), font)
+        self.assertIsNot(self.registry.get(FakeWidget(root_b)), font)
+        self.assertIsNot(self.registry.get(FakeWidget(root_a), size=12), font)
+        self.assertEqual(CountingFont.created, 3)
+
+    def test_measure_cache(self):
+        font = CachedFont(CountingFont())
+        self.assertEqual(font.measure(100), font.measure("100"))
+        self.assertEqual((font.hits, font.misses, font.font.measured), (1, 1, 1))
+
+        font.configure(size=20)
+        font.measure("100")
+        self.assertEqual(font.misses, 2)
+
+    def test_redraw_hit_rate(self):
+        canvas = RegistryCanvas(self.registry, FakeWidget(FakeRoot()))
+        render = RenderArray(arrays.Array(range(50)), canvas, "a")
+        for _ in range(10):
+            render.display()
+
+        info = self.registry.info()
+        self.assertEqual(info.fonts, 1)
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 9)
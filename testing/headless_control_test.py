@@ -0,0 +1,69 @@
+import io
+import unittest
+import datastructures
+from controller.headless import HeadlessControl
+import dsdraw
+
+SCRIPT = """
+# comments and blank lines are skipped
+
+b = BST(10)
+show b
+b.insert(100)
+sequence fill for i range(5)
+b.insert(200 + i)
+end
+fill.execute()
+speed 4
+1 / 0
+print(len(b._model))
+"""
+
+
+class HeadlessControlTest(unittest.TestCase):
+
+    def run_script(self, render=True):
+        out = io.StringIO()
+        control = HeadlessControl(render=render, out=out)
+        control.run(io.StringIO(SCRIPT))
+        return control, out.getvalue().splitlines()
+
+    def test_script(self):
+        control, lines = self.run_script()
+        self.assertEqual(lines[-1], "16")
+        self.assertIn("[ERROR]: division by zero", lines)
+        self.assertGreater(len(control.my_renders["b"].canvas), 0)
+
+        counts = {row.command: row.count for row in control.summary()}
+        self.assertEqual(counts, {"python": 5, "show": 1, "sequence": 1, "speed": 1})
+
+    def test_python_error_without_parse_context(self):
+        out = io.StringIO()
+        HeadlessControl(out=out).process_command("1 / 0")
+        self.assertNotIn("During handling", out.getvalue())
+        self.assertNotIn("KeyError", out.getvalue())
+        self.assertIn("[ERROR]: division by zero", out.getvalue())
+
+    def test_no_render(self):
+        control, lines = self.run_script(render=False)
+        self.assertEqual(lines[-1], "16")
+        self.assertEqual(len(control.my_renders["b"].canvas), 0)
+
+    def test_command_line(self):
+        import os, sys, tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "script.ds")
+            with open(path, "w") as f:
+                f.write(SCRIPT)
+
+            stdout, stderr = sys.stdout, sys.stderr
+            sys.stdout, sys.stderr = io.StringIO(), io.StringIO()
+            try:
+                dsdraw.main(["run", path, "--svg", tmp])
+                summary = sys.stderr.getvalue()
+            finally:
+                sys.stdout, sys.stderr = stdout, stderr
+
+            self.assertTrue(os.path.exists(os.path.join(tmp, "b.svg")))
+        self.assertTrue(summary.startswith("command"))
+        self.assertIn("sequence", summary)
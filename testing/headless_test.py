@@ -0,0 +1,120 @@
+import unittest
+from xml.etree import ElementTree
+from datastructures import tree, graph, arrays
+from drawtools.render import RenderTree, RenderGraph, RenderArray
+from drawtools.headless import HeadlessCanvas, HeadlessFont
+from drawtools.annotations import ANNOTATION_TAG
+
+
+class HeadlessCanvasTest(unittest.TestCase):
+
+    def setUp(self):
+        self.canvas = HeadlessCanvas(200, 100)
+
+    def test_items_and_tags(self):
+        c = self.canvas
+        rect = c.create_rectangle(0, 0, 10, 10, fill="red", tag="a_0")
+        text = c.create_text(5, 5, text=3, tags=("a_0", "value"))
+        c.create_line([0, 0, 20, 20])
+
+        self.assertEqual(c.find_withtag("a_0"), (rect, text))
+        c.move("a_0", 5, -5)
+        self.assertEqual(c.coords(rect), [5, -5, 15, 5])
+
+        c.itemconfigure(text, text=4)
+        self.assertEqual(c.itemcget(text, "text"), 4)
+
+        c.delete("a_0")
+        self.assertEqual(len(c), 1)
+        c.delete("all")
+        self.assertEqual(c.find_all(), ())
+
+    def test_stacking_order(self):
+        c = self.canvas
+        a = c.create_oval(0, 0, 1, 1)
+        b = c.create_oval(0, 0, 1, 1)
+        c.tag_raise(a)
+        self.assertEqual(c.find_all(), (b, a))
+        c.tag_lower(a)
+        self.assertEqual(c.find_all(), (a, b))
+
+    def test_svg(self):
+        c = self.canvas
+        c.create_rectangle(0, 0, 10, 10, fill="#e74c3c")
+        c.create_text(5, 5, text="<5>", anchor="nw")
+        c.create_oval(0, 0, 4, 4, fill="white", state="hidden")
+        svg = ElementTree.fromstring(c.to_svg())
+
+        tags = [child.tag.split("}")[1] for child in svg]
+        self.assertEqual(tags, ["rect", "rect", "text"])
+        self.assertEqual(svg[2].text, "<5>")
+
+    def test_font(self):
+        self.assertEqual(HeadlessFont().measure("000"), 3 * HeadlessFont().measure(0))
+
+
+class HeadlessRenderTest(unittest.TestCase):
+
+    def count(self, canvas, item_type):
+        return sum(1 for i in canvas.find_all() if canvas.type(i) == item_type)
+
+    def test_tree(self):
+        canvas = HeadlessCanvas()
+        t = tree.BST(20)
+        RenderTree(t, canvas, "t").display()
+        self.assertEqual(self.count(canvas, "oval"), 20)
+        self.assertEqual(self.count(canvas, "line"), 19)
+
+    def test_graph_simulates_synchronously(self):
+        canvas = HeadlessCanvas()
+        g = graph.Graph(4)
+        render = RenderGraph(g, canvas, "g")
+        render.display()
+        self.assertFalse(render.simulating)
+        self.assertEqual(render.layout_cache.info().currsize, 1)
+        self.assertEqual(self.count(canvas, "oval"), len(g.nodes))
+
+    def test_array_window(self):
+        canvas = HeadlessCanvas(400, 200)
+        a = arrays.CompactArray(range(1000))
+        render = RenderArray(a, canvas, "a")
+        render.display()
+        first, last = render.window()
+        self.assertEqual(self.count(canvas, "rectangle"), last - first)
+
+        # away from the ends scrolling reuses items
+        render.scroll_to(100)
+        before = canvas.op_counts["create"]
+        render.scroll(3)
+        self.assertEqual(canvas.op_counts["create"], before)
+        self.assertEqual(canvas.itemcget(canvas.find_withtag("a_103")[1], "text"), 103)
+
+    def test_clear_by_tag(self):
+        canvas = HeadlessCanvas()
+        arrow = canvas.create_line(0, 0, 50, 50, tags=ANNOTATION_TAG)
+        render = RenderTree(tree.BST(10), canvas, "t")
+        render.display()
+        render.display()
+
+        # annotation survives redraws and stays on top
+        self.assertEqual(canvas.find_all()[-1], arrow)
+        self.assertEqual(len(canvas.find_withtag(render.role_tag("node"))), 10)
+        self.assertEqual(len(canvas.find_withtag(render.role_tag("edge"))), 9)
+        self.assertEqual(len(canvas), 1 + 10 + 9 + 10 + 1)
+
+    def test_hide_labels(self):
+        canvas = HeadlessCanvas(400, 200)
+        render = RenderArray(arrays.Array(range(10)), canvas, "a")
+        render.display()
+        created = canvas.op_counts["create"]
+
+        render.set_hidden("label", True)
+        labels = canvas.find_withtag(render.role_tag("label"))
+        self.assertEqual(len(labels), 10)
+        self.assertTrue(all(canvas.itemcget(i, "state") == "hidden" for i in labels))
+        self.assertEqual(canvas.op_counts["create"], created)
+
+        # cells drawn later start hidden too
+        render.display()
+        self.assertEqual(canvas.itemcget(render.role_tag("label"), "state"), "hidden")
+        self.assertEqual(canvas.itemcget(render.role_tag("index"), "state"), "normal")
@@ -0,0 +1,199 @@
+import unittest
+import random
+from datastructures import tree, graph, arrays
+from datastructures.history import Delta, Snapshot
+
+
+class NoDrawRender(object):
+    """Render object stand-in, history tests don't draw"""
+    def __init__(self):
+        self.layout_cache = None
+        self.displays = 0
+
+    def display(self, do_render=True, do_sleep=False):
+        self.displays += 1
+
+    def is_drawn(self, index):
+        return False
+
+
+def interactive(model):
+    return model.get_interactive_class()(None, model, NoDrawRender())
+
+
+def tree_shape(t):
+    return t.structure_key()
+
+
+class ArrayHistoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.model = arrays.Array(range(20))
+        self.a = interactive(self.model)
+
+    def test_setitem_is_delta(self):
+        self.a[3] = 100
+        self.assertIsInstance(self.a._history._undo[-1], Delta)
+        self.a.undo()
+        self.assertEqual(self.model.get_value(3), 3)
+        self.a.redo()
+        self.assertEqual(self.model.get_value(3), 100)
+
+    def test_swap_and_color(self):
+        self.a.swap(0, 5)
+        self.a.color("red", 2, 4)
+        self.a.undo()
+        self.assertEqual([self.model.get_color(i) for i in range(2, 5)], ["white"] * 3)
+        self.a.undo()
+        self.assertEqual(self.model.values(), list(range(20)))
+        self.assertRaises(IndexError, self.a.undo)
+
+    def test_new_change_clears_redo(self):
+        self.a[0] = 5
+        self.a.undo()
+        self.a[1] = 6
+        self.assertRaises(IndexError, self.a.redo)
+
+    def test_budget(self):
+        self.a._history.budget = 10
+        for i in range(20):
+            self.a[i] = -i
+        self.assertEqual(len(self.a._history), 10)
+
+
+class BSTHistoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.model = tree.BST()
+        for n in random.sample(range(100), 50):
+            self.model.insert(n)
+        self.b = interactive(self.model)
+
+    def test_insert_remove_leaf_are_deltas(self):
+        before = tree_shape(self.model)
+        new_value = 1000
+        self.b.insert(new_value)
+        self.b.remove(new_value)
+        self.assertTrue(all(isinstance(e, Delta) for e in self.b._history._undo))
+
+        self.b.undo()
+        self.b.undo()
+        self.assertEqual(tree_shape(self.model), before)
+
+    def test_remove_internal_node_uses_snapshot(self):
+        before = tree_shape(self.model)
+        self.b.remove(self.model.root.value)
+        self.assertIsInstance(self.b._history._undo[-1], Snapshot)
+        after = tree_shape(self.model)
+
+        self.b.undo()
+        self.assertEqual(tree_shape(self.model), before)
+        self.b.redo()
+        self.assertEqual(tree_shape(self.model), after)
+
+    def test_rotate_undo(self):
+        before = tree_shape(self.model)
+        root = self.model.root
+        child = root.left or root.right
+        self.b.rotate(root.value, child.value)
+        self.assertNotEqual(tree_shape(self.model), before)
+        self.b.undo()
+        self.assertEqual(tree_shape(self.model), before)
+
+    def test_mixed_sequence(self):
+        states = [tree_shape(self.model)]
+        for _ in range(30):
+            node = random.choice(list(self.model))
+            op = random.randrange(3)
+            if op == 0:
+                self.b.insert(random.randrange(200, 400))
+            elif op == 1 and len(self.model) > 1:
+                self.b.remove(node.value)
+            elif node.children():
+                self.b.rotate(node.value, node.children()[0].value)
+            else:
+                continue
+            states.append(tree_shape(self.model))
+
+        for state in reversed(states[:-1]):
+            self.b.undo()
+            self.assertEqual(tree_shape(self.model), state)
+
+        for state in states[1:]:
+            self.b.redo()
+            self.assertEqual(tree_shape(self.model), state)
+
+
+class BatchTest(unittest.TestCase):
+
+    def test_one_entry_one_redraw(self):
+        model = arrays.Array(range(10))
+        a = interactive(model)
+        with a.batch():
+            for i in range(len(model)):
+                a[i] = i * i
+            with a.batch():
+                a.swap(0, 9)
+        self.assertEqual(a._render.displays, 1)
+        self.assertEqual(len(a._history), 1)
+
+        a.undo()
+        self.assertEqual(model.values(), list(range(10)))
+        a.redo()
+        self.assertEqual(model.values()[:2], [81, 1])
+
+    def test_snapshot_inside_batch(self):
+        model = tree.BST()
+        for n in [50, 25, 75, 10, 30]:
+            model.insert(n)
+        b = interactive(model)
+        before = tree_shape(model)
+
+        with b.batch():
+            b.insert(5)
+            b.remove(25)
+            for n in range(100, 110):
+                b.insert(n)
+        after = tree_shape(model)
+
+        # nothing is recorded after the first snapshot
+        group = b._history._undo[-1]
+        self.assertTrue(group.frozen)
+        self.assertEqual(len(group.entries), 2)
+
+        b.undo()
+        self.assertEqual(tree_shape(model), before)
+        b.redo()
+        self.assertEqual(tree_shape(model), after)
+
+    def test_empty_batch(self):
+        a = interactive(arrays.Array(range(3)))
+        with a.batch():
+            pass
+        self.assertFalse(a._history.can_undo())
+
+
+class GraphHistoryTest(unittest.TestCase):
+
+    def test_new_node_and_connect(self):
+        model = graph.Graph()
+        g = interactive(model)
+        g.new_node(1)
+        g.new_node(2)
+        g.connect(1, 2)
+        g.undo()
+        self.assertEqual(model.edges, [])
+        g.undo()
+        self.assertEqual([n.value for n in model.nodes], [1])
+        g.redo()
+        g.redo()
+        self.assertEqual([(u.value, v.value) for u, v in model.edges], [(1, 2)])
+
+    def test_clone(self):
+        model = graph.Graph(3)
+        clone = model.clone()
+        self.assertEqual(clone.structure_key(), model.structure_key())
+
+
+if __name__ == '__main__':
+    unittest.main()
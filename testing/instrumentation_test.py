@@ -0,0 +1,120 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+import datastructures
+from controller.headless import HeadlessControl
+from util.instrumentation import RollingHistogram, recorder
+from util.exceptions import InvalidCommandError
+
+
+class HistogramTest(unittest.TestCase):
+
+    def test_percentiles(self):
+        histogram = RollingHistogram(size=100)
+        for ms in range(1, 201):
+            histogram.add(ms / 1000)
+        self.assertEqual(histogram.count, 200)
+        self.assertEqual(len(histogram), 100)
+        self.assertAlmostEqual(histogram.percentile(50), 0.150)
+        self.assertAlmostEqual(histogram.percentile(95), 0.195)
+        self.assertAlmostEqual(histogram.percentile(100), 0.200)
+
+
+class StatsCommandTest(unittest.TestCase):
+
+    def setUp(self):
+        recorder.clear()
+        self.out = io.StringIO()
+        self.control = HeadlessControl(out=self.out)
+        self.control.run(["b = BST(20)", "show b", "speed 2", "b.insert(7)"])
+
+    def tearDown(self):
+        recorder.clear()
+
+    def test_recorded(self):
+        rows = {(row.kind, row.name): row for row in recorder.summary()}
+        self.assertEqual(rows["command", "python"].count, 2)
+        self.assertEqual(rows["command", "SetSpeedCommand"].count, 1)
+        self.assertEqual(rows["command", "ShowRenderCommand"].count, 1)
+
+        draw = rows["render", "RenderTree.draw_on_canvas"]
+        self.assertEqual(draw.count, 2)
+        self.assertIsNone(draw.items)
+        self.assertLessEqual(draw.p50, draw.p95)
+        self.assertLessEqual(draw.p95, draw.max)
+
+    def test_count_items(self):
+        render = self.control.my_renders["b"]
+        queries = []
+        find_withtag = render.canvas.find_withtag
+        render.canvas.find_withtag = lambda tag: queries.append(tag) or find_withtag(tag)
+
+        self.control.process_command("b.insert(8)")
+        self.assertEqual(queries, [])
+
+        self.control.process_command("stats items on")
+        self.control.process_command("b.insert(9)")
+        self.control.process_command("stats items off")
+        self.assertEqual(queries, [render.tag])
+        rows = {(row.kind, row.name): row for row in recorder.summary()}
+        self.assertEqual(rows["render", "RenderTree.draw_on_canvas"].items,
+                         len(render.canvas.find_withtag(render.tag)))
+        self.assertFalse(recorder.count_items)
+
+    def test_stats_command(self):
+        self.control.process_command("stats")
+        lines = self.out.getvalue().splitlines()
+        self.assertTrue(any(line.startswith("render RenderTree.render ") for line in lines))
+        self.assertTrue(any(line.startswith("command SetSpeedCommand ") for line in lines))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "stats.jsonl")
+            recorded = sum(row.count for row in recorder.summary())
+            self.control.process_command("stats dump %s" % path)
+            with open(path) as f:
+                samples = [json.loads(line) for line in f]
+        self.assertIn({"kind", "name", "seconds", "items"}, [set(sample) for sample in samples])
+        self.assertEqual(len(samples), recorded)
+
+        self.control.process_command("stats clear")
+        self.assertEqual(len(recorder.summary()), 1)
+
+
+class ProfileCommandTest(unittest.TestCase):
+
+    def setUp(self):
+        self.out = io.StringIO()
+        self.control = HeadlessControl(out=self.out)
+        self.control.run(["b = BST(50)", "show b"])
+
+    def test_profile_code_and_render(self):
+        import pstats
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "insert.prof")
+            self.control.process_command("profile -n 50 -o %s b.insert_many(range(100))" % path)
+            functions = {name for _, _, name in pstats.Stats(path).stats}
+
+        self.assertIn("draw_on_canvas", functions)
+        self.assertEqual(len(self.control.my_variables["_b"]), 150)
+
+        lines = self.out.getvalue().splitlines()
+        self.assertTrue(any("Ordered by: cumulative time" in line for line in lines))
+        self.assertTrue(any("run_command" in line for line in lines))
+        self.assertEqual(lines[-1], "Profile written to %s" % path)
+
+    def test_profile_command(self):
+        from command.command_factory import ControlCommandFactory
+        command = ControlCommandFactory(self.control).create_command("profile", "-n", "3", "speed", "2")
+        self.assertEqual((command.top, command.path, command.command_text), (3, None, "speed 2"))
+        command.execute()
+        self.assertEqual(self.control.timeline.speed, 2.0)
+
+        self.assertRaises(InvalidCommandError, ControlCommandFactory(self.control).create_command, "profile", "-n")
+
+    def test_profile_python_error(self):
+        self.control.process_command("profile 1 / 0")
+        output = self.out.getvalue()
+        self.assertIn("[ERROR]: division by zero", output)
+        self.assertNotIn("During handling", output)
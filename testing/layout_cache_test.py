@@ -0,0 +1,78 @@
+import unittest
+from datastructures import tree, graph
+from drawtools.render import RenderTree, RenderGraph
+
+
+class TreeLayoutCacheTest(unittest.TestCase):
+    """
+    Layouts of previously rendered tree shapes
+    should be reused instead of recomputed.
+    """
+
+    def setUp(self):
+        self.tree = tree.BST(50)
+        self.render_obj = RenderTree(self.tree, None)
+        self.render_obj.render()
+
+    def test_miss_then_hit(self):
+        info = self.render_obj.layout_cache.info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 0)
+
+        self.render_obj.render()
+        self.assertEqual(self.render_obj.layout_cache.info().hits, 1)
+
+    def test_revert_reuses_coordinates(self):
+        """
+        Clone (as save_state does), mutate, then restore the clone.
+        Restored tree should get the original coordinates from the cache.
+        """
+        original = {node.value: (node.x, node.y) for node in self.tree}
+
+        saved = self.tree.clone()
+        self.tree.insert(1000)
+        self.render_obj.render()
+        self.tree.set_state(saved)
+        self.render_obj.render()
+
+        self.assertEqual(self.render_obj.layout_cache.info().hits, 1)
+        restored = {node.value: (node.x, node.y) for node in self.tree}
+        self.assertEqual(original, restored)
+
+    def test_different_values_miss(self):
+        self.tree.insert(1000)
+        self.render_obj.render()
+        self.assertEqual(self.render_obj.layout_cache.info().misses, 2)
+
+    def test_lru_eviction(self):
+        self.render_obj.layout_cache.maxsize = 2
+        for n in range(100, 103):
+            self.tree.insert(n)
+            self.render_obj.render()
+        self.assertEqual(len(self.render_obj.layout_cache), 2)
+
+
+class GraphLayoutCacheTest(unittest.TestCase):
+
+    def test_cached_layout_skips_simulation(self):
+        g = graph.Graph(4)
+        render_obj = RenderGraph(g, None)
+        key = g.structure_key()
+        render_obj.layout_cache.put(key, [(i, 2 * i) for i in range(len(g.nodes))])
+
+        render_obj.render()
+
+        self.assertFalse(render_obj.simulating)
+        self.assertEqual([(v.x, v.y) for v in g.nodes], [(i, 2 * i) for i in range(len(g.nodes))])
+
+    def test_structure_key_depends_on_edges(self):
+        g = graph.Graph()
+        a = g.new_node(1)
+        b = g.new_node(2)
+        before = g.structure_key()
+        g.create_edge(a, b)
+        self.assertNotEqual(before, g.structure_key())
+
+
+if __name__ == '__main__':
+    unittest.main()
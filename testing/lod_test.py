@@ -0,0 +1,88 @@
+import unittest
+import random
+from datastructures import tree, graph
+from drawtools.render import RenderTree, RenderGraph
+from drawtools.headless import HeadlessCanvas
+from drawtools.lod import LODPolicy, subtree_extents
+
+
+def random_bst(n):
+    t = tree.BST()
+    values = list(range(n))
+    random.shuffle(values)
+    t.insert_many(values)
+    return t
+
+
+def draw(render_class, model, lod=LODPolicy()):
+    canvas = HeadlessCanvas(800, 600)
+    render = render_class(model, canvas, "x")
+    render.lod = lod
+    render.display()
+    return canvas
+
+
+def count(canvas, item_type):
+    return sum(1 for i in canvas.find_all() if canvas.type(i) == item_type)
+
+
+class TreeLODTest(unittest.TestCase):
+
+    def test_item_count_bounded(self):
+        small = len(draw(RenderTree, random_bst(2000)))
+        large = len(draw(RenderTree, random_bst(8000)))
+        self.assertLess(large, 1.5 * small)
+        self.assertLess(large, 2000)
+
+    def test_no_lod_draws_everything(self):
+        canvas = draw(RenderTree, random_bst(300), lod=None)
+        self.assertEqual(count(canvas, "oval"), 300)
+        self.assertEqual(count(canvas, "text"), 301)
+
+    def test_small_tree_unchanged(self):
+        canvas = draw(RenderTree, random_bst(10))
+        self.assertEqual(count(canvas, "oval"), 10)
+        self.assertEqual(count(canvas, "polygon"), 0)
+
+    def test_labels_hidden(self):
+        canvas = draw(RenderTree, random_bst(200), lod=LODPolicy(label_px=100, point_px=0, summary_px=0))
+        self.assertEqual(count(canvas, "oval"), 200)
+        # name only
+        self.assertEqual(count(canvas, "text"), 1)
+
+    def test_heap_and_extents(self):
+        heap = tree.BinaryHeap()
+        heap.insert_many(range(255))
+        canvas = draw(RenderTree, heap, lod=LODPolicy(summary_px=100))
+        self.assertGreater(count(canvas, "polygon"), 0)
+
+        t = random_bst(50)
+        RenderTree(t, None).render()
+        min_x, max_x, max_y = subtree_extents(t.root, lambda node: node.children())[id(t.root)]
+        self.assertEqual((min_x, max_x), (min(n.x for n in t), max(n.x for n in t)))
+        self.assertEqual(max_y, max(n.y for n in t))
+
+
+class GraphLODTest(unittest.TestCase):
+
+    def test_points_deduplicated(self):
+        g = graph.Graph()
+        nodes = g.new_nodes(range(400))
+        for i, node in enumerate(nodes):
+            node.x, node.y = i % 5, 0
+        g.connect_many((nodes[i], nodes[i + 1]) for i in range(399))
+
+        render = RenderGraph(g, HeadlessCanvas(800, 600), "g")
+        render.lod = LODPolicy(label_px=10 ** 6, point_px=10 ** 6)
+        render.layout_cache.put(g.structure_key(), [(n.x, n.y) for n in nodes])
+        render.display()
+
+        # 5 distinct positions, edges between neighbouring positions
+        self.assertEqual(count(render.canvas, "rectangle"), 5)
+        self.assertLessEqual(count(render.canvas, "line"), 8)
+
+    def test_culling(self):
+        policy = LODPolicy()
+        self.assertTrue(policy.in_view(-10, 5, 10, 5, 100, 100))
+        self.assertFalse(policy.in_view(101, 0, 200, 50, 100, 100))
+        self.assertTrue(LODPolicy(cull=False).in_view(101, 0, 200, 50, 100, 100))
@@ -0,0 +1,75 @@
+import logging
+import os
+import tempfile
+import unittest
+from datastructures import tree
+from drawtools.render import RenderTree
+from drawtools.headless import HeadlessCanvas
+from util import logging_util
+
+
+class CountingNode(tree.TreeNode):
+    reprs = 0
+
+    def __repr__(self):
+        CountingNode.reprs += 1
+        return super().__repr__()
+
+
+class Records(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class LazyLoggingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.bst = tree.BST()
+        for value in [50, 25, 75, 10, 30, 60, 90, 5]:
+            self.bst.insert(value)
+        for node in self.bst.root:
+            node.__class__ = CountingNode
+        CountingNode.reprs = 0
+
+        self.bst.logger = logging.getLogger("dsDraw.test")
+        self.handler = Records()
+        self.bst.logger.addHandler(self.handler)
+        self.render = RenderTree(self.bst, HeadlessCanvas(), "b")
+
+    def tearDown(self):
+        self.bst.logger.removeHandler(self.handler)
+
+    def test_disabled_is_free(self):
+        self.bst.logger.setLevel(logging.WARNING)
+        self.render.reingold_tilford(list(self.bst.root))
+        self.bst.insert(7)
+        self.assertEqual(CountingNode.reprs, 0)
+        self.assertEqual(self.handler.records, [])
+
+    def test_enabled_same_layout(self):
+        self.render.reingold_tilford(list(self.bst.root))
+        quiet = [node.x for node in self.bst.root]
+
+        self.bst.logger.setLevel(logging.DEBUG)
+        self.render.reingold_tilford(list(self.bst.root))
+        self.assertEqual([node.x for node in self.bst.root], quiet)
+
+        messages = [r.getMessage() for r in self.handler.records]
+        self.assertIn("\t\t\tTreeNode(5) is a leaf", messages)
+        self.assertGreater(CountingNode.reprs, 0)
+
+    def test_file_written_in_background(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "test_log.log")
+            logger = logging_util.create_logger("dsDraw.file_test", "debug", os.path.relpath(path, "dsDraw"))
+            logger.debug("value %s", 42)
+            logging_util.stop_listeners()
+
+            with open(path) as f:
+                self.assertEqual(f.read(), "dsDraw.file_test-DEBUG-value 42\n")
+            for handler in logger.handlers:
+                logger.removeHandler(handler)
@@ -0,0 +1,144 @@
+import unittest
+import random
+from datastructures import tree
+from datastructures.history import Snapshot
+from testing.history_test import interactive
+
+
+def nodes(version):
+    """All PNodes reachable from a version"""
+    stack = [version] if version else []
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(c for c in (node.left, node.right) if c)
+
+
+class PersistentBSTTest(unittest.TestCase):
+
+    def setUp(self):
+        self.values = list(range(50))
+        random.shuffle(self.values)
+
+        self.bst = tree.BST()
+        self.pbst = tree.PersistentBST()
+        for v in self.values:
+            self.bst.insert(v)
+            self.pbst.insert(v)
+
+    def assertSameShape(self):
+        self.assertEqual(self.bst.structure_key(), self.pbst.structure_key())
+        self.assertEqual(len(self.bst), len(self.pbst))
+
+    def test_insert_matches_bst(self):
+        self.assertSameShape()
+        self.assertEqual(len(self.pbst.versions), 50)
+
+    def test_remove_matches_bst(self):
+        for v in self.values[::3]:
+            self.bst.remove(v)
+            self.pbst.remove(v)
+            self.assertSameShape()
+        self.assertRaises(Exception, self.pbst.remove, self.values[0])
+
+    def test_rotations_match_bst(self):
+        for _ in range(30):
+            node = random.choice([n for n in self.pbst.preorder() if n.left or n.right])
+            value = node.value
+            if node.left:
+                self.pbst.rotate_right(node, node.left)
+                b_node = self.bst.find(value)
+                self.bst.rotate_right(b_node, b_node.left)
+            else:
+                self.pbst.rotate_left(node, node.right)
+                b_node = self.bst.find(value)
+                self.bst.rotate_left(b_node, b_node.right)
+            self.assertSameShape()
+
+    def test_stale_node_rejected(self):
+        root = self.pbst.root
+        self.pbst.insert(100)
+        child = root.left or root.right
+        rotate = self.pbst.rotate_right if child is root.left else self.pbst.rotate_left
+        self.assertRaises(ValueError, rotate, root, child)
+
+    def test_versions_share_structure(self):
+        before = self.pbst.versions[-1]
+        self.pbst.insert(25.5)
+        after = self.pbst.versions[-1]
+
+        # only the path to the new leaf is new
+        old_ids = set(map(id, nodes(before)))
+        new_nodes = [n for n in nodes(after) if id(n) not in old_ids]
+        depth = 1
+        node = after
+        while node.value != 25.5:
+            node = node.left if 25.5 <= node.value else node.right
+            depth += 1
+        self.assertEqual(len(new_nodes), depth)
+
+        # old version is untouched
+        self.assertEqual(before.size, 50)
+        self.assertEqual(after.size, 51)
+
+    def test_prebuild_is_one_version(self):
+        pbst = tree.PersistentBST(200)
+        self.assertEqual(len(pbst.versions), 1)
+        self.assertEqual(len(pbst), 200)
+        pbst.insert(-1)
+        self.assertEqual([version.size for version in pbst.versions], [200, 201])
+
+    def test_from_deep_tree(self):
+        # degenerate tree deeper than the recursion limit
+        chain = tree.TreeNode(0)
+        node = chain
+        for v in range(1, 5000):
+            node.right = tree.TreeNode(v, parent=node)
+            node = node.right
+        pbst = tree.PersistentBST()
+        pbst.root = chain
+        self.assertEqual(len(pbst), 5000)
+        self.assertEqual(sorted(n.value for n in nodes(pbst._version)), list(range(5000)))
+        self.assertIsNone(pbst._version.left)
+
+    def test_clone_is_shared(self):
+        clone = self.pbst.clone()
+        self.assertIs(clone._version, self.pbst._version)
+        self.pbst.remove(self.values[0])
+        self.pbst.set_state(clone)
+        self.assertEqual(len(self.pbst), 50)
+        self.assertLess(Snapshot(self.pbst).cost, 10)
+
+
+class InteractivePersistentBSTTest(unittest.TestCase):
+
+    def setUp(self):
+        self.model = tree.PersistentBST()
+        self.t = interactive(self.model)
+        for v in [5, 3, 8, 1, 4]:
+            self.t.insert(v)
+
+    def test_undo_redo(self):
+        shape = self.model.structure_key()
+        self.t.rotate(5, 3)
+        self.assertEqual(self.model.root.value, 3)
+        self.t.remove(4)
+        self.t.undo()
+        self.t.undo()
+        self.assertEqual(self.model.structure_key(), shape)
+        self.t.redo()
+        self.assertEqual(self.model.root.value, 3)
+
+    def test_checkout(self):
+        self.assertEqual([size for _, size in self.t.versions()], [1, 2, 3, 4, 5])
+        self.t.checkout(1)
+        self.assertEqual([n.value for n in self.model], [3, 5])
+
+        # new changes branch off the checked out version
+        self.t.insert(9)
+        self.assertEqual([n.value for n in self.model], [3, 5, 9])
+        self.assertEqual(len(self.t.versions()), 6)
+
+        self.t.undo()
+        self.t.undo()
+        self.assertEqual(len(self.model), 5)
@@ -0,0 +1,143 @@
+import unittest
+import datastructures
+from datastructures import arrays, tree
+from command.sequence import SequenceFactory, VariableSlot
+from controller.shell import EmbeddedShell, compile_source
+from util.exceptions import InvalidCommandError
+
+
+class FakeConsole(object):
+    def __init__(self):
+        self.lines = []
+
+    def add_line(self, text, is_command=True):
+        self.lines.append(text)
+
+    def add_lines(self, texts, is_command=False):
+        self.lines.extend(texts)
+
+
+class FakeView(object):
+    def __init__(self):
+        self.console = FakeConsole()
+
+
+class FakeControl(object):
+    """Control stand-in with a real shell, counting full redraws"""
+    def __init__(self):
+        self.view = FakeView()
+        self.python_shell = EmbeddedShell(self.view.console)
+        self.my_variables = self.python_shell.locals
+        self.my_renders = {}
+        self.displays = 0
+
+    def display(self, do_render=True, do_sleep=False):
+        self.displays += 1
+
+
+class CountingRender(object):
+    layout_cache = None
+
+    def __init__(self):
+        self.displays = 0
+
+    def display(self, do_render=True, do_sleep=False):
+        self.displays += 1
+
+    def is_drawn(self, index):
+        return False
+
+
+def sequence(control, lines, *seq_args, redraw_every=1):
+    seq = SequenceFactory().create_sequence(control, "s", *seq_args)
+    seq.redraw_every = redraw_every
+    for line in lines:
+        seq.add_command(line)
+    return seq
+
+
+class SequenceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.control = FakeControl()
+        self.control.my_variables["total"] = 0
+
+    def test_for_loop(self):
+        seq = sequence(self.control, ["total += i", "assign last $i"], "for", "i", "range(0,", "10)")
+        seq.execute()
+        self.assertEqual(self.control.my_variables["total"], 45)
+        self.assertEqual(self.control.my_variables["last"], 9)
+        self.assertNotIn("i", self.control.my_variables)
+
+    def test_compiled_once(self):
+        seq = sequence(self.control, ["total += i", "assign last $i"], "for", "i", "range(100)")
+        seq.execute()
+        steps = seq.compile()
+        self.assertIsInstance(steps[1].args[0], str)
+        self.assertIsInstance(steps[1].args[1], VariableSlot)
+
+        misses = compile_source.cache_info().misses
+        seq.execute()
+        self.assertIs(seq.compile(), steps)
+        self.assertEqual(compile_source.cache_info().misses, misses)
+        self.assertEqual(self.control.my_variables["total"], 2 * 4950)
+
+    def test_redraw_policy(self):
+        render = CountingRender()
+        a = arrays.Array(range(20))
+        self.control.my_variables["a"] = a.get_interactive_class()(self.control, a, render)
+
+        sequence(self.control, ["a[i] = -i"], "for", "i", "range(20)").execute()
+        self.assertEqual(render.displays, 20)
+        self.assertEqual(a.get_value(19), -19)
+
+        render.displays = 0
+        sequence(self.control, ["a[i] = i"], "for", "i", "range(20)", redraw_every=5).execute()
+        self.assertEqual(render.displays, 4)
+
+        render.displays = 0
+        sequence(self.control, ["a[i] = 0"], "for", "i", "range(20)", redraw_every=0).execute()
+        self.assertEqual(render.displays, 1)
+
+        # one undo step per batch
+        self.control.my_variables["a"].undo()
+        self.assertEqual(a.values(), list(range(20)))
+
+    def test_control_commands_and_bad_lines(self):
+        sequence(self.control, ["assign x $i"], "for", "i", "range(10)", redraw_every=0).execute()
+        self.assertEqual(self.control.displays, 0)
+
+        seq = sequence(self.control, ["remove 5 !"], "for", "i", "range(3)")
+        self.assertRaises(SyntaxError, seq.execute)
+
+
+class WhileSequenceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.control = FakeControl()
+        self.render = CountingRender()
+        heap = tree.BinaryHeap()
+        heap.insert_many(range(50))
+        self.heap = heap.get_interactive_class()(self.control, heap, self.render)
+        self.control.my_variables["h"] = self.heap
+        self.control.my_variables["out"] = []
+
+    def test_drain_heap(self):
+        seq = sequence(self.control, ["out.append(h.remove_min())"], "while", "len(h._model)", ">", "0",
+                       redraw_every=10)
+        seq.execute()
+        self.assertEqual(self.control.my_variables["out"], list(range(50)))
+        self.assertEqual(self.render.displays, 5)
+
+    def test_budgets(self):
+        seq = sequence(self.control, ["out.append(1)"], "while", "True")
+        seq.max_iterations = 100
+        self.assertRaises(Exception, seq.execute)
+        self.assertEqual(len(self.control.my_variables["out"]), 100)
+
+        seq.max_iterations = 10 ** 9
+        seq.max_seconds = 0.05
+        self.assertRaises(Exception, seq.execute)
+
+    def test_condition_must_be_expression(self):
+        self.assertRaises(InvalidCommandError, sequence, self.control, [], "while", "x", "=", "1")
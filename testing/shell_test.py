@@ -0,0 +1,95 @@
+import unittest
+import datastructures
+from controller.shell import EmbeddedShell, MyStdOut, compile_source
+
+
+class FakeConsole(object):
+    """Records what the shell shows instead of drawing it"""
+    def __init__(self):
+        self.lines = []
+        self.updates = 0
+
+    def add_line(self, text, is_command=True):
+        self.add_lines([text], is_command)
+
+    def add_lines(self, texts, is_command=False):
+        self.lines.extend(texts)
+        self.updates += 1
+
+
+class BufferedOutputTest(unittest.TestCase):
+
+    def setUp(self):
+        self.console = FakeConsole()
+        self.shell = EmbeddedShell(self.console)
+
+    def test_lines_batched(self):
+        self.shell.runcode("for i in range(1000): print(i, 'x')")
+        self.assertEqual(self.console.lines, ["%i x" % i for i in range(1000)])
+        self.assertLess(self.console.updates, 100)
+
+    def test_flushed_once_per_frame(self):
+        out = MyStdOut(self.console, frame_ms=0)
+        out.write("a")
+        out.write("b\nc")
+        self.assertEqual(self.console.lines, ["ab"])
+        out.end_command()
+        self.assertEqual(self.console.lines, ["ab", "c"])
+
+    def test_blank_lines_kept(self):
+        self.shell.runcode("print('a\\n\\nb'); print(); print('c')")
+        self.assertEqual(self.console.lines, ["a", "", "b", "", "c"])
+
+        out = MyStdOut(self.console, frame_ms=10 ** 6)
+        out.write("d\n\n")
+        out.end_command()
+        self.assertEqual(self.console.lines[5:], ["d", ""])
+
+    def test_limit(self):
+        self.shell.my_std_out.limit = 100
+        self.shell.runcode("for i in range(1000): print('0123456789')")
+        self.assertEqual(len(self.console.lines), 11)
+        self.assertEqual(self.console.lines[-1], "[output truncated: 10900 characters not shown]")
+
+        # limit is per command
+        self.shell.runcode("print('next')")
+        self.assertEqual(self.console.lines[-1], "next")
+
+    def test_traceback_in_order(self):
+        self.shell.runcode("print('before'); 1 / 0")
+        self.assertEqual(self.console.lines[0], "before")
+        self.assertEqual(self.console.lines[-1], "[ERROR]: division by zero")
+
+
+class CompiledCodeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.console = FakeConsole()
+        self.shell = EmbeddedShell(self.console)
+
+    def test_expression_or_statements(self):
+        self.shell.runcode("x = 6 * 7")
+        self.assertEqual(self.console.lines, [])
+        self.shell.runcode("x")
+        self.assertEqual(self.console.lines, ["42"])
+        self.shell.runcode("for i in range(2): x += i")
+        self.assertEqual(self.shell.locals["x"], 43)
+
+    def test_compiled_once(self):
+        compile_source.cache_clear()
+        for _ in range(5):
+            self.shell.runcode("y = [i for i in range(10)]")
+        info = compile_source.cache_info()
+        self.assertEqual((info.misses, info.hits), (1, 4))
+
+        code_obj, is_expression = self.shell.compile_code("1 + 1")
+        self.assertTrue(is_expression)
+        self.assertEqual(self.shell.run_compiled(code_obj, is_expression), 2)
+
+    def test_timings(self):
+        self.shell.runcode("sum(range(10 ** 5))")
+        self.assertGreater(self.shell.timings.execute, 0)
+
+        self.shell.runcode("def (")
+        self.assertEqual(self.shell.timings.execute, 0)
+        self.assertTrue(self.console.lines[-1].startswith("[ERROR]"))
@@ -0,0 +1,113 @@
+import unittest
+import random
+from datastructures import algorithms
+from datastructures.arrays import Array, CompactArray
+
+
+class NoDrawRender(object):
+    """Render object stand-in that only counts redraws"""
+    def __init__(self):
+        self.status = None
+        self.redraws = 0
+
+    def display(self, do_render=True, do_sleep=False):
+        self.redraws += 1
+
+
+class SortTraceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.values = [random.randint(0, 50) for _ in range(40)]
+
+    def test_algorithms_sort(self):
+        for name in algorithms.SORTS:
+            trace = algorithms.record_sort(self.values, name)
+            self.assertEqual(trace.values, sorted(self.values), msg=name)
+            self.assertEqual(trace.initial, self.values)
+
+    def test_unknown_algorithm(self):
+        self.assertRaises(ValueError, algorithms.record_sort, self.values, "bogo")
+
+    def test_playback_matches_trace(self):
+        for name in algorithms.SORTS:
+            for array_class in (Array, CompactArray):
+                model = array_class(self.values)
+                trace = algorithms.record_sort(model.values(), name)
+                player = algorithms.TracePlayer(model, NoDrawRender(), trace)
+                player.finish()
+                self.assertEqual(model.values(), sorted(self.values), msg=name)
+                self.assertEqual(player.swaps, trace.swaps)
+                self.assertEqual(player.compares, trace.compares)
+
+    def test_one_redraw_per_frame(self):
+        model = Array(self.values)
+        render = NoDrawRender()
+        trace = algorithms.record_sort(model.values(), "bubble")
+        player = algorithms.TracePlayer(model, render, trace, speed=1000)
+
+        player.step(0.5)
+        self.assertEqual(player.position, 500)
+        self.assertEqual(render.redraws, 1)
+
+    def test_seek_backwards(self):
+        model = Array(self.values)
+        trace = algorithms.record_sort(model.values(), "quick")
+        player = algorithms.TracePlayer(model, NoDrawRender(), trace)
+
+        player.seek(len(trace) // 2)
+        halfway = model.values()
+        player.finish()
+        player.seek(len(trace) // 2)
+        self.assertEqual(model.values(), halfway)
+
+        player.seek(0)
+        self.assertEqual(model.values(), self.values)
+        self.assertEqual(player.swaps, 0)
+
+
+class InteractiveSortTest(unittest.TestCase):
+
+    def setUp(self):
+        import io
+        from controller.headless import HeadlessControl
+        from drawtools.animation import Timeline
+        from testing.animation_test import RecordingCanvas
+        self.control = HeadlessControl(out=io.StringIO())
+        self.control.run(["a = Array(%s)" % [random.randint(0, 50) for _ in range(40)], "show a"])
+        self.frames = RecordingCanvas()
+        self.control.timeline = Timeline(self.frames)
+        self.a = self.control.my_variables["a"]
+        self.model = self.control.my_variables["_a"]
+
+    def test_undo_during_playback(self):
+        before = self.model.values()
+        player = self.a.sort("bubble", speed=1000)
+        self.frames.run_frames(2)
+        self.assertLess(player.position, len(player.trace))
+
+        self.a.undo()
+        self.assertEqual(self.model.values(), before)
+        self.frames.run_frames(50)
+        player.seek(0)
+        self.assertTrue(self.control.timeline.idle())
+        self.assertEqual(self.model.values(), before)
+        self.assertIsNone(self.control.my_renders["a"].status)
+
+        self.a.redo()
+        self.assertEqual(self.model.values(), sorted(before))
+
+    def test_sort_during_playback(self):
+        values = self.model.values()
+        self.a.sort("quick", speed=1)
+        self.a.sort("merge", speed=10 ** 6)
+        self.control.timeline.speed = 10 ** 6
+        self.frames.run_frames(50)
+        self.assertEqual(self.model.values(), sorted(values))
+        self.a.undo()
+        self.assertEqual(self.model.values(), sorted(values))
+        self.a.undo()
+        self.assertEqual(self.model.values(), values)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import json
+import subprocess
+import sys
+import unittest
+import os
+from testing.benchmarks import cold_start
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# seconds from interpreter start to the first prompt, measured
+# around 0.04s (0.15s before structures were imported lazily)
+BUDGET = 0.5
+
+LOADED = """
+import json, sys
+from controller.headless import HeadlessControl
+control = HeadlessControl()
+before = sorted(sys.modules)
+control.process_command("b = BST(5)")
+control.process_command("show b")
+print(json.dumps([before, sorted(sys.modules)]))
+"""
+
+
+class StartupTest(unittest.TestCase):
+
+    def test_cold_start_budget(self):
+        seconds = min(cold_start()[0] for _ in range(3))
+        self.assertLess(seconds, BUDGET)
+
+    def test_structures_imported_on_first_use(self):
+        result = subprocess.run([sys.executable, "-c", LOADED], cwd=ROOT,
+                                capture_output=True, text=True, check=True)
+        before, after = json.loads(result.stdout.splitlines()[-1])
+
+        for module in ("datastructures.tree", "drawtools.render"):
+            self.assertNotIn(module, before)
+            self.assertIn(module, after)
+        self.assertNotIn("tkinter", after)
+
+    def test_model_factory(self):
+        import datastructures
+        from datastructures.graph import Graph
+        self.assertIsInstance(datastructures.ModelFactory().create_model("graph", 3), Graph)
+        self.assertIs(datastructures.graph.Graph, Graph)
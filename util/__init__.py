@@ -1,9 +1,9 @@
-from datastructures import tree
 import random
 
 
 def build_tree(n, max_val, t=None):
     """Builds a tree of unique integer elements"""
+    from datastructures import tree
     t = tree.BST() if t is None else t
     max_val = max(max_val, n)
     r_set = random.sample(range(max_val), n)
@@ -0,0 +1,106 @@
+import json
+import math
+from collections import deque, namedtuple
+
+# summary of one histogram, times in seconds
+Summary = namedtuple("Summary", ["kind", "name", "count", "p50", "p95", "max", "items"])
+
+
+class RollingHistogram(object):
+    def __init__(self, size=1000):
+        """
+        Last size samples of (seconds, canvas items) for one command
+        type or render phase. count keeps counting past size.
+
+        :param size: number of samples kept
+        """
+        self.samples = deque(maxlen=size)
+        self.count = 0
+
+    def __len__(self):
+        return len(self.samples)
+
+    def add(self, seconds, items=None):
+        self.samples.append((seconds, items))
+        self.count += 1
+
+    def percentile(self, p, times=None):
+        """
+        Nearest-rank percentile (0-100) of the kept times
+        """
+        times = sorted(seconds for seconds, _ in self.samples) if times is None else times
+        if not times:
+            return 0
+        rank = min(len(times) - 1, max(0, math.ceil(p / 100 * len(times)) - 1))
+        return times[rank]
+
+
+class Instrumentation(object):
+    def __init__(self, size=1000):
+        """
+        Rolling histograms of wall time per command type ("command"
+        kind) and per render phase ("render" kind). With count_items
+        set, drawing also records the number of canvas items it left
+        behind (a canvas query per draw, so off by default).
+
+        :param size: samples kept per histogram
+        """
+        self.size = size
+        self.enabled = True
+        self.count_items = False
+        self.histograms = {}
+
+    def record(self, kind, name, seconds, items=None):
+        if not self.enabled:
+            return
+        key = (kind, name)
+        try:
+            histogram = self.histograms[key]
+        except KeyError:
+            histogram = self.histograms[key] = RollingHistogram(self.size)
+        histogram.add(seconds, items)
+
+    def summary(self):
+        """
+        Summary per histogram, sorted by kind then name
+        """
+        rows = []
+        for (kind, name), histogram in sorted(self.histograms.items()):
+            times = sorted(seconds for seconds, _ in histogram.samples)
+            items = [n for _, n in histogram.samples if n is not None]
+            rows.append(Summary(kind, name, histogram.count, histogram.percentile(50, times),
+                                histogram.percentile(95, times), times[-1] if times else 0,
+                                items[-1] if items else None))
+        return rows
+
+    def format_summary(self):
+        """
+        Lines of a p50/p95/max table (milliseconds)
+        """
+        lines = ["%-36s %7s %9s %9s %9s %7s" % ("", "count", "p50 ms", "p95 ms", "max ms", "items")]
+        for row in self.summary():
+            lines.append("%-36s %7i %9.3f %9.3f %9.3f %7s"
+                         % ("%s %s" % (row.kind, row.name), row.count, row.p50 * 1000, row.p95 * 1000,
+                            row.max * 1000, "" if row.items is None else row.items))
+        return lines
+
+    def dump(self, path):
+        """
+        Write every kept sample to path as JSON lines
+
+        :return: number of samples written
+        """
+        written = 0
+        with open(path, "w") as f:
+            for (kind, name), histogram in sorted(self.histograms.items()):
+                for seconds, items in histogram.samples:
+                    f.write(json.dumps({"kind": kind, "name": name, "seconds": seconds, "items": items}) + "\n")
+                    written += 1
+        return written
+
+    def clear(self):
+        self.histograms.clear()
+
+
+# shared by control, shell and render objects
+recorder = Instrumentation()
@@ -1,26 +1,46 @@
+import atexit
 import logging
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+
+# level names used throughout dsDraw, built once
+# instead of on every log call
+LEVELS = {"debug": logging.DEBUG, "info": logging.INFO,
+          "warning": logging.WARNING, "error": logging.ERROR, "critical": logging.CRITICAL}
+
+# background threads writing log files, stopped (and
+# their queues flushed) when the interpreter exits
+_listeners = []
+
 
 def to_function(logger, level_str):
-    levels = {"debug": logger.debug, "info": logger.info,
-              "warning": logger.warning, "error": logger.error, "critical": logger.critical}
-    return levels[level_str.lower()]
+    return getattr(logger, level_str.lower())
 
 def to_level(level_str):
-    levels = {"debug": logging.DEBUG, "info": logging.INFO,
-              "warning": logging.WARNING, "error": logging.ERROR, "critical": logging.CRITICAL}
-    return levels[level_str.lower()]
+    return LEVELS[level_str.lower()]
+
+
+def stop_listeners():
+    """Write out queued records and stop all log file threads"""
+    while _listeners:
+        _listeners.pop().stop()
+
+atexit.register(stop_listeners)
 
 
 def create_logger(name, level, fh_name, fh_level=None,
                   format="%(name)s-%(levelname)s-%(message)s"):
     """
-    Creates a logger with given name, level, fh_
-    :param name:
-    :param level:
-    :param fh_name:
-    :param fh_level:
-    :param format:
-    :return:
+    Creates a logger with given name and level writing to file fh_name.
+    Records are passed through a queue and written to the file by a
+    background thread, so logging doesn't wait on file I/O.
+
+    :param name: logger name
+    :param level: logger level name ("debug", "info", ...)
+    :param fh_name: log file path (relative to dsDraw/)
+    :param fh_level: level name of the file, defaults to level
+    :param format: format of records in the file
+    :return: logger
     """
 
     # temporary to simplify messages for debugging
@@ -32,12 +52,19 @@ def create_logger(name, level, fh_name, fh_level=None,
     # if no handler level supplied, use same as logger level
     fh_level = level if fh_level is None else fh_level
 
-    handler = logging.FileHandler("dsDraw/" + fh_name)
+    # file is emptied when first written to, not when the logger is created
+    handler = logging.FileHandler("dsDraw/" + fh_name, mode="w", delay=True)
     handler.setLevel(to_level(fh_level))
 
     formatter = logging.Formatter(format)
 
     handler.setFormatter(formatter)
-    logger.addHandler(handler)
+
+    queue = SimpleQueue()
+    logger.addHandler(QueueHandler(queue))
+
+    listener = QueueListener(queue, handler, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
 
     return logger
@@ -50,6 +50,7 @@ class GraphSimThread(threading.Thread):
             self.render.move_nodes()
             self.render.display(do_render=False)
         self.render.simulating = False
+        self.render.cache_layout()
 
 
 